@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for AWSKANOID
+
+Runs fixed, seeded scenarios for collision checks, gameplay updates,
+rendering, sound generation and cold startup, and compares each timing
+with the stored baseline. A benchmark that is slower than its baseline by
+more than the threshold is reported as a regression and the script exits
+with status 1.
+
+Timings depend on the machine, so the stored baseline is only meaningful
+on the machine that recorded it; refresh it with --update-baseline when
+benchmarking somewhere else.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # compare with the baseline
+    python benchmarks/run_benchmarks.py --update-baseline
+    python benchmarks/run_benchmarks.py --only collision --threshold 0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+# Render and play audio without a window or sound device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# The game itself stays silent: the mixer thread would add noise to every timing
+os.environ['AWSKANOID_AUDIO'] = 'off'
+GAME_ENV = dict(os.environ)  # Passed on to the cold-start interpreter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown over the baseline (25%)
+REPEAT = 7                # Timed rounds per benchmark; the fastest is reported
+SEED = 1234
+FRAME_DT = 1 / 60
+WARMUP_FRAMES = 30
+STEPS_PER_ROUND = 120
+
+def measure(func: Callable[[], None], number: int, repeat: int = REPEAT) -> float:
+    """Time of one call in milliseconds, from the fastest of several rounds.
+
+    The fastest round is the one least disturbed by other processes, which
+    keeps the numbers stable enough to compare between runs.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number * 1000)
+    return min(times)
+
+def new_game(level_num: int):
+    """A game in the middle of a level, with every background asset loaded"""
+    from game.game_states import GameStateManager, GameState
+
+    game = GameStateManager()
+    game.assets.wait_all()
+    game.reset_game()
+    game.setup_level(level_num)
+    game.current_state = GameState.PLAYING
+    return game
+
+def bench_collision() -> Dict[str, float]:
+    """CollisionDetector checks for balls scattered over the brick field"""
+    from game.collision import CollisionDetector
+    from game.entities import Ball, Paddle, Brick
+    from utils.constants import BRICK_WIDTH, BRICK_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, PADDLE_Y_OFFSET
+
+    rng = random.Random(SEED)
+    detector = CollisionDetector()
+    paddle = Paddle(SCREEN_WIDTH // 2, SCREEN_HEIGHT - PADDLE_Y_OFFSET)
+    brick = Brick(600, 200, 'normal')
+    balls = []
+    for _ in range(256):
+        ball = Ball(rng.uniform(560, 600 + BRICK_WIDTH + 40), rng.uniform(180, 200 + BRICK_HEIGHT + 20))
+        ball.dx, ball.dy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        balls.append(ball)
+
+    def brick_checks():
+        for ball in balls:
+            detector.ball_brick_collision(ball, brick)
+
+    def paddle_checks():
+        for ball in balls:
+            detector.ball_paddle_collision(ball, paddle)
+
+    def wall_checks():
+        for ball in balls:
+            detector.ball_wall_collision(ball)
+
+    return {
+        'collision/ball_brick': measure(brick_checks, 200) / len(balls) * 1000,
+        'collision/ball_paddle': measure(paddle_checks, 200) / len(balls) * 1000,
+        'collision/ball_wall': measure(wall_checks, 200) / len(balls) * 1000
+    }
+
+def bench_update_gameplay() -> Dict[str, float]:
+    """One update_gameplay step on each level"""
+    import pygame
+    from game.levels import LevelManager
+
+    pygame.display.init()
+    level_manager = LevelManager()
+    level_count = level_manager.pack.level_count
+    level_manager.close()
+
+    results = {}
+    for level_num in range(1, level_count + 1):
+        random.seed(SEED)
+        game = new_game(level_num)
+        game.game_score.lives = 1000000  # Never game over
+        keys = pygame.key.get_pressed()
+        mouse_pos = (0, 0)
+
+        def step():
+            for ball in game.balls:
+                if ball.stuck_to_paddle:
+                    ball.release_from_paddle()
+            game.update_gameplay(FRAME_DT, keys, mouse_pos)
+
+        for _ in range(WARMUP_FRAMES):
+            step()
+        results[f'update_gameplay/level_{level_num:02d}'] = measure(step, STEPS_PER_ROUND) * 1000
+        game.close()
+    return results
+
+def bench_rendering() -> Dict[str, float]:
+    """Brick.draw for a full level and a whole draw_gameplay frame"""
+    import pygame
+    from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    random.seed(SEED)
+    game = new_game(1)
+    bricks = list(game.brick_field.bricks)
+
+    def draw_bricks():
+        for brick in bricks:
+            brick.draw(screen)
+
+    def draw_frame():
+        game.draw_gameplay(screen)
+
+    results = {
+        'render/brick_draw': measure(draw_bricks, 50) / len(bricks) * 1000,
+        'render/draw_gameplay': measure(draw_frame, 50) * 1000
+    }
+    game.close()
+    return results
+
+def bench_sound_manager() -> Dict[str, float]:
+    """Building the SoundManager, including sound synthesis"""
+    from utils.audio import PygameAudioBackend
+    from utils.sounds import SoundManager
+
+    def build():
+        SoundManager(backend=PygameAudioBackend()).shutdown()
+
+    return {'startup/sound_manager': measure(build, 1) * 1000}
+
+def bench_startup() -> Dict[str, float]:
+    """A fresh interpreter from launch until the first frame is on screen"""
+    command = [sys.executable, '-c',
+               'import main; main.AwskanoidGame().run(max_frames=1)']
+    env = dict(GAME_ENV, PYTHONPATH=ROOT)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def launch():
+            subprocess.run(command, cwd=temp_dir, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        return {'startup/first_frame': measure(launch, 1) * 1000}
+
+BENCHMARKS = {
+    'collision': bench_collision,
+    'update': bench_update_gameplay,
+    'render': bench_rendering,
+    'sound': bench_sound_manager,
+    'startup': bench_startup
+}
+
+def load_baseline() -> Dict[str, float]:
+    """Stored timings, or nothing if no baseline has been recorded"""
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, 'r') as f:
+        return json.load(f).get('results', {})
+
+def save_baseline(results: Dict[str, float]):
+    """Store timings as the new baseline"""
+    from utils.storage import atomic_write_json
+
+    atomic_write_json(BASELINE_FILE, {
+        'units': "microseconds per operation",
+        'python': sys.version.split()[0],
+        'results': {name: round(value, 3) for name, value in sorted(results.items())}
+    })
+
+def main():
+    """Run the benchmarks and compare them with the baseline"""
+    parser = argparse.ArgumentParser(description="AWSKANOID performance benchmarks")
+    parser.add_argument('--only', choices=sorted(BENCHMARKS), action='append',
+                        help="run only these groups (may be repeated)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown over the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store the results as the new baseline")
+    args = parser.parse_args()
+
+    print("AWSKANOID Benchmarks")
+    print("=" * 30)
+
+    # Game files (settings, scores) are written to a scratch directory
+    work_dir = tempfile.mkdtemp(prefix="awskanoid-bench-")
+    os.chdir(work_dir)
+    results = {}
+    try:
+        for group in args.only or list(BENCHMARKS):
+            print(f"\nRunning {group} benchmarks...")
+            results.update(BENCHMARKS[group]())
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = load_baseline()
+    regressions = 0
+    print(f"\n{'benchmark':<28} {'us/op':>12} {'baseline':>12} {'change':>8}")
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:<26} {value:12.3f} {'-':>12} {'new':>8}")
+            continue
+        change = value / base - 1
+        mark = "✓"
+        if change > args.threshold:
+            mark = "✗"
+            regressions += 1
+        print(f"{mark} {name:<26} {value:12.3f} {base:12.3f} {change:+8.1%}")
+
+    if args.update_baseline:
+        save_baseline({**baseline, **results})
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+        return 0
+
+    if regressions:
+        print(f"\n✗ {regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+
+    print("\n✓ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
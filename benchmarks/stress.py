@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Stress test for AWSKANOID
+
+Builds synthetic worst-case games through the normal GameStateManager
+path (hundreds of balls, thousands of bricks, dozens of lasers and falling
+power-ups, with every power-up active) and times real frames. Each entity
+count is then ramped on its own until the 95th percentile frame no longer
+fits the frame budget, and the largest count that still fits is reported.
+
+Usage:
+    python benchmarks/stress.py             # simulation only, no drawing
+    python benchmarks/stress.py --render    # also draw and flip every frame
+    python benchmarks/stress.py --balls 300 --bricks 5000 --lasers 64 --powerups 48
+    python benchmarks/stress.py --profile stress.collapsed   # also write flame graph stacks
+"""
+
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.constants import BRICK_ROWS, BRICK_COLS, PROFILER_BUDGET_MS
+
+SEED = 1234
+FRAME_DT = 1 / 60
+WARMUP_FRAMES = 10
+MEASURED_FRAMES = 60
+SEARCH_PRECISION = 0.1  # Stop narrowing a limit once it is known to within 10%
+
+# Upper bounds for the ramp, and the counts held while another entity is ramped
+LIMITS = {'balls': 4096, 'bricks': 65536, 'lasers': 4096, 'powerups': 4096}
+BASE_COUNTS = {'balls': 1, 'bricks': BRICK_ROWS * BRICK_COLS, 'lasers': 0, 'powerups': 0}
+
+class StressGame:
+    """A GameStateManager whose pools are big enough for the largest stress counts"""
+
+    def __init__(self, render: bool):
+        import pygame
+        from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_BALLS, MAX_LASERS, MAX_FALLING_POWERUPS
+        from game.game_states import GameStateManager, GameState
+
+        self.render = render
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.keys = pygame.key.get_pressed()
+
+        # The normal pools cap entities at what real play can reach
+        self.game = GameStateManager(max_balls=max(MAX_BALLS, LIMITS['balls']),
+                                     max_lasers=max(MAX_LASERS, LIMITS['lasers']),
+                                     max_powerups=max(MAX_FALLING_POWERUPS, LIMITS['powerups']))
+        self.game.assets.wait_all()
+        self.game.reset_game()
+        self.playing = GameState.PLAYING
+        self.rng = random.Random(SEED)
+
+    def build(self, counts: Dict[str, int]):
+        """Set up a fresh level with the given entity counts and every power-up active"""
+        from game.brick_field import BrickField
+        from game.level_pack import BRICK_TYPE_CODES, CODE_BRICK_TYPES
+        from game.powerups import POWERUP_TYPES
+
+        game = self.game
+        random.seed(SEED)
+        self.rng.seed(SEED)
+        game.setup_level(1)
+
+        # A grid holding the requested number of bricks, a bit wider than tall
+        bricks = max(1, counts['bricks'])
+        cols = max(1, min(bricks, round(math.sqrt(bricks * 3))))
+        rows = math.ceil(bricks / cols)
+        codes = [BRICK_TYPE_CODES['normal'], BRICK_TYPE_CODES['medium'], BRICK_TYPE_CODES['hard']]
+        grid = [self.rng.choice(codes) for _ in range(bricks)] + [0] * (rows * cols - bricks)
+        game.brick_field = BrickField.from_level({'rows': rows, 'cols': cols, 'grid': grid},
+                                                 CODE_BRICK_TYPES)
+
+        for powerup_type in POWERUP_TYPES:
+            game.powerup_manager.activate_powerup(powerup_type, game.paddle)
+        game.current_state = self.playing
+        self.top_up(counts)
+
+    def top_up(self, counts: Dict[str, int]):
+        """Replace entities that were lost, collected or spent during the last frame"""
+        from utils.constants import GAME_AREA_LEFT, GAME_AREA_RIGHT, GAME_AREA_TOP, BALL_SPEED, STARTING_LIVES
+        from game.powerups import POWERUP_TYPES
+
+        game = self.game
+        rng = self.rng
+        paddle = game.paddle
+        game.game_score.lives = STARTING_LIVES  # Never game over
+        field = game.brick_field
+        field_bottom = field.top + field.rows * field.cell_height
+
+        for ball in game.balls:
+            if ball.stuck_to_paddle:
+                ball.release_from_paddle()
+        while len(game.balls) < counts['balls']:
+            ball = game.ball_pool.acquire(rng.uniform(GAME_AREA_LEFT + 20, GAME_AREA_RIGHT - 20),
+                                          rng.uniform(field_bottom + 20, paddle.y - 40), BALL_SPEED)
+            angle = rng.uniform(0, 2 * math.pi)
+            ball.dx, ball.dy = math.cos(angle), math.sin(angle)
+            ball.normalize_velocity()
+            game.balls.append(ball)
+
+        while len(paddle.lasers) < counts['lasers']:
+            paddle.lasers.append(game.laser_pool.acquire(
+                rng.uniform(GAME_AREA_LEFT, GAME_AREA_RIGHT), rng.uniform(GAME_AREA_TOP, paddle.y)))
+
+        falling = game.powerup_manager.falling_powerups
+        while len(falling) < counts['powerups']:
+            falling.append(game.powerup_manager.pool.acquire(
+                rng.uniform(GAME_AREA_LEFT, GAME_AREA_RIGHT), rng.uniform(GAME_AREA_TOP, paddle.y),
+                rng.choice(POWERUP_TYPES)))
+
+    def frame_time(self, counts: Dict[str, int]) -> float:
+        """95th percentile frame time in milliseconds with these counts"""
+        import pygame
+        from utils.profiler import percentile
+
+        self.build(counts)
+        times = []
+        for frame in range(WARMUP_FRAMES + MEASURED_FRAMES):
+            self.top_up(counts)
+            start = time.perf_counter()
+            self.game.update_gameplay(FRAME_DT, self.keys, (0, 0))
+            if self.render:
+                self.game.draw_gameplay(self.screen)
+                pygame.display.flip()
+            if frame >= WARMUP_FRAMES:
+                times.append((time.perf_counter() - start) * 1000)
+        return percentile(sorted(times), 95)
+
+    def max_count(self, entity: str, budget_ms: float) -> Tuple[int, float]:
+        """Largest count of one entity whose frames fit the budget, and its frame time"""
+        counts = dict(BASE_COUNTS)
+
+        def fits(count: int) -> Tuple[bool, float]:
+            counts[entity] = count
+            ms = self.frame_time(counts)
+            if ms > budget_ms:
+                # Confirm a miss so one stall elsewhere on the machine cannot end the ramp
+                ms = min(ms, self.frame_time(counts))
+            return ms <= budget_ms, ms
+
+        # Double until the budget is blown, then bisect
+        good = max(BASE_COUNTS[entity], 1)
+        ok, good_ms = fits(good)
+        if not ok:
+            return 0, good_ms
+        bad = None
+        while good < LIMITS[entity]:
+            count = min(good * 2, LIMITS[entity])
+            ok, ms = fits(count)
+            if not ok:
+                bad = count
+                break
+            good, good_ms = count, ms
+
+        while bad is not None and bad - good > max(1, good * SEARCH_PRECISION):
+            count = (good + bad) // 2
+            ok, ms = fits(count)
+            if ok:
+                good, good_ms = count, ms
+            else:
+                bad = count
+        return good, good_ms
+
+    def close(self):
+        self.game.close()
+
+def main():
+    """Run the worst-case scenario, then find each entity's limit"""
+    parser = argparse.ArgumentParser(description="AWSKANOID stress test")
+    parser.add_argument('--render', action='store_true', help="draw and flip every frame")
+    parser.add_argument('--balls', type=int, default=200)
+    parser.add_argument('--bricks', type=int, default=2000)
+    parser.add_argument('--lasers', type=int, default=48)
+    parser.add_argument('--powerups', type=int, default=32)
+    parser.add_argument('--profile', metavar='PATH',
+                        help="sample the run and write collapsed stacks for a flame graph")
+    args = parser.parse_args()
+
+    if not args.render:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('AWSKANOID_AUDIO', 'off')
+
+    print("AWSKANOID Stress Test")
+    print("=" * 30)
+    print(f"Mode: {'rendered' if args.render else 'headless'}, budget {PROFILER_BUDGET_MS:.1f} ms (p95)")
+
+    sampler = None
+    if args.profile:
+        from utils.sampler import SamplingProfiler
+        args.profile = os.path.abspath(args.profile)  # Before leaving the current directory
+        sampler = SamplingProfiler()
+        sampler.start()
+
+    # Game files (settings, scores) are written to a scratch directory
+    work_dir = tempfile.mkdtemp(prefix="awskanoid-stress-")
+    os.chdir(work_dir)
+    stress = None
+    try:
+        stress = StressGame(args.render)
+
+        scenario = {'balls': args.balls, 'bricks': args.bricks,
+                    'lasers': args.lasers, 'powerups': args.powerups}
+        ms = stress.frame_time(scenario)
+        mark = "✓" if ms <= PROFILER_BUDGET_MS else "✗"
+        print(f"\n{mark} Worst case {scenario}: {ms:.2f} ms per frame")
+
+        print(f"\n{'entity':<10} {'max count':>10} {'p95 ms':>8}")
+        for entity in LIMITS:
+            count, ms = stress.max_count(entity, PROFILER_BUDGET_MS)
+            limit = "+" if count >= LIMITS[entity] else ""
+            print(f"{entity:<10} {str(count) + limit:>10} {ms:8.2f}")
+    finally:
+        if stress:
+            stress.close()
+        if sampler:
+            sampler.stop()
+            sampler.write(args.profile)
+            print(f"\nWrote {sampler.samples} samples to {args.profile}")
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import pygame
+from typing import Dict, Iterator, List, Optional
+from utils.constants import *
+from game.entities import Brick, BRICK_SPRITES, build_brick_sprites
+
+class BrickField:
+    """A level's bricks laid out on a uniform grid.
+
+    The grid doubles as the spatial index: a rectangle maps straight to the
+    cells it covers, so collision queries only look at nearby bricks. The
+    bricks are drawn once into a cached layer and only changed bricks are
+    redrawn, so the cost per frame does not grow with the size of the field.
+    """
+
+    def __init__(self, rows: int, cols: int, left: int, top: int,
+                 cell_width: int, cell_height: int, padding_x: int, padding_y: int):
+        self.rows = rows
+        self.cols = cols
+        self.left = left
+        self.top = top
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.brick_width = max(1, cell_width - padding_x)
+        self.brick_height = max(1, cell_height - padding_y)
+
+        self.cells: List[Optional[Brick]] = [None] * (rows * cols)
+        self.bricks: List[Brick] = []
+        self.remaining = 0  # Breakable bricks not yet destroyed
+
+        # Rendering state
+        self.layer = None
+        self.dirty = set()     # Bricks to redraw into the layer
+        self.flashing = set()  # Bricks drawn over the layer while they flash
+
+    @classmethod
+    def from_level(cls, level_data: Dict, brick_types: Dict[int, str]) -> 'BrickField':
+        """Lay out a decoded level, shrinking the bricks if the grid is too big to fit"""
+        rows, cols = level_data['rows'], level_data['cols']
+
+        # Full size bricks when they fit, otherwise scale the cells down
+        cell_width = max(1, min(BRICK_WIDTH + BRICK_PADDING,
+                                (GAME_AREA_RIGHT - GAME_AREA_LEFT) // max(cols, 1)))
+        cell_height = max(1, min(BRICK_HEIGHT + BRICK_PADDING,
+                                 BRICK_FIELD_MAX_HEIGHT // max(rows, 1)))
+        padding_x = min(BRICK_PADDING, cell_width // 10)
+        padding_y = min(BRICK_PADDING, cell_height // 10)
+
+        # Center the brick field horizontally
+        total_width = cols * cell_width - padding_x
+        left = (SCREEN_WIDTH - total_width) // 2
+        top = GAME_AREA_TOP + 50
+
+        field = cls(rows, cols, left, top, cell_width, cell_height, padding_x, padding_y)
+        grid = level_data['grid']
+        for index, code in enumerate(grid):
+            brick_type = brick_types.get(code)
+            if brick_type:
+                field.add_brick(index // cols, index % cols, brick_type)
+        return field
+
+    def add_brick(self, row: int, col: int, brick_type: str) -> Brick:
+        """Place a brick in a cell"""
+        x = self.left + col * self.cell_width
+        y = self.top + row * self.cell_height
+        brick = Brick(x, y, brick_type, self.brick_width, self.brick_height)
+        self.cells[row * self.cols + col] = brick
+        self.bricks.append(brick)
+        if brick.type != 'unbreakable':
+            self.remaining += 1
+        self.layer = None
+        return brick
+
+    def query(self, rect: pygame.Rect) -> Iterator[Brick]:
+        """Yield the live bricks whose cells overlap a rectangle"""
+        first_col = max(0, (rect.left - self.left) // self.cell_width)
+        last_col = min(self.cols - 1, (rect.right - 1 - self.left) // self.cell_width)
+        first_row = max(0, (rect.top - self.top) // self.cell_height)
+        last_row = min(self.rows - 1, (rect.bottom - 1 - self.top) // self.cell_height)
+
+        cells = self.cells
+        for row in range(first_row, last_row + 1):
+            row_start = row * self.cols
+            for col in range(first_col, last_col + 1):
+                brick = cells[row_start + col]
+                if brick is not None and not brick.destroyed:
+                    yield brick
+
+    def hit_brick(self, brick: Brick) -> bool:
+        """Hit a brick, keeping the counters and layer in step; True if destroyed"""
+        destroyed = brick.hit()
+        if destroyed:
+            self.remaining -= 1
+        self.flashing.add(brick)
+        self.dirty.add(brick)
+        return destroyed
+
+    def is_complete(self) -> bool:
+        """Check if every breakable brick has been destroyed"""
+        return self.remaining <= 0
+
+    def update(self, dt: float):
+        """Advance flash effects; only flashing bricks need updating"""
+        if not self.flashing:
+            return
+        for brick in list(self.flashing):
+            brick.update(dt)
+            if brick.flash_timer <= 0 or brick.destroyed:
+                self.flashing.discard(brick)
+                self.dirty.add(brick)
+
+    def build_layer(self):
+        """Draw every brick into a fresh cached layer"""
+        width = self.cols * self.cell_width
+        height = self.rows * self.cell_height
+        self.layer = pygame.Surface((max(1, width), max(1, height)))
+        self.layer.fill(BRICK_LAYER_COLORKEY)
+        self.layer.set_colorkey(BRICK_LAYER_COLORKEY)
+
+        if (('normal', 0, self.brick_width, self.brick_height) not in BRICK_SPRITES):
+            build_brick_sprites(self.brick_width, self.brick_height)
+
+        self.dirty.clear()
+        for brick in self.bricks:
+            self.draw_into_layer(brick)
+
+    def draw_into_layer(self, brick: Brick):
+        """Redraw one brick's cell in the cached layer"""
+        rect = pygame.Rect(brick.x - self.left, brick.y - self.top, brick.width, brick.height)
+        self.layer.fill(BRICK_LAYER_COLORKEY, rect)
+        if brick.destroyed or brick in self.flashing:
+            return
+        sprite = BRICK_SPRITES.get((brick.type, brick.hits, brick.width, brick.height))
+        if sprite is not None:
+            self.layer.blit(sprite, rect)
+        else:
+            brick.render(self.layer, rect, brick.get_color(), BRICK_COLORS[brick.type][1])
+
+    def draw(self, screen):
+        """Draw the cached layer, then the bricks that are flashing"""
+        if self.layer is None:
+            self.build_layer()
+        elif self.dirty:
+            for brick in self.dirty:
+                self.draw_into_layer(brick)
+            self.dirty.clear()
+
+        screen.blit(self.layer, (self.left, self.top))
+        for brick in self.flashing:
+            brick.draw(screen)
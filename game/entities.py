@@ -3,9 +3,14 @@ import math
 import random
 from typing import Tuple, List
 from utils.constants import *
+from game.pool import ObjectPool, compact
 
 class Ball:
     def __init__(self, x: float, y: float, speed: float = BALL_SPEED):
+        self.reset(x, y, speed)
+    
+    def reset(self, x: float, y: float, speed: float = BALL_SPEED):
+        """(Re)initialize the ball, so pooled balls can be reused"""
         self.x = x
         self.y = y
         self.radius = BALL_RADIUS
@@ -87,7 +92,7 @@ class Ball:
                           self.radius // 3)
 
 class Paddle:
-    def __init__(self, x: float, y: float):
+    def __init__(self, x: float, y: float, laser_pool: ObjectPool = None):
         self.base_width = PADDLE_WIDTH
         self.width = self.base_width
         self.height = PADDLE_HEIGHT
@@ -97,9 +102,14 @@ class Paddle:
         self.can_shoot = False
         self.is_sticky = False
         self.lasers = []
+        self.laser_pool = laser_pool or ObjectPool(lambda: Laser(0, 0), MAX_LASERS)
     
-    def update(self, dt: float, keys, mouse_pos=None, control_mode="keyboard"):
-        """Update paddle position based on input and control mode"""
+    def update(self, dt: float, keys, mouse_pos=None, control_mode="keyboard", mouse_dx: float = 0):
+        """Update paddle position based on input and control mode.
+
+        In raw mouse mode mouse_dx is the horizontal mouse motion since the
+        last update, applied in full whatever the frame or step rate.
+        """
         old_x = self.x
         
         if control_mode == "keyboard":
@@ -117,18 +127,31 @@ class Paddle:
             if abs(diff) > 2:  # Dead zone to prevent jitter
                 self.x += diff * 0.1
         
+        elif control_mode == CONTROL_MODE_MOUSE_RAW:
+            self.x += mouse_dx * MOUSE_RAW_SENSITIVITY
+        
         # Keep paddle within bounds
         self.x = max(GAME_AREA_LEFT, min(self.x, GAME_AREA_RIGHT - self.width))
         
         # Update lasers
-        self.lasers = [laser for laser in self.lasers if laser.update(dt)]
+        compact(self.lasers, self.laser_pool, Laser.update, dt)
     
     def shoot_laser(self):
         """Shoot a laser if laser power-up is active"""
         if self.can_shoot:
             laser_x = self.x + self.width // 2
             laser_y = self.y
-            self.lasers.append(Laser(laser_x, laser_y))
+            laser = self.laser_pool.acquire(laser_x, laser_y)
+            if laser:
+                self.lasers.append(laser)
+    
+    def remove_spent_lasers(self):
+        """Return lasers that hit something to the pool"""
+        compact(self.lasers, self.laser_pool, Laser.is_active)
+    
+    def clear_lasers(self):
+        """Return every laser to the pool"""
+        self.laser_pool.release_all(self.lasers)
     
     def expand(self):
         """Expand paddle width"""
@@ -181,16 +204,25 @@ class Paddle:
 
 class Laser:
     def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
         self.width = 3
         self.height = 10
         self.speed = 12
+        self.reset(x, y)
+    
+    def reset(self, x: float, y: float):
+        """(Re)initialize the laser, so pooled lasers can be reused"""
+        self.x = x
+        self.y = y
+        self.active = True  # Cleared when the laser hits a brick
+    
+    def is_active(self) -> bool:
+        """Check if the laser has not hit anything yet"""
+        return self.active
     
     def update(self, dt: float) -> bool:
         """Update laser position, return False if should be removed"""
         self.y -= self.speed * dt * 60
-        return self.y > -self.height
+        return self.active and self.y > -self.height
     
     def get_rect(self) -> pygame.Rect:
         """Get laser's bounding rectangle"""
@@ -203,11 +235,12 @@ class Laser:
         pygame.draw.rect(screen, (255, 255, 255), rect, 1)
 
 class Brick:
-    def __init__(self, x: float, y: float, brick_type: str = 'normal'):
+    def __init__(self, x: float, y: float, brick_type: str = 'normal',
+                 width: int = BRICK_WIDTH, height: int = BRICK_HEIGHT):
         self.x = x
         self.y = y
-        self.width = BRICK_WIDTH
-        self.height = BRICK_HEIGHT
+        self.width = width
+        self.height = height
         self.type = brick_type
         self.max_hits = self.get_max_hits()
         self.hits = 0
@@ -282,6 +315,13 @@ class Brick:
         if self.destroyed:
             return
         
+        # Use the pre-rendered sprite unless the brick is flashing
+        if self.flash_timer <= 0:
+            sprite = BRICK_SPRITES.get((self.type, self.hits, self.width, self.height))
+            if sprite is not None:
+                screen.blit(sprite, (self.x, self.y))
+                return
+        
         rect = self.get_rect()
         base_color = self.get_color()
         highlight_color = BRICK_COLORS[self.type][1]
@@ -292,16 +332,37 @@ class Brick:
             base_color = tuple(min(255, int(c + (255 - c) * flash_intensity)) for c in base_color)
             highlight_color = tuple(min(255, int(c + (255 - c) * flash_intensity)) for c in highlight_color)
         
+        self.render(screen, rect, base_color, highlight_color)
+    
+    def render(self, surface, rect: pygame.Rect, base_color, highlight_color):
+        """Render the brick gradient and border into a surface"""
         # Draw gradient
-        for i in range(self.height):
-            color_ratio = i / self.height
+        for i in range(rect.height):
+            color_ratio = i / rect.height
             color = [
                 int(highlight_color[j] + (base_color[j] - highlight_color[j]) * color_ratio)
                 for j in range(3)
             ]
-            pygame.draw.rect(screen, color, 
+            pygame.draw.rect(surface, color, 
                            (rect.x, rect.y + i, rect.width, 1))
         
         # Draw border
         border_color = WHITE if self.type != 'unbreakable' else DARK_GRAY
-        pygame.draw.rect(screen, border_color, rect, 1)
+        pygame.draw.rect(surface, border_color, rect, 1)
+
+# Pre-rendered brick sprites keyed by (type, hits, width, height)
+BRICK_SPRITES = {}
+
+def build_brick_sprites(width: int = BRICK_WIDTH, height: int = BRICK_HEIGHT) -> dict:
+    """Pre-render a sprite for every brick type and damage state"""
+    for brick_type in BRICK_COLORS:
+        brick = Brick(0, 0, brick_type, width, height)
+        max_hits = 1 if brick_type == 'unbreakable' else brick.max_hits
+        
+        for hits in range(max_hits):
+            brick.hits = hits
+            sprite = pygame.Surface((width, height))
+            brick.render(sprite, sprite.get_rect(), brick.get_color(), BRICK_COLORS[brick_type][1])
+            BRICK_SPRITES[(brick_type, hits, width, height)] = sprite
+    
+    return BRICK_SPRITES
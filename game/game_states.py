@@ -7,10 +7,17 @@ from utils.constants import *
 from utils.sounds import SoundManager
 from utils.score import ScoreManager, GameScore
 from utils.settings import SettingsManager
-from game.entities import Ball, Paddle, Brick
+from utils.assets import AssetLoader
+from utils.profiler import profiler
+from utils.telemetry import create_telemetry_recorder
+from utils.memory import GCPolicy
+from game.entities import Ball, Paddle, Laser, Brick, build_brick_sprites
+from game.pool import ObjectPool, compact
 from game.powerups import PowerUpManager
 from game.collision import CollisionDetector
+from game.input import InputSnapshot, RelativeMouse
 from game.levels import LevelManager
+from net.leaderboard_client import create_leaderboard_client
 from ui.hud import HUD
 from ui.menu import MainMenu, HighScoreMenu, NameEntryMenu, SettingsMenu, ControlSettingsMenu
 
@@ -27,15 +34,31 @@ class GameState(Enum):
     NAME_ENTRY = "name_entry"
 
 class GameStateManager:
-    def __init__(self):
-        # Initialize managers
-        self.sound_manager = SoundManager()
-        self.score_manager = ScoreManager()
+    def __init__(self, max_balls: int = MAX_BALLS, max_lasers: int = MAX_LASERS,
+                 max_powerups: int = MAX_FALLING_POWERUPS):
+        # Build audio, level data and sprites in the background so the
+        # main menu can appear as soon as the fonts are ready
         self.settings_manager = SettingsManager()
-        self.level_manager = LevelManager()
-        self.powerup_manager = PowerUpManager()
+        self.assets = AssetLoader()
+        self.assets.submit('sounds', SoundManager,
+                           sound_enabled=self.settings_manager.get_setting('sound_enabled', True))
+        self.assets.submit('levels', LevelManager,
+                           endless=self.settings_manager.get_setting('endless_mode', False))
+        self.assets.submit('sprites', build_brick_sprites)
+        
+        # Initialize managers
+        self.score_manager = ScoreManager(
+            backend=self.settings_manager.get_setting('score_backend', SCORE_BACKEND_JSON),
+            leaderboard_client=create_leaderboard_client(
+                self.settings_manager.get_setting('leaderboard_server')))
+        self.powerup_manager = PowerUpManager(max_powerups)
         self.collision_detector = CollisionDetector()
         self.hud = HUD()
+        self.telemetry = create_telemetry_recorder(
+            self.settings_manager.get_setting('telemetry_file'),
+            [state.value for state in GameState])
+        self.state_codes = {state: code for code, state in enumerate(GameState)}
+        self.gc_policy = GCPolicy(self.settings_manager.get_setting('gc_policy', GC_POLICY_DEFAULT))
         
         # Initialize UI
         self.main_menu = MainMenu()
@@ -48,21 +71,53 @@ class GameStateManager:
         self.current_state = GameState.MAIN_MENU
         self.game_score = GameScore()
         
-        # Game objects
+        # Game objects; balls and lasers come from fixed pools so play
+        # itself never allocates them
+        self.ball_pool = ObjectPool(lambda: Ball(0, 0), max_balls)
+        self.laser_pool = ObjectPool(lambda: Laser(0, 0), max_lasers)
         self.paddle = None
         self.balls = []
-        self.bricks = []
+        self.brick_field = None
+        self.combo = 0  # Bricks hit since the ball last touched the paddle
         
         # Timing
         self.level_complete_timer = 0
         self.show_controls = False
         
-        # Initialize game
-        self.reset_game()
+        # Set when gameplay is simulated on its own thread
+        self.renderer = None
+        
+        # Mouse motion for raw mouse mode, gathered by the main thread
+        self.relative_mouse = RelativeMouse()
+    
+    @property
+    def sound_manager(self) -> SoundManager:
+        """Sound manager, waiting for the audio to finish generating if needed"""
+        return self.assets.get('sounds')
+    
+    @property
+    def level_manager(self) -> LevelManager:
+        """Level manager, waiting for the level data to finish loading if needed"""
+        return self.assets.get('levels')
+    
+    def close(self):
+        """Stop the background loaders, writers and workers the game started"""
+        self.assets.shutdown()
+        self.score_manager.close()
+        self.settings_manager.close()
+        if self.telemetry:
+            self.telemetry.close()
+        sound_manager = self.assets.peek('sounds')
+        if sound_manager:
+            sound_manager.shutdown()
+        level_manager = self.assets.peek('levels')
+        if level_manager:
+            level_manager.close()
     
     def reset_game(self):
         """Reset game to initial state"""
         self.game_score.reset()
+        self.level_manager.set_endless(self.settings_manager.get_setting('endless_mode', False))
         self.powerup_manager.clear_all(self.paddle if self.paddle else None)
         self.setup_level(1)
     
@@ -73,26 +128,45 @@ class GameStateManager:
         # Create paddle
         paddle_x = SCREEN_WIDTH // 2
         paddle_y = SCREEN_HEIGHT - PADDLE_Y_OFFSET
-        self.paddle = Paddle(paddle_x, paddle_y)
+        if self.paddle:
+            self.paddle.clear_lasers()
+        self.paddle = Paddle(paddle_x, paddle_y, self.laser_pool)
         
         # Create ball
-        ball_speed = BALL_SPEED + (level_num - 1) * BALL_SPEED_INCREMENT
-        ball_speed *= self.level_manager.get_ball_speed_multiplier(level_num)
-        
-        ball_x = paddle_x
-        ball_y = paddle_y - BALL_RADIUS - 10
-        ball = Ball(ball_x, ball_y, ball_speed)
-        ball.stick_to_paddle(self.paddle)
-        self.balls = [ball]
+        self.ball_pool.release_all(self.balls)
+        self.serve_ball()
+        self.combo = 0
         
         # Create bricks
-        self.bricks = self.level_manager.create_bricks_for_level(level_num)
+        self.brick_field = self.level_manager.create_brick_field(level_num)
+        # Endless levels are generated in the background while this one is played
+        self.level_manager.prepare_level(level_num + 1)
         
         # Clear power-ups
         self.powerup_manager.clear_all(self.paddle)
+        
+        # Collect and freeze now, so the pause is not in the level's first frame
+        self.gc_policy.level_starting()
+    
+    def serve_ball(self):
+        """Put a new ball on the paddle at the current level's speed"""
+        ball_speed = BALL_SPEED + (self.game_score.level - 1) * BALL_SPEED_INCREMENT
+        ball_speed *= self.level_manager.get_ball_speed_multiplier(self.game_score.level)
+        
+        ball_x = self.paddle.x + self.paddle.width // 2
+        ball_y = self.paddle.y - BALL_RADIUS - 10
+        ball = self.ball_pool.acquire(ball_x, ball_y, ball_speed)
+        ball.stick_to_paddle(self.paddle)
+        self.balls.append(ball)
+    
+    def is_ball_in_play(self, ball: Ball) -> bool:
+        """Check if a ball is still above the paddle"""
+        return not self.collision_detector.is_ball_below_paddle(ball, self.paddle)
     
-    def handle_events(self, events: List[pygame.event.Event], keys, mouse_pos, mouse_clicked):
-        """Handle events based on current state"""
+    def handle_events(self, inputs: InputSnapshot):
+        """Handle this frame's input based on current state"""
+        events, mouse_pos, mouse_clicked = inputs.events, inputs.mouse_pos, inputs.mouse_clicked
+        
         if self.current_state == GameState.MAIN_MENU:
             action = self.main_menu.update(mouse_pos, mouse_clicked, events)
             if action == "start_game":
@@ -127,59 +201,50 @@ class GameStateManager:
         
         elif self.current_state == GameState.CONTROLS:
             # Any key returns to main menu
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    self.show_controls = False
-                    self.current_state = GameState.SETTINGS
+            if inputs.key_presses:
+                self.show_controls = False
+                self.current_state = GameState.SETTINGS
         
         elif self.current_state == GameState.PLAYING:
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.current_state = GameState.PAUSED
-                    elif event.key == pygame.K_SPACE:
-                        # Release stuck balls or shoot laser
-                        for ball in self.balls:
-                            if ball.stuck_to_paddle:
-                                ball.release_from_paddle()
-                        if self.paddle.can_shoot:
-                            self.paddle.shoot_laser()
+            if inputs.pressed(pygame.K_ESCAPE):
+                self.current_state = GameState.PAUSED
+            if inputs.pressed(pygame.K_SPACE):
+                # Release stuck balls or shoot laser
+                for ball in self.balls:
+                    if ball.stuck_to_paddle:
+                        ball.release_from_paddle()
+                if self.paddle.can_shoot:
+                    self.paddle.shoot_laser()
         
         elif self.current_state == GameState.PAUSED:
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.current_state = GameState.PLAYING
-                    elif event.key == pygame.K_r:
-                        self.setup_level(self.game_score.level)
-                        self.current_state = GameState.PLAYING
-                    elif event.key == pygame.K_m:
-                        self.current_state = GameState.MAIN_MENU
+            if inputs.pressed(pygame.K_ESCAPE):
+                self.current_state = GameState.PLAYING
+            elif inputs.pressed(pygame.K_r):
+                self.setup_level(self.game_score.level)
+                self.current_state = GameState.PLAYING
+            elif inputs.pressed(pygame.K_m):
+                self.current_state = GameState.MAIN_MENU
         
         elif self.current_state == GameState.LEVEL_COMPLETE:
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        if self.game_score.level >= TOTAL_LEVELS:
-                            # Game completed!
-                            self.check_high_score()
-                        else:
-                            self.game_score.next_level()
-                            self.setup_level(self.game_score.level)
-                            self.current_state = GameState.PLAYING
+            if inputs.pressed(pygame.K_SPACE):
+                if not self.level_manager.has_level(self.game_score.level + 1):
+                    # Game completed!
+                    self.check_high_score()
+                else:
+                    self.game_score.next_level()
+                    self.setup_level(self.game_score.level)
+                    self.current_state = GameState.PLAYING
         
         elif self.current_state == GameState.GAME_OVER:
-            for event in events:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        self.reset_game()
-                        self.current_state = GameState.PLAYING
-                    elif event.key == pygame.K_ESCAPE:
-                        self.current_state = GameState.MAIN_MENU
+            if inputs.pressed(pygame.K_r):
+                self.reset_game()
+                self.current_state = GameState.PLAYING
+            elif inputs.pressed(pygame.K_ESCAPE):
+                self.current_state = GameState.MAIN_MENU
         
         elif self.current_state == GameState.NAME_ENTRY:
             if self.name_entry_menu:
-                result = self.name_entry_menu.update(1/60, events)  # Assuming 60 FPS
+                result = self.name_entry_menu.update(events)
                 if result:
                     # Save high score
                     self.score_manager.add_score(result, self.game_score.score, self.game_score.level)
@@ -189,17 +254,42 @@ class GameStateManager:
     
     def update(self, dt: float, keys, mouse_pos):
         """Update game state"""
+        sound_manager = self.assets.peek('sounds')
+        if sound_manager:
+            sound_manager.update()
+        
+        self.gc_policy.update(self.current_state in (GameState.PLAYING, GameState.PAUSED))
+        
         if self.current_state == GameState.PLAYING:
-            self.update_gameplay(dt, keys, mouse_pos)
+            # The time a static screen slept before play resumed is not game time
+            self.update_gameplay(min(dt, MAX_GAMEPLAY_DT), keys, mouse_pos)
         elif self.current_state == GameState.LEVEL_COMPLETE:
             self.level_complete_timer += dt * 1000
+        elif self.current_state == GameState.NAME_ENTRY and self.name_entry_menu:
+            self.name_entry_menu.advance(dt)
+    
+    def idle_timeout(self) -> Optional[float]:
+        """Seconds until the screen next changes on its own, or None while it animates"""
+        if self.current_state == GameState.PLAYING:
+            return None
+        sound_manager = self.assets.peek('sounds')
+        if sound_manager and sound_manager.is_streaming():
+            return None
+        if self.current_state == GameState.MAIN_MENU and not self.assets.all_ready():
+            return None  # Loading progress bar
+        if self.current_state == GameState.NAME_ENTRY and self.name_entry_menu:
+            return min(self.name_entry_menu.time_to_blink(), IDLE_MAX_WAIT)
+        return IDLE_MAX_WAIT
     
     def update_gameplay(self, dt: float, keys, mouse_pos):
         """Update gameplay logic"""
+        self.sound_manager.begin_frame()
+        
         # Update paddle
         control_mode = self.settings_manager.get_control_mode()
         mouse_pos_for_paddle = mouse_pos if control_mode == "mouse" else None
-        self.paddle.update(dt, keys, mouse_pos_for_paddle, control_mode)
+        mouse_dx = self.relative_mouse.take() if control_mode == CONTROL_MODE_MOUSE_RAW else 0
+        self.paddle.update(dt, keys, mouse_pos_for_paddle, control_mode, mouse_dx)
         
         # Update power-ups
         old_falling_count = len(self.powerup_manager.falling_powerups)
@@ -211,7 +301,7 @@ class GameStateManager:
             self.sound_manager.play_sound('powerup_collect')
         
         # Update balls
-        balls_to_remove = []
+        profiler.begin('collision')
         for ball in self.balls:
             # Apply slow power-up effect
             ball_speed = ball.speed
@@ -229,7 +319,7 @@ class GameStateManager:
                 self.collision_detector.resolve_ball_wall_collision(ball, wall_collisions)
                 for wall in wall_collisions:
                     if wall in ['left', 'right', 'top']:
-                        self.sound_manager.play_sound('paddle_center', 0.3)
+                        self.sound_manager.play_sound('paddle_center', 0.3, category='wall')
             
             # Check paddle collision
             if not ball.stuck_to_paddle:
@@ -240,47 +330,45 @@ class GameStateManager:
                     else:
                         ball.bounce_paddle(self.paddle, hit_position)
                     self.sound_manager.play_paddle_hit(hit_position)
+                    self.combo = 0
             
-            # Check brick collisions
-            for brick in self.bricks:
-                if not brick.destroyed:
-                    collision_side = self.collision_detector.ball_brick_collision(ball, brick)
-                    if collision_side:
-                        self.collision_detector.resolve_ball_brick_collision(ball, brick, collision_side)
-                        
-                        # Hit the brick
-                        if brick.hit():
-                            # Brick destroyed
-                            self.game_score.add_points(brick.points)
-                            self.powerup_manager.create_powerup(
-                                brick.x + brick.width // 2,
-                                brick.y + brick.height // 2
-                            )
-                        
-                        self.sound_manager.play_brick_hit(brick.type)
-                        break
-            
-            # Check laser collisions
-            for laser in self.paddle.lasers[:]:
-                for brick in self.bricks:
-                    if not brick.destroyed and self.collision_detector.laser_brick_collision(laser, brick):
-                        if brick.hit():
-                            self.game_score.add_points(brick.points)
-                            self.powerup_manager.create_powerup(
-                                brick.x + brick.width // 2,
-                                brick.y + brick.height // 2
-                            )
-                        self.sound_manager.play_brick_hit(brick.type)
-                        self.paddle.lasers.remove(laser)
-                        break
-            
-            # Check if ball fell below paddle
-            if self.collision_detector.is_ball_below_paddle(ball, self.paddle):
-                balls_to_remove.append(ball)
-        
-        # Remove fallen balls
-        for ball in balls_to_remove:
-            self.balls.remove(ball)
+            # Check brick collisions against the bricks around the ball
+            for brick in self.brick_field.query(ball.get_rect()):
+                collision_side = self.collision_detector.ball_brick_collision(ball, brick)
+                if collision_side:
+                    self.collision_detector.resolve_ball_brick_collision(ball, brick, collision_side)
+                    
+                    # Hit the brick
+                    if self.brick_field.hit_brick(brick):
+                        # Brick destroyed
+                        self.game_score.add_points(brick.points)
+                        self.powerup_manager.create_powerup(
+                            brick.x + brick.width // 2,
+                            brick.y + brick.height // 2
+                        )
+                    
+                    self.sound_manager.play_brick_hit(brick.type, self.combo, ball.x)
+                    self.combo += 1
+                    break
+        
+        # Check laser collisions
+        for laser in self.paddle.lasers:
+            for brick in self.brick_field.query(laser.get_rect()):
+                if self.collision_detector.laser_brick_collision(laser, brick):
+                    if self.brick_field.hit_brick(brick):
+                        self.game_score.add_points(brick.points)
+                        self.powerup_manager.create_powerup(
+                            brick.x + brick.width // 2,
+                            brick.y + brick.height // 2
+                        )
+                    self.sound_manager.play_brick_hit(brick.type, x=laser.x)
+                    laser.active = False
+                    break
+        self.paddle.remove_spent_lasers()
+        profiler.end()
+        
+        # Remove balls that fell below the paddle
+        compact(self.balls, self.ball_pool, self.is_ball_in_play)
         
         # Check if all balls are lost
         if not self.balls:
@@ -290,29 +378,20 @@ class GameStateManager:
                 self.check_high_score()
             else:
                 self.sound_manager.play_sound('life_lost')
-                # Respawn ball
-                ball_x = self.paddle.x + self.paddle.width // 2
-                ball_y = self.paddle.y - BALL_RADIUS - 10
-                ball_speed = BALL_SPEED + (self.game_score.level - 1) * BALL_SPEED_INCREMENT
-                ball_speed *= self.level_manager.get_ball_speed_multiplier(self.game_score.level)
-                
-                ball = Ball(ball_x, ball_y, ball_speed)
-                ball.stick_to_paddle(self.paddle)
-                self.balls = [ball]
+                self.serve_ball()
         
         # Handle multi-ball power-up activation
         if self.powerup_manager.check_multiball_request():
             self.activate_multiball()
         
         # Check level completion
-        if self.level_manager.is_level_complete(self.bricks):
+        if self.brick_field.is_complete():
             self.sound_manager.play_sound('level_complete')
             self.current_state = GameState.LEVEL_COMPLETE
             self.level_complete_timer = 0
         
-        # Update bricks
-        for brick in self.bricks:
-            brick.update(dt)
+        # Update brick flash effects
+        self.brick_field.update(dt)
     
     def activate_multiball(self):
         """Activate multi-ball power-up"""
@@ -321,7 +400,9 @@ class GameStateManager:
             if not original_ball.stuck_to_paddle:
                 # Create two additional balls
                 for i in range(2):
-                    new_ball = Ball(original_ball.x, original_ball.y, original_ball.speed)
+                    new_ball = self.ball_pool.acquire(original_ball.x, original_ball.y, original_ball.speed)
+                    if new_ball is None:
+                        break
                     angle_offset = (i + 1) * 0.5  # Different angles
                     new_ball.dx = original_ball.dx + angle_offset
                     new_ball.dy = original_ball.dy
@@ -336,10 +417,22 @@ class GameStateManager:
         else:
             self.current_state = GameState.GAME_OVER
     
+    def record_frame(self, dt: float, work_time: float):
+        """Log a frame's timing and entity counts if telemetry is on"""
+        if self.telemetry is None:
+            return
+        self.telemetry.record(dt * 1000, work_time * 1000, len(self.balls),
+                              self.brick_field.remaining if self.brick_field else 0,
+                              len(self.paddle.lasers) if self.paddle else 0,
+                              len(self.powerup_manager.falling_powerups),
+                              self.state_codes[self.current_state])
+    
     def draw(self, screen):
         """Draw current game state"""
         if self.current_state == GameState.MAIN_MENU:
             self.main_menu.draw(screen)
+            if not self.assets.all_ready():
+                self.hud.draw_loading_progress(screen, self.assets.progress())
         
         elif self.current_state == GameState.HIGH_SCORES:
             self.high_score_menu.draw(screen)
@@ -375,30 +468,42 @@ class GameStateManager:
     
     def draw_gameplay(self, screen):
         """Draw the main gameplay screen"""
-        screen.fill(BACKGROUND)
+        if self.renderer:
+            # The simulation runs on its own thread; draw its latest snapshot
+            self.renderer.draw(screen)
+            return
         
-        # Draw game area border
-        border_rect = pygame.Rect(GAME_AREA_LEFT - 5, GAME_AREA_TOP - 5, 
-                                 GAME_AREA_RIGHT - GAME_AREA_LEFT + 10,
-                                 GAME_AREA_BOTTOM - GAME_AREA_TOP + 10)
-        pygame.draw.rect(screen, BORDER_COLOR, border_rect, 3)
+        self.draw_background(screen)
         
         # Draw game objects
+        if self.brick_field:
+            self.brick_field.draw(screen)
+        
         if self.paddle:
             self.paddle.draw(screen)
         
         for ball in self.balls:
             ball.draw(screen)
         
-        for brick in self.bricks:
-            if not brick.destroyed:
-                brick.draw(screen)
-        
         self.powerup_manager.draw(screen)
         
-        # Draw HUD
-        level_name = self.level_manager.get_level_name(self.game_score.level)
-        self.hud.draw_score(screen, self.game_score.score)
-        self.hud.draw_lives(screen, self.game_score.lives)
-        self.hud.draw_level(screen, self.game_score.level, level_name)
-        self.hud.draw_powerup_timers(screen, self.powerup_manager)
+        self.draw_hud(screen, self.game_score.score, self.game_score.lives, self.game_score.level,
+                      self.powerup_manager.get_active_timers())
+    
+    def draw_background(self, screen):
+        """Clear the screen and draw the game area border"""
+        screen.fill(BACKGROUND)
+        border_rect = pygame.Rect(GAME_AREA_LEFT - 5, GAME_AREA_TOP - 5, 
+                                 GAME_AREA_RIGHT - GAME_AREA_LEFT + 10,
+                                 GAME_AREA_BOTTOM - GAME_AREA_TOP + 10)
+        pygame.draw.rect(screen, BORDER_COLOR, border_rect, 3)
+    
+    def draw_hud(self, screen, score: int, lives: int, level: int, timers):
+        """Draw score, lives, level and power-up timers"""
+        profiler.begin('hud')
+        level_name = self.level_manager.get_level_name(level)
+        self.hud.draw_score(screen, score)
+        self.hud.draw_lives(screen, lives)
+        self.hud.draw_level(screen, level, level_name)
+        self.hud.draw_powerup_timers(screen, timers)
+        profiler.end()
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+import pygame
+from utils.constants import *
+from utils.profiler import percentile
+
+class InputSnapshot(NamedTuple):
+    """Everything the game reads from the input devices in one frame.
+
+    Captured once at the start of the frame and handed to every consumer,
+    so the frame sees one consistent state.
+    """
+    events: Tuple[pygame.event.Event, ...]
+    keys: object                  # pygame.key.get_pressed() result
+    key_presses: FrozenSet[int]   # Keys that went down this frame
+    mouse_pos: Tuple[int, int]
+    mouse_rel: Tuple[int, int]    # Mouse motion since the previous capture
+    mouse_clicked: bool
+    quit: bool
+    captured_at: float            # perf_counter() when the events left the queue
+
+    def pressed(self, key: int) -> bool:
+        """Check if a key went down this frame"""
+        return key in self.key_presses
+
+def configure_event_filter():
+    """Only queue the event types the game handles.
+
+    Mouse motion in particular can queue hundreds of events a second; the
+    pointer position and motion are read from pygame.mouse.get_pos() and
+    get_rel() instead, which SDL keeps current whether or not the events
+    are queued.
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(INPUT_EVENT_TYPES))
+
+def capture_input() -> InputSnapshot:
+    """Drain the event queue and read the device state"""
+    events = tuple(pygame.event.get())
+    captured_at = time.perf_counter()
+    key_presses = frozenset(event.key for event in events if event.type == pygame.KEYDOWN)
+    return InputSnapshot(
+        events=events,
+        keys=pygame.key.get_pressed(),
+        key_presses=key_presses,
+        mouse_pos=pygame.mouse.get_pos(),
+        mouse_rel=pygame.mouse.get_rel(),
+        mouse_clicked=pygame.mouse.get_pressed()[0],
+        quit=any(event.type == pygame.QUIT for event in events),
+        captured_at=captured_at
+    )
+
+def wait_for_input(timeout: float):
+    """Sleep until input arrives or the timeout passes; the input stays queued.
+
+    Mouse motion and window exposure, resizing or restoring also wake the
+    wait, so hover highlights and uncovered windows are redrawn, but are
+    not put back on the queue afterwards; mouse motion is only queued
+    during the wait. pygame can only wait by taking an event off the
+    queue, so the wait is skipped while input is already queued, and
+    whatever was taken off is put back in its original order.
+    """
+    pending = pygame.event.get()
+    if not pending:
+        wait_only = [event_type for event_type in IDLE_WAKE_EVENT_TYPES
+                     if event_type not in INPUT_EVENT_TYPES]
+        pygame.event.set_allowed(wait_only)
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        pygame.event.set_blocked(wait_only)
+        if event.type == pygame.NOEVENT:
+            return
+        pending = [event] + pygame.event.get()
+    for queued in pending:
+        if queued.type not in IDLE_WAKE_EVENT_TYPES:
+            pygame.event.post(queued)
+
+class RelativeMouse:
+    """Horizontal mouse motion gathered between physics steps.
+
+    The main thread adds motion whenever it reads the mouse, the last time
+    just before the step when the simulation runs on the same thread; the
+    step takes everything gathered so far.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dx = 0
+
+    def add(self, dx: int):
+        if dx:
+            with self.lock:
+                self.dx += dx
+
+    def take(self) -> int:
+        """Motion since the last take"""
+        with self.lock:
+            dx = self.dx
+            self.dx = 0
+        return dx
+
+def sample_relative_mouse() -> int:
+    """Pump pending input and return the mouse motion since the last read"""
+    pygame.event.pump()
+    return pygame.mouse.get_rel()[0]
+
+class InputLatencyTracker:
+    """Time from paddle input to the flip that first shows the paddle moved.
+
+    pygame does not pass on SDL's event timestamps, so the clock starts
+    when the input was taken from the queue. Time the event spent in the
+    queue before that, up to one frame, is not included. Input that never
+    moves the paddle (pushing against a wall) is dropped after a timeout.
+    """
+
+    def __init__(self, window: int = PROFILER_WINDOW, timeout: float = INPUT_LATENCY_TIMEOUT):
+        self.samples = deque(maxlen=window)  # Milliseconds
+        self.timeout = timeout
+        self.pending: Optional[float] = None  # Capture time of unseen paddle input
+        self.last_paddle_x = None
+
+    def capture(self, inputs: InputSnapshot, mouse_control: bool):
+        """Start timing if this frame's input should move the paddle"""
+        if mouse_control:
+            moved = inputs.mouse_rel[0] != 0
+        else:
+            moved = inputs.pressed(pygame.K_LEFT) or inputs.pressed(pygame.K_RIGHT)
+        if moved and self.pending is None:
+            self.pending = inputs.captured_at
+
+    def flipped(self, paddle_x: Optional[float]):
+        """Call after the display flip with the paddle position that was drawn"""
+        now = time.perf_counter()
+        moved = paddle_x is not None and self.last_paddle_x is not None and paddle_x != self.last_paddle_x
+        self.last_paddle_x = paddle_x
+        if self.pending is None:
+            return
+        if moved:
+            self.samples.append((now - self.pending) * 1000)
+            self.pending = None
+        elif now - self.pending > self.timeout:
+            self.pending = None
+
+    def reset(self):
+        """Forget pending input, e.g. when play is not running"""
+        self.pending = None
+        self.last_paddle_x = None
+
+    def stats(self) -> Optional[Tuple[float, float, float]]:
+        """p50, p95 and p99 latency in milliseconds, or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return tuple(percentile(ordered, p) for p in (50, 95, 99))
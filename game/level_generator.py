@@ -0,0 +1,311 @@
+import json
+import math
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from utils.constants import *
+from utils.storage import atomic_write_json
+from game.entities import Brick
+from game.level_pack import (BRICK_TYPE_CODES, DEFAULT_LEGEND, DEFAULT_LEVEL_PACK, brick_points,
+                             compile_level, decode_level_record)
+
+# Accepted levels are kept next to the bundled level pack
+DEFAULT_GENERATED_LEVELS = os.path.join(os.path.dirname(DEFAULT_LEVEL_PACK), 'generated_levels.json')
+
+# Relative weight of each brick type as difficulty goes from 0 to 1
+BRICK_WEIGHTS = {
+    'N': lambda d: 1.0 - 0.8 * d,
+    'M': lambda d: 0.6,
+    'H': lambda d: 0.1 + 0.9 * d,
+    'U': lambda d: 0.25 * d
+}
+
+def random_pattern(rng: random.Random, difficulty: float,
+                   rows: int = BRICK_ROWS, cols: int = BRICK_COLS) -> List[str]:
+    """Make a mirror-symmetric brick pattern whose density and toughness follow difficulty"""
+    filled_rows = max(1, min(rows, round(rows * (0.3 + 0.6 * difficulty))))
+    density = 0.5 + 0.45 * difficulty
+    chars = list(BRICK_WEIGHTS)
+    weights = [weight(difficulty) for weight in BRICK_WEIGHTS.values()]
+
+    pattern = []
+    for row_idx in range(rows):
+        if row_idx >= filled_rows:
+            pattern.append(' ' * cols)
+            continue
+        half = [rng.choices(chars, weights)[0] if rng.random() < density else ' '
+                for _ in range((cols + 1) // 2)]
+        pattern.append(''.join(half + half[:cols // 2][::-1]))
+
+    # A level needs at least one brick to break
+    if not any(char in row for row in pattern for char in 'NMH'):
+        row = pattern[0]
+        pattern[0] = 'N' + row[1:-1] + 'N' if cols > 1 else 'N'
+    return pattern
+
+def simulate_level(pattern: List[str], ball_speed: float, seed: int,
+                   max_frames: int = GENERATOR_SIM_FRAMES) -> Tuple[int, int, int, int]:
+    """Play a level headlessly with a bot paddle.
+
+    The ball is a point moving one frame at a time through the brick grid,
+    so each frame costs a single cell lookup however many bricks there are.
+    Returns (frames played, balls missed, hits landed, hits needed to clear).
+    """
+    rng = random.Random(seed)
+    rows = len(pattern)
+    cols = max(len(row) for row in pattern)
+    cell_w = BRICK_WIDTH + BRICK_PADDING
+    cell_h = BRICK_HEIGHT + BRICK_PADDING
+    grid_x = (SCREEN_WIDTH - (cols * cell_w - BRICK_PADDING)) // 2
+    grid_y = GAME_AREA_TOP + 50
+    paddle_y = SCREEN_HEIGHT - PADDLE_Y_OFFSET
+    half_paddle = PADDLE_WIDTH / 2
+
+    # Hits left per cell, -1 for unbreakable
+    max_hits = {brick_type: Brick(0, 0, brick_type).max_hits for brick_type in BRICK_TYPE_CODES}
+    hits_left = []
+    remaining = 0
+    total_hits = 0
+    for row in pattern:
+        cells = []
+        for col_idx in range(cols):
+            brick_type = DEFAULT_LEGEND.get(row[col_idx] if col_idx < len(row) else ' ')
+            if brick_type == 'unbreakable':
+                cells.append(-1)
+            elif brick_type in max_hits:
+                cells.append(max_hits[brick_type])
+                remaining += 1
+                total_hits += max_hits[brick_type]
+            else:
+                cells.append(0)
+        hits_left.append(cells)
+
+    def serve():
+        angle = rng.uniform(-math.pi / 4, math.pi / 4)
+        return (SCREEN_WIDTH / 2, paddle_y - BALL_RADIUS - 10,
+                math.sin(angle) * ball_speed, -math.cos(angle) * ball_speed)
+
+    x, y, dx, dy = serve()
+    paddle_x = SCREEN_WIDTH / 2
+    aim_error = 0.0
+    misses = 0
+    hits = 0
+    frame = 0
+
+    while frame < max_frames and remaining:
+        frame += 1
+        prev_x, prev_y = x, y
+        x += dx
+        y += dy
+
+        # Walls
+        if x < GAME_AREA_LEFT or x > GAME_AREA_RIGHT:
+            dx = -dx
+            x = prev_x
+        if y < GAME_AREA_TOP:
+            dy = -dy
+            y = prev_y
+
+        # Bricks
+        row_idx = int((y - grid_y) // cell_h)
+        col_idx = int((x - grid_x) // cell_w)
+        if 0 <= row_idx < rows and 0 <= col_idx < cols and hits_left[row_idx][col_idx]:
+            if hits_left[row_idx][col_idx] > 0:
+                hits_left[row_idx][col_idx] -= 1
+                hits += 1
+                if not hits_left[row_idx][col_idx]:
+                    remaining -= 1
+            # Bounce off the side the ball entered through
+            if int((prev_x - grid_x) // cell_w) != col_idx:
+                dx = -dx
+            else:
+                dy = -dy
+            x, y = prev_x, prev_y
+
+        # Bot paddle chases the falling ball, aiming slightly off
+        if dy > 0:
+            target = x + aim_error
+            if abs(target - paddle_x) > PADDLE_SPEED:
+                paddle_x += PADDLE_SPEED if target > paddle_x else -PADDLE_SPEED
+            else:
+                paddle_x = target
+
+        if dy > 0 and prev_y < paddle_y <= y:
+            hit_position = (x - paddle_x) / half_paddle
+            if abs(hit_position) <= 1:
+                angle = hit_position * math.pi / 3
+                dx = math.sin(angle) * ball_speed
+                dy = -max(abs(math.cos(angle)), 0.3) * ball_speed
+                aim_error = rng.uniform(-1, 1) * half_paddle * GENERATOR_BOT_AIM_ERROR
+            else:
+                misses += 1
+                x, y, dx, dy = serve()
+                paddle_x = SCREEN_WIDTH / 2
+
+    return frame, misses, hits, total_hits
+
+def evaluate_candidate(args: Tuple[List[str], float, List[int]]) -> float:
+    """Score a pattern's difficulty between 0 (trivial) and 1 (hopeless).
+
+    Each run is cut short, so the time to clear the whole level is projected
+    from the rate hits were landed; every projected missed ball adds a
+    penalty. A level that takes GENERATOR_REFERENCE_FRAMES scores 0.5.
+    """
+    pattern, ball_speed, seeds = args
+    total = 0.0
+    for seed in seeds:
+        frames, misses, hits, total_hits = simulate_level(pattern, ball_speed, seed)
+        scale = total_hits / max(hits, 1)
+        projected = (frames + misses * GENERATOR_MISS_PENALTY) * scale
+        total += projected / (projected + GENERATOR_REFERENCE_FRAMES)
+    return total / len(seeds)
+
+def endless_difficulty(endless_index: int) -> float:
+    """Target difficulty of the nth generated level (1-based)"""
+    return min(GENERATOR_MAX_DIFFICULTY,
+               ENDLESS_BASE_DIFFICULTY + (endless_index - 1) * ENDLESS_DIFFICULTY_STEP)
+
+def level_ball_speed(level_num: int, speed_multiplier: float) -> float:
+    """Ball speed the game will use for a level, as set up by GameStateManager"""
+    return (BALL_SPEED + (level_num - 1) * BALL_SPEED_INCREMENT) * speed_multiplier
+
+class LevelGenerator:
+    """Generates levels to a target difficulty, scored by simulated play.
+
+    Each round makes a batch of candidate patterns and plays every one
+    headlessly in a process pool; the first candidate close enough to the
+    target difficulty is accepted. Accepted levels are cached on disk so a
+    level number always maps to the same layout for the same settings.
+    """
+
+    def __init__(self, cache_file: str = DEFAULT_GENERATED_LEVELS, rows: int = BRICK_ROWS,
+                 cols: int = BRICK_COLS, workers: Optional[int] = None):
+        self.cache_file = cache_file
+        self.rows = rows
+        self.cols = cols
+        self.workers = workers or max(1, min(GENERATOR_CANDIDATES, (os.cpu_count() or 2) - 1))
+        self.points = brick_points()
+        self.cache = self.load_cache()
+        self.lock = threading.Lock()
+        self.pool = None
+        # Generation runs here so the game never waits for a pool round trip
+        self.background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-generator")
+        self.pending: Dict[int, Future] = {}
+        self.closed = False
+
+    def load_cache(self) -> Dict:
+        """Load previously accepted levels"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                pass
+        return {}
+
+    def cache_key(self, level_num: int, difficulty: float, speed_multiplier: float) -> str:
+        """Key of a level generated for these settings; tuning changes miss the cache"""
+        return f"{self.rows}x{self.cols}:{level_num}:{difficulty:.3f}:{speed_multiplier:.3f}"
+
+    def level_settings(self, level_num: int, endless_index: int) -> Tuple[float, float]:
+        """Target difficulty and ball speed multiplier of a generated level"""
+        base_speed = level_ball_speed(level_num, 1.0)
+        speed_multiplier = min(ENDLESS_SPEED_MULTIPLIER, GENERATOR_MAX_BALL_SPEED / base_speed)
+        return endless_difficulty(endless_index), speed_multiplier
+
+    def evaluate(self, jobs: List[Tuple[List[str], float, List[int]]]) -> List[float]:
+        """Score candidates in parallel, or in this thread if no pool can run"""
+        if self.workers > 1 and not self.closed:
+            try:
+                if self.pool is None:
+                    # spawn avoids forking a process that has audio and loader threads
+                    self.pool = ProcessPoolExecutor(self.workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+                return list(self.pool.map(evaluate_candidate, jobs))
+            except (OSError, BrokenProcessPool, NotImplementedError) as e:
+                print(f"Error starting level generator workers ({e}), generating in one process")
+                self.workers = 1
+                self.pool = None
+        return [evaluate_candidate(job) for job in jobs]
+
+    def generate(self, level_num: int, difficulty: float, speed_multiplier: float) -> Dict:
+        """Search for a pattern whose simulated difficulty is close to the target"""
+        ball_speed = level_ball_speed(level_num, speed_multiplier)
+        best = None
+        for round_idx in range(GENERATOR_MAX_ROUNDS):
+            if self.closed and best:
+                break
+            base_seed = level_num * 10000 + round_idx * 100
+            rng = random.Random(base_seed)
+            candidates = [random_pattern(rng, difficulty, self.rows, self.cols)
+                          for _ in range(GENERATOR_CANDIDATES)]
+            seeds = [base_seed + i for i in range(GENERATOR_SIMULATIONS)]
+            scores = self.evaluate([(pattern, ball_speed, seeds) for pattern in candidates])
+
+            for pattern, score in zip(candidates, scores):
+                error = abs(score - difficulty)
+                if best is None or error < best[0]:
+                    best = (error, pattern, score)
+            if best[0] <= GENERATOR_TOLERANCE:
+                break
+
+        return {
+            'name': f"Endless {level_num}",
+            'ball_speed_multiplier': speed_multiplier,
+            'pattern': best[1],
+            'difficulty': round(best[2], 3)
+        }
+
+    def build_level(self, level_num: int, endless_index: int) -> Dict:
+        """Generate (or load) a level and store it in the cache"""
+        difficulty, speed_multiplier = self.level_settings(level_num, endless_index)
+        key = self.cache_key(level_num, difficulty, speed_multiplier)
+        with self.lock:
+            level = self.cache.get(key)
+        if level is None:
+            level = self.generate(level_num, difficulty, speed_multiplier)
+            # Held while writing so nothing is saved once close() has returned
+            with self.lock:
+                if self.closed:
+                    return level
+                self.cache[key] = level
+                try:
+                    atomic_write_json(self.cache_file, self.cache)
+                except OSError as e:
+                    print(f"Error saving generated levels: {e}")
+        return level
+
+    def request(self, level_num: int, endless_index: int) -> Future:
+        """Start generating a level in the background (idempotent)"""
+        with self.lock:
+            future = self.pending.get(level_num)
+            if future is None:
+                future = self.background.submit(self.build_level, level_num, endless_index)
+                self.pending[level_num] = future
+            return future
+
+    def get_level(self, level_num: int, endless_index: int) -> Dict:
+        """Get a generated level in the format LevelPack serves, waiting if needed"""
+        level = self.request(level_num, endless_index).result()
+        with self.lock:
+            self.pending.pop(level_num, None)
+        record = compile_level(level, DEFAULT_LEGEND, self.points)
+        return decode_level_record(record)
+
+    def close(self):
+        """Stop the background generator and its worker processes without waiting.
+
+        A level still being generated is abandoned: its search stops after
+        the current round and the result is not saved.
+        """
+        with self.lock:
+            self.closed = True
+        self.background.shutdown(wait=False, cancel_futures=True)
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,207 @@
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from game.entities import Brick
+
+# Project-relative location of the bundled level pack
+DEFAULT_LEVEL_PACK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'assets', 'levels', 'levels.json')
+
+# Brick type codes stored in the compiled grid (0 is an empty cell)
+BRICK_TYPE_CODES = {'normal': 1, 'medium': 2, 'hard': 3, 'unbreakable': 4}
+CODE_BRICK_TYPES = {code: brick_type for brick_type, code in BRICK_TYPE_CODES.items()}
+DEFAULT_LEGEND = {'N': 'normal', 'M': 'medium', 'H': 'hard', 'U': 'unbreakable', ' ': 'empty'}
+
+# Compiled file layout (little-endian):
+#   header  magic, format version, level count, source mtime_ns, source size
+#   table   (offset, length) of each level record
+#   record  speed, rows, cols, stats, name length, name, rows * cols type codes
+PACK_MAGIC = b'AWKL'
+PACK_VERSION = 1
+HEADER = struct.Struct('<4sHHqQ')
+TABLE_ENTRY = struct.Struct('<II')
+RECORD = struct.Struct('<dHH7IH')
+
+STAT_KEYS = ('total_bricks', 'breakable_bricks', 'normal_bricks', 'medium_bricks',
+             'hard_bricks', 'unbreakable_bricks')
+
+# Decoded levels kept around; older ones are decoded again on demand
+DECODED_LEVEL_CACHE = 4
+
+def source_stamp(source_file: str):
+    """Identify a version of the source pack by modification time and size"""
+    info = os.stat(source_file)
+    return info.st_mtime_ns, info.st_size
+
+def compile_level(level: Dict, legend: Dict[str, str], points: Dict[str, int]) -> bytes:
+    """Compile one level into a binary record with precomputed stats"""
+    pattern = level['pattern']
+    rows = len(pattern)
+    cols = max((len(row) for row in pattern), default=0)
+
+    grid = bytearray(rows * cols)
+    counts = dict.fromkeys(STAT_KEYS, 0)
+    max_score = 0
+    for row_idx, row in enumerate(pattern):
+        for col_idx, brick_char in enumerate(row):
+            brick_type = legend.get(brick_char, 'empty')
+            code = BRICK_TYPE_CODES.get(brick_type, 0)
+            if not code:
+                continue
+            grid[row_idx * cols + col_idx] = code
+            counts['total_bricks'] += 1
+            counts[f'{brick_type}_bricks'] += 1
+            if brick_type != 'unbreakable':
+                counts['breakable_bricks'] += 1
+                max_score += points[brick_type]
+
+    # Level completion bonus
+    max_score += 1000
+
+    name = level.get('name', '').encode('utf-8')
+    stats = [counts[key] for key in STAT_KEYS] + [max_score]
+    return (RECORD.pack(float(level.get('ball_speed_multiplier', 1.0)), rows, cols,
+                        *stats, len(name))
+            + name + bytes(grid))
+
+def compile_level_pack(source_file: str) -> bytes:
+    """Compile a JSON level pack into the binary format"""
+    with open(source_file, 'r') as f:
+        pack = json.load(f)
+
+    legend = pack.get('legend', DEFAULT_LEGEND)
+    points = brick_points()
+    records = [compile_level(level, legend, points) for level in pack['levels']]
+
+    mtime_ns, size = source_stamp(source_file)
+    header = HEADER.pack(PACK_MAGIC, PACK_VERSION, len(records), mtime_ns, size)
+
+    offset = HEADER.size + TABLE_ENTRY.size * len(records)
+    table = []
+    for record in records:
+        table.append(TABLE_ENTRY.pack(offset, len(record)))
+        offset += len(record)
+
+    return header + b''.join(table) + b''.join(records)
+
+def decode_level_record(buffer, offset: int = 0) -> Dict:
+    """Decode a compiled level record into the dict LevelManager serves"""
+    speed, rows, cols, *stats, name_length = RECORD.unpack_from(buffer, offset)
+    name_start = offset + RECORD.size
+    grid_start = name_start + name_length
+
+    stats_dict = dict(zip(STAT_KEYS, stats))
+    stats_dict['max_score'] = stats[-1]
+
+    return {
+        'name': bytes(buffer[name_start:grid_start]).decode('utf-8'),
+        'ball_speed_multiplier': speed,
+        'rows': rows,
+        'cols': cols,
+        'grid': bytes(buffer[grid_start:grid_start + rows * cols]),
+        'stats': stats_dict
+    }
+
+def brick_points() -> Dict[str, int]:
+    """Points awarded for each brick type"""
+    return {brick_type: Brick(0, 0, brick_type).points for brick_type in BRICK_TYPE_CODES}
+
+class LevelPack:
+    """Levels read lazily from a compiled binary cache of a JSON level pack.
+
+    The cache is rebuilt whenever the source pack changes. Opening the pack
+    reads only the header and offset table; each level is decoded the first
+    time it is asked for.
+    """
+
+    def __init__(self, source_file: str = DEFAULT_LEVEL_PACK, cache_file: Optional[str] = None):
+        self.source_file = source_file
+        self.cache_file = cache_file or os.path.splitext(source_file)[0] + ".bin"
+        self.file = None
+        self.buffer = None
+        self.offsets = []
+        self.decoded = OrderedDict()
+        self.open()
+
+    @property
+    def level_count(self) -> int:
+        return len(self.offsets)
+
+    def open(self):
+        """Map the compiled cache, rebuilding it if it is missing or stale"""
+        if not self.load_cache():
+            data = compile_level_pack(self.source_file)
+            try:
+                temp_file = self.cache_file + ".tmp"
+                with open(temp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_file, self.cache_file)
+            except OSError as e:
+                # Read-only install: keep the compiled pack in memory instead
+                print(f"Error writing level cache: {e}")
+                self.buffer = data
+                self.read_table()
+                return
+            if not self.load_cache():
+                raise ValueError(f"could not load compiled level pack {self.cache_file}")
+
+    def load_cache(self) -> bool:
+        """Map the cache file if it matches the format and the source pack"""
+        self.close()
+        if not os.path.exists(self.cache_file):
+            return False
+
+        try:
+            self.file = open(self.cache_file, 'rb')
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, mtime_ns, size = HEADER.unpack_from(self.buffer, 0)
+            if (magic != PACK_MAGIC or version != PACK_VERSION
+                    or (mtime_ns, size) != source_stamp(self.source_file)):
+                self.close()
+                return False
+            self.read_table()
+            return True
+        except (OSError, ValueError, struct.error):
+            self.close()
+            return False
+
+    def read_table(self):
+        """Read the level offset table"""
+        count = HEADER.unpack_from(self.buffer, 0)[2]
+        self.offsets = [TABLE_ENTRY.unpack_from(self.buffer, HEADER.size + i * TABLE_ENTRY.size)
+                        for i in range(count)]
+
+    def get_level(self, level_num: int) -> Optional[Dict]:
+        """Get a decoded level (1-based), or None if the pack has no such level"""
+        if not 1 <= level_num <= len(self.offsets):
+            return None
+
+        level = self.decoded.get(level_num)
+        if level is None:
+            level = self.decode_level(level_num)
+            self.decoded[level_num] = level
+            if len(self.decoded) > DECODED_LEVEL_CACHE:
+                self.decoded.popitem(last=False)
+        else:
+            self.decoded.move_to_end(level_num)
+        return level
+
+    def decode_level(self, level_num: int) -> Dict:
+        """Decode one level record"""
+        offset, _ = self.offsets[level_num - 1]
+        return decode_level_record(self.buffer, offset)
+
+    def close(self):
+        """Release the mapped cache file"""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self.file:
+            self.file.close()
+        self.buffer = None
+        self.file = None
+        self.offsets = []
+        self.decoded.clear()
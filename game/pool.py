@@ -0,0 +1,52 @@
+from typing import Callable, Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+class ObjectPool(Generic[T]):
+    """Fixed-capacity pool of reusable entities.
+
+    Every object is created up front. acquire() takes one from the free
+    list and calls its reset() with the given arguments; release() puts it
+    back. When the pool is empty acquire() returns None, so callers cap
+    spawning instead of allocating during play.
+    """
+
+    def __init__(self, factory: Callable[[], T], capacity: int):
+        self.capacity = capacity
+        self.free: List[T] = [factory() for _ in range(capacity)]
+
+    def acquire(self, *args) -> Optional[T]:
+        """Take an object and reset it, or None if the pool is exhausted"""
+        if not self.free:
+            return None
+        obj = self.free.pop()
+        obj.reset(*args)
+        return obj
+
+    def release(self, obj: T):
+        """Return an object to the pool"""
+        self.free.append(obj)
+
+    def release_all(self, items: List[T]):
+        """Return every object in a list to the pool and empty the list"""
+        self.free.extend(items)
+        items.clear()
+
+    def in_use(self) -> int:
+        """Number of objects currently handed out"""
+        return self.capacity - len(self.free)
+
+def compact(items: List[T], pool: ObjectPool, keep: Callable[..., bool], *args):
+    """Remove items for which keep(item, *args) is false, in place.
+
+    Kept items slide down over removed ones and the tail is truncated, so
+    no new list is built; removed items go back to the pool.
+    """
+    write = 0
+    for item in items:
+        if keep(item, *args):
+            items[write] = item
+            write += 1
+        else:
+            pool.release(item)
+    del items[write:]
@@ -1,16 +1,22 @@
 import pygame
+import heapq
 import random
 import math
 from typing import List, Tuple
 from utils.constants import *
+from game.pool import ObjectPool, compact
 
 class PowerUp:
     def __init__(self, x: float, y: float, powerup_type: str):
+        self.size = POWERUP_SIZE
+        self.speed = POWERUP_FALL_SPEED
+        self.reset(x, y, powerup_type)
+    
+    def reset(self, x: float, y: float, powerup_type: str):
+        """(Re)initialize the power-up, so pooled power-ups can be reused"""
         self.x = x
         self.y = y
         self.type = powerup_type
-        self.size = POWERUP_SIZE
-        self.speed = POWERUP_FALL_SPEED
         self.collected = False
         self.rotation = 0
     
@@ -97,40 +103,93 @@ class PowerUp:
             pygame.draw.line(screen, WHITE, center, (x, y - 3), 1)
             pygame.draw.line(screen, WHITE, center, (x + 2, y), 1)
 
+def enable_laser(manager, paddle):
+    paddle.can_shoot = True
+
+def disable_laser(manager, paddle):
+    paddle.can_shoot = False
+
+def enable_sticky(manager, paddle):
+    paddle.is_sticky = True
+
+def disable_sticky(manager, paddle):
+    paddle.is_sticky = False
+
+def expand_paddle(manager, paddle):
+    paddle.expand()
+
+def shrink_paddle(manager, paddle):
+    paddle.shrink()
+
+def reset_paddle(manager, paddle):
+    paddle.reset_size()
+
+def request_multiball(manager, paddle):
+    # Multi-ball is handled immediately by the game state
+    manager.multi_ball_requested = True
+
+class PowerUpEffect:
+    """How a power-up type is applied, how long it lasts and how it is undone"""
+    
+    def __init__(self, duration: float = 0, activate=None, deactivate=None, cancels: Tuple[str, ...] = ()):
+        self.duration = duration      # Milliseconds; 0 for instant effects
+        self.activate = activate
+        self.deactivate = deactivate
+        self.cancels = cancels        # Effects ended when this one starts
+
+# Effect registry; effects with no activate or deactivate are read by the
+# game state through is_active (e.g. slow)
+POWERUP_EFFECTS = {
+    'multi_ball': PowerUpEffect(activate=request_multiball),
+    'laser': PowerUpEffect(POWERUP_DURATION['laser'], enable_laser, disable_laser),
+    'sticky': PowerUpEffect(POWERUP_DURATION['sticky'], enable_sticky, disable_sticky),
+    'expand': PowerUpEffect(POWERUP_DURATION['expand'], expand_paddle, reset_paddle, cancels=('shrink',)),
+    'shrink': PowerUpEffect(POWERUP_DURATION['shrink'], shrink_paddle, reset_paddle, cancels=('expand',)),
+    'slow': PowerUpEffect(POWERUP_DURATION['slow'])
+}
+
+POWERUP_TYPES = tuple(POWERUP_EFFECTS)
+
 class PowerUpManager:
-    def __init__(self):
-        self.active_powerups = []
+    def __init__(self, max_powerups: int = MAX_FALLING_POWERUPS):
         self.falling_powerups = []
-        self.powerup_timers = {}
+        self.pool = ObjectPool(lambda: PowerUp(0, 0, 'multi_ball'), max_powerups)
         self.multi_ball_requested = False
+        
+        # Timed effects: absolute expiry times on the manager's own clock
+        # (milliseconds of gameplay), plus a min-heap of (expiry, order, type)
+        # so update only looks at the earliest expiry. Entries left behind
+        # when an effect is refreshed or cancelled are skipped when popped.
+        self.clock = 0.0
+        self.expiry_times = {}
+        self.expiry_heap = []
+        self.timer_order = 0
     
     def create_powerup(self, x: float, y: float) -> bool:
         """Create a random power-up at the given position"""
         if random.random() < POWERUP_DROP_CHANCE:
-            powerup_types = ['multi_ball', 'laser', 'sticky', 'expand', 'shrink', 'slow']
-            powerup_type = random.choice(powerup_types)
-            self.falling_powerups.append(PowerUp(x, y, powerup_type))
-            return True
+            powerup = self.pool.acquire(x, y, random.choice(POWERUP_TYPES))
+            if powerup:
+                self.falling_powerups.append(powerup)
+                return True
         return False
     
     def update(self, dt: float, paddle):
         """Update all power-ups and check for collection"""
-        # Update falling power-ups
-        self.falling_powerups = [
-            powerup for powerup in self.falling_powerups 
-            if powerup.update(dt) and not self.check_collection(powerup, paddle)
-        ]
-        
-        # Update active power-up timers
-        expired_powerups = []
-        for powerup_type, timer in self.powerup_timers.items():
-            self.powerup_timers[powerup_type] = timer - dt * 1000
-            if self.powerup_timers[powerup_type] <= 0:
-                expired_powerups.append(powerup_type)
-        
-        # Remove expired power-ups
-        for powerup_type in expired_powerups:
-            self.deactivate_powerup(powerup_type, paddle)
+        # Update falling power-ups, returning collected and lost ones to the pool
+        compact(self.falling_powerups, self.pool, self.keep_falling, dt, paddle)
+        
+        # Expire timed effects whose time has come
+        self.clock += dt * 1000
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= self.clock:
+            expiry, _, powerup_type = heapq.heappop(heap)
+            if self.expiry_times.get(powerup_type) == expiry:
+                self.deactivate_powerup(powerup_type, paddle)
+    
+    def keep_falling(self, powerup: PowerUp, dt: float, paddle) -> bool:
+        """Move a falling power-up; False once it is collected or off screen"""
+        return powerup.update(dt) and not self.check_collection(powerup, paddle)
     
     def check_collection(self, powerup: PowerUp, paddle) -> bool:
         """Check if power-up is collected by paddle"""
@@ -144,80 +203,50 @@ class PowerUpManager:
         return False
     
     def activate_powerup(self, powerup_type: str, paddle):
-        """Activate a power-up effect"""
-        if powerup_type == 'multi_ball':
-            # Multi-ball is handled immediately by the game state
-            # Signal that multi-ball should be activated
-            self.multi_ball_requested = True
-        
-        elif powerup_type == 'laser':
-            paddle.can_shoot = True
-            self.powerup_timers['laser'] = POWERUP_DURATION['laser']
-        
-        elif powerup_type == 'sticky':
-            paddle.is_sticky = True
-            self.powerup_timers['sticky'] = POWERUP_DURATION['sticky']
-        
-        elif powerup_type == 'expand':
-            if 'shrink' in self.powerup_timers:
-                del self.powerup_timers['shrink']
-                paddle.reset_size()
-            paddle.expand()
-            self.powerup_timers['expand'] = POWERUP_DURATION['expand']
-        
-        elif powerup_type == 'shrink':
-            if 'expand' in self.powerup_timers:
-                del self.powerup_timers['expand']
-                paddle.reset_size()
-            paddle.shrink()
-            self.powerup_timers['shrink'] = POWERUP_DURATION['shrink']
-        
-        elif powerup_type == 'slow':
-            # Slow ball is handled by the game state
-            self.powerup_timers['slow'] = POWERUP_DURATION['slow']
-        
-        # Add to active power-ups list
-        if powerup_type not in [p['type'] for p in self.active_powerups]:
-            self.active_powerups.append({
-                'type': powerup_type,
-                'timer': self.powerup_timers.get(powerup_type, 0)
-            })
+        """Activate a power-up effect, restarting its timer if already active"""
+        effect = POWERUP_EFFECTS[powerup_type]
+        for cancelled in effect.cancels:
+            if cancelled in self.expiry_times:
+                self.deactivate_powerup(cancelled, paddle)
+        
+        if effect.activate:
+            effect.activate(self, paddle)
+        
+        if effect.duration:
+            expiry = self.clock + effect.duration
+            self.expiry_times[powerup_type] = expiry
+            self.timer_order += 1
+            heapq.heappush(self.expiry_heap, (expiry, self.timer_order, powerup_type))
     
     def deactivate_powerup(self, powerup_type: str, paddle):
         """Deactivate a power-up effect"""
-        if powerup_type == 'laser':
-            paddle.can_shoot = False
-        
-        elif powerup_type == 'sticky':
-            paddle.is_sticky = False
-        
-        elif powerup_type in ['expand', 'shrink']:
-            paddle.reset_size()
-        
-        # Remove from timers and active list
-        if powerup_type in self.powerup_timers:
-            del self.powerup_timers[powerup_type]
-        
-        self.active_powerups = [
-            p for p in self.active_powerups if p['type'] != powerup_type
-        ]
+        effect = POWERUP_EFFECTS[powerup_type]
+        if effect.deactivate and paddle is not None:
+            effect.deactivate(self, paddle)
+        # Any heap entry for this type is now stale
+        self.expiry_times.pop(powerup_type, None)
     
     def is_active(self, powerup_type: str) -> bool:
         """Check if a power-up is currently active"""
-        return powerup_type in self.powerup_timers
+        return powerup_type in self.expiry_times
     
     def get_remaining_time(self, powerup_type: str) -> float:
         """Get remaining time for a power-up in seconds"""
-        if powerup_type in self.powerup_timers:
-            return max(0, self.powerup_timers[powerup_type] / 1000)
+        if powerup_type in self.expiry_times:
+            return max(0, (self.expiry_times[powerup_type] - self.clock) / 1000)
         return 0
     
+    def get_active_timers(self) -> List[Tuple[str, float]]:
+        """Get (type, remaining seconds) for each active timed power-up, in activation order"""
+        return [(powerup_type, max(0, (expiry - self.clock) / 1000))
+                for powerup_type, expiry in self.expiry_times.items()]
+    
     def clear_all(self, paddle):
         """Clear all active power-ups"""
-        for powerup_type in list(self.powerup_timers.keys()):
+        for powerup_type in list(self.expiry_times):
             self.deactivate_powerup(powerup_type, paddle)
-        self.falling_powerups.clear()
-        self.active_powerups.clear()
+        self.pool.release_all(self.falling_powerups)
+        self.expiry_heap.clear()
     
     def check_multiball_request(self) -> bool:
         """Check if multi-ball was requested and reset the flag"""
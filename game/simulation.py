@@ -0,0 +1,241 @@
+import copy
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional, Tuple
+import pygame
+from utils.constants import *
+from game.entities import Ball, Brick, Laser, Paddle, BRICK_SPRITES, build_brick_sprites
+from game.powerups import PowerUp
+
+class Snapshot:
+    """Everything the renderer needs to draw one simulation tick.
+
+    The entities are copies into objects the snapshot preallocates, so
+    publishing a tick allocates nothing once the slots are filled. A
+    snapshot is only rewritten when it is neither the latest one nor the
+    one the renderer holds, so it never changes while being drawn.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self.paddle: Optional[Paddle] = None  # Its lasers are copies too
+        self.balls: List[Ball] = []
+        self.powerups: List[PowerUp] = []
+        self.flashing: List[Brick] = []       # Bricks drawn over the layer while they flash
+        self.score = 0
+        self.lives = 0
+        self.level = 0
+        self.timers: List[Tuple[str, float]] = []
+
+        # Preallocated copies the fields above point into; they grow only
+        # if the game ever has more entities than its pools allow
+        self.paddle_copy = Paddle.__new__(Paddle)
+        self.lasers: List[Laser] = []
+        self.laser_slots = [Laser.__new__(Laser) for _ in range(MAX_LASERS)]
+        self.ball_slots = [Ball.__new__(Ball) for _ in range(MAX_BALLS)]
+        self.powerup_slots = [PowerUp.__new__(PowerUp) for _ in range(MAX_FALLING_POWERUPS)]
+        self.brick_slots: List[Brick] = []
+
+def copy_entities(items, slots: list, copies: list, cls):
+    """Copy entities' attributes into preallocated slots, listing the copies"""
+    copies.clear()
+    for item in items:
+        if len(copies) == len(slots):
+            slots.append(cls.__new__(cls))
+        target = slots[len(copies)]
+        target.__dict__.update(item.__dict__)
+        copies.append(target)
+
+class BrickEvent(NamedTuple):
+    """Bricks whose look changed during a tick, as copies.
+
+    A new brick field starts with an event that carries every brick.
+    """
+    tick: int
+    field: object
+    bricks: Tuple[Brick, ...]
+
+class SimulationThread:
+    """Runs gameplay updates on their own thread at a fixed rate.
+
+    Each step holds the lock, so the main thread takes it too while its
+    event handling changes the game state. At the end of every step the
+    drawable state is copied into one of three reused Snapshots, the one
+    that is neither the latest nor held by the renderer, which then becomes
+    the latest, so the renderer always sees a complete tick. Brick changes cannot be skipped the way intermediate
+    snapshots are, since the renderer only redraws changed bricks into its
+    layer, so they travel through a queue instead.
+    """
+
+    def __init__(self, game, rate: float = SIMULATION_RATE):
+        self.game = game
+        self.step = 1 / rate
+        self.lock = threading.Lock()
+        self.input = (pygame.key.get_pressed(), (0, 0))
+        self.tick = 0
+        self.buffers = [Snapshot() for _ in range(3)]
+        self.front = 0    # Latest published snapshot
+        self.reading = 0  # Snapshot the renderer took last
+        self.swap_lock = threading.Lock()
+        self.brick_events = deque()
+        self.field = None  # Brick field the last events were taken from
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Publish the current state, then start stepping in the background"""
+        if self.thread:
+            return
+        with self.lock:
+            self.publish()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.thread:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    def set_input(self, keys, mouse_pos):
+        """Latest keyboard and mouse state, read by the next step"""
+        self.input = (keys, mouse_pos)
+
+    def latest(self) -> Snapshot:
+        """Most recently published snapshot; it stays intact until the next call"""
+        with self.swap_lock:
+            self.reading = self.front
+            return self.buffers[self.reading]
+
+    def run(self):
+        """Simulation thread: fixed steps, catching up after a stall up to a limit"""
+        next_step = time.perf_counter()
+        while not self.stop_event.is_set():
+            steps = 0
+            while time.perf_counter() >= next_step and steps < SIMULATION_MAX_STEPS:
+                with self.lock:
+                    keys, mouse_pos = self.input
+                    self.game.update(self.step, keys, mouse_pos)
+                    self.tick += 1
+                    self.collect_brick_events()
+                    self.publish()
+                steps += 1
+                next_step += self.step
+            if steps == SIMULATION_MAX_STEPS:
+                # Too far behind to catch up; drop the backlog instead of spiralling
+                next_step = time.perf_counter() + self.step
+            self.stop_event.wait(max(0.0, next_step - time.perf_counter()))
+
+    def collect_brick_events(self):
+        """Queue copies of the bricks changed since the last step"""
+        field = self.game.brick_field
+        if field is None:
+            return
+        if field is not self.field:
+            self.field = field
+            bricks = field.bricks
+        elif field.dirty:
+            bricks = field.dirty
+        else:
+            return
+        self.brick_events.append(BrickEvent(self.tick, field, tuple(copy.copy(brick) for brick in bricks)))
+        field.dirty.clear()
+
+    def publish(self):
+        """Copy the drawable state into a free snapshot and make it the latest"""
+        with self.swap_lock:
+            front, reading = self.front, self.reading
+        back = 3 - front - reading if front != reading else (front + 1) % 3
+        snapshot = self.buffers[back]
+
+        game = self.game
+        snapshot.tick = self.tick
+        if game.paddle:
+            paddle = snapshot.paddle = snapshot.paddle_copy
+            paddle.__dict__.update(game.paddle.__dict__)
+            copy_entities(game.paddle.lasers, snapshot.laser_slots, snapshot.lasers, Laser)
+            paddle.lasers = snapshot.lasers
+        else:
+            snapshot.paddle = None
+        copy_entities(game.balls, snapshot.ball_slots, snapshot.balls, Ball)
+        copy_entities(game.powerup_manager.falling_powerups, snapshot.powerup_slots,
+                      snapshot.powerups, PowerUp)
+        field = game.brick_field
+        copy_entities(field.flashing if field else (), snapshot.brick_slots, snapshot.flashing, Brick)
+        snapshot.score = game.game_score.score
+        snapshot.lives = game.game_score.lives
+        snapshot.level = game.game_score.level
+        snapshot.timers = game.powerup_manager.get_active_timers()
+
+        with self.swap_lock:
+            self.front = back
+
+class SnapshotRenderer:
+    """Draws gameplay from the simulation thread's snapshots.
+
+    The renderer keeps its own cached brick layer, updated from the brick
+    events up to the tick being drawn, so it never reads the live bricks.
+    """
+
+    def __init__(self, simulation: SimulationThread, game):
+        self.simulation = simulation
+        self.game = game
+        self.field = None
+        self.layer = None
+
+    def apply_brick_events(self, tick: int):
+        """Redraw the bricks that changed up to a tick into the layer"""
+        events = self.simulation.brick_events
+        while events and events[0].tick <= tick:
+            event = events.popleft()
+            if event.field is not self.field:
+                self.build_layer(event.field)
+            for brick in event.bricks:
+                self.draw_into_layer(brick)
+
+    def build_layer(self, field):
+        """Start an empty layer for a new brick field"""
+        self.field = field
+        self.layer = pygame.Surface((max(1, field.cols * field.cell_width),
+                                     max(1, field.rows * field.cell_height)))
+        self.layer.fill(BRICK_LAYER_COLORKEY)
+        self.layer.set_colorkey(BRICK_LAYER_COLORKEY)
+        if ('normal', 0, field.brick_width, field.brick_height) not in BRICK_SPRITES:
+            build_brick_sprites(field.brick_width, field.brick_height)
+
+    def draw_into_layer(self, brick: Brick):
+        """Redraw one brick's cell; flashing bricks are drawn over the layer instead"""
+        field = self.field
+        rect = pygame.Rect(brick.x - field.left, brick.y - field.top, brick.width, brick.height)
+        self.layer.fill(BRICK_LAYER_COLORKEY, rect)
+        if brick.destroyed or brick.flash_timer > 0:
+            return
+        sprite = BRICK_SPRITES.get((brick.type, brick.hits, brick.width, brick.height))
+        if sprite is not None:
+            self.layer.blit(sprite, rect)
+        else:
+            brick.render(self.layer, rect, brick.get_color(), BRICK_COLORS[brick.type][1])
+
+    def draw(self, screen):
+        """Draw the latest snapshot"""
+        snapshot = self.simulation.latest()
+        self.apply_brick_events(snapshot.tick)
+        game = self.game
+        game.draw_background(screen)
+
+        if self.layer is not None:
+            screen.blit(self.layer, (self.field.left, self.field.top))
+        for brick in snapshot.flashing:
+            brick.draw(screen)
+
+        if snapshot.paddle:
+            snapshot.paddle.draw(screen)
+        for ball in snapshot.balls:
+            ball.draw(screen)
+        for powerup in snapshot.powerups:
+            powerup.draw(screen)
+
+        game.draw_hud(screen, snapshot.score, snapshot.lives, snapshot.level, snapshot.timers)
@@ -18,24 +18,35 @@ Version: 1.0
 import pygame
 import sys
 import os
-from typing import Tuple
+import time
+import threading
+from contextlib import nullcontext
+from typing import Optional, Tuple
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils.constants import *
-from game.game_states import GameStateManager
+from game.game_states import GameStateManager, GameState
+from game.input import (InputLatencyTracker, capture_input, configure_event_filter,
+                        sample_relative_mouse, wait_for_input)
+from game.simulation import SimulationThread, SnapshotRenderer
+from utils.profiler import profiler
+from utils.memory import allocation_profiler
+from utils.sampler import SamplingProfiler, default_profile_path
 
 class AwskanoidGame:
     def __init__(self):
         """Initialize the game"""
-        # Initialize Pygame
-        pygame.init()
-        pygame.mixer.init()
+        # Initialize Pygame (the mixer is opened by the audio backend, and
+        # only when sound is enabled and a device is available)
+        pygame.display.init()
+        pygame.font.init()
         
         # Set up display
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("AWSKANOID - A Modern Breakout Experience")
+        configure_event_filter()
         
         # Set up game icon (create a simple icon using pygame)
         self.create_game_icon()
@@ -43,12 +54,28 @@ class AwskanoidGame:
         # Initialize clock for frame rate control
         self.clock = pygame.time.Clock()
         
-        # Initialize game state manager
+        # Initialize game state manager (audio, levels and sprites keep
+        # loading in the background after this returns)
         self.game_state_manager = GameStateManager()
         
+        # Optionally step gameplay on its own thread at a fixed rate, so a
+        # slow frame here cannot hold up physics
+        self.simulation = None
+        if self.game_state_manager.settings_manager.get_setting('threaded_simulation', False):
+            self.simulation = SimulationThread(self.game_state_manager)
+            self.game_state_manager.renderer = SnapshotRenderer(self.simulation, self.game_state_manager)
+            self.simulation.start()
+        self.state_lock = self.simulation.lock if self.simulation else nullcontext()
+        
+        # Input is read once per frame; the tracker times it until the paddle moves on screen
+        self.input = None
+        self.input_latency = InputLatencyTracker()
+        self.mouse_grabbed = False
+        
         # Game loop control
         self.running = True
         self.show_fps = False  # Set to True for debugging
+        self.sampler = None    # Sampling profiler while a capture is running
         
         print("AWSKANOID initialized successfully!")
         print(f"Screen resolution: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
@@ -76,33 +103,114 @@ class AwskanoidGame:
         pygame.display.set_icon(icon_surface)
     
     def handle_events(self) -> bool:
-        """Handle pygame events"""
-        events = pygame.event.get()
-        keys = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = pygame.mouse.get_pressed()[0]
-        
-        # Check for quit events
-        for event in events:
-            if event.type == pygame.QUIT:
-                return False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_F1:
-                    self.show_fps = not self.show_fps
+        """Read this frame's input and handle it"""
+        inputs = self.input = capture_input()
+        
+        # Check for quit and debug keys
+        if inputs.quit:
+            return False
+        if inputs.pressed(pygame.K_F1):
+            self.show_fps = not self.show_fps
+        if inputs.pressed(pygame.K_F3):
+            self.toggle_frame_profiler()
+        if inputs.pressed(pygame.K_F4):
+            self.toggle_allocation_profiler()
+        if inputs.pressed(pygame.K_F5):
+            self.toggle_sampling_profiler()
+        
+        game = self.game_state_manager
+        was_grabbed = self.mouse_grabbed
+        self.update_mouse_grab()
+        if game.current_state == GameState.PLAYING:
+            if was_grabbed and self.mouse_grabbed:
+                game.relative_mouse.add(inputs.mouse_rel[0])
+            self.input_latency.capture(inputs, not game.settings_manager.is_keyboard_mode())
+        else:
+            self.input_latency.reset()
         
         # Handle game state events
-        result = self.game_state_manager.handle_events(events, keys, mouse_pos, mouse_clicked)
+        with self.state_lock:
+            result = game.handle_events(inputs)
         if result == "quit":
             return False
         
         return True
     
+    def update_mouse_grab(self):
+        """Grab and hide the pointer while raw mouse mode is being played"""
+        game = self.game_state_manager
+        grab = game.current_state == GameState.PLAYING and game.settings_manager.is_raw_mouse_mode()
+        if grab != self.mouse_grabbed:
+            # With the pointer grabbed and hidden SDL reports unbounded relative motion
+            pygame.event.set_grab(grab)
+            pygame.mouse.set_visible(not grab)
+            self.mouse_grabbed = grab
+            # Motion from before the switch must not move the paddle
+            pygame.mouse.get_rel()
+            game.relative_mouse.take()
+    
+    def idle_timeout(self) -> Optional[float]:
+        """How long the loop may sleep before the next frame, or None to run at full rate"""
+        if self.show_fps or profiler.enabled or self.sampler:
+            return None  # Debug overlays and profilers need a steady frame stream
+        return self.game_state_manager.idle_timeout()
+    
+    def toggle_frame_profiler(self):
+        """Show or hide the frame profiler; hiding it also ends allocation profiling"""
+        if profiler.enabled and allocation_profiler.enabled:
+            self.toggle_allocation_profiler()
+        profiler.toggle()
+    
+    def toggle_allocation_profiler(self):
+        """Start allocation profiling, or stop it and print the report"""
+        if allocation_profiler.enabled:
+            profiler.tracker = None
+            allocation_profiler.stop()
+            print(allocation_profiler.report())
+        else:
+            # Allocations are charged to the frame profiler's phases
+            if not profiler.enabled:
+                profiler.set_enabled(True)
+            allocation_profiler.start()
+            profiler.tracker = allocation_profiler
+            print("Allocation profiling started (F4 again for the report)")
+    
+    def toggle_sampling_profiler(self):
+        """Start a sampling profiler capture, or stop it and write the flame graph stacks"""
+        if self.sampler is None:
+            # Gameplay steps run on the simulation thread when it is on
+            thread_ids = [threading.main_thread().ident]
+            if self.simulation and self.simulation.thread:
+                thread_ids.append(self.simulation.thread.ident)
+            self.sampler = SamplingProfiler(thread_ids=thread_ids)
+            self.sampler.start()
+            print("Sampling profiler started (F5 again to stop)")
+            return
+        
+        self.sampler.stop()
+        path = default_profile_path()
+        try:
+            self.sampler.write(path)
+            print(f"Wrote {self.sampler.samples} samples over {self.sampler.duration:.1f}s to {path}")
+            for label, share in self.sampler.top_functions(5):
+                print(f"  {share:6.1%}  {label}")
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+        self.sampler = None
+    
     def update(self, dt: float):
         """Update game logic"""
-        keys = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
+        keys, mouse_pos = self.input.keys, self.input.mouse_pos
         
-        self.game_state_manager.update(dt, keys, mouse_pos)
+        # Read mouse motion once more, as close to the physics step as possible
+        if self.mouse_grabbed:
+            self.game_state_manager.relative_mouse.add(sample_relative_mouse())
+        
+        if self.simulation:
+            # The simulation thread steps with the latest input on its own clock
+            self.simulation.set_input(keys, mouse_pos)
+        else:
+            self.game_state_manager.update(dt, keys, mouse_pos)
     
     def draw(self):
         """Draw everything to the screen"""
@@ -110,42 +218,88 @@ class AwskanoidGame:
         self.screen.fill(BACKGROUND)
         
         # Draw current game state
+        profiler.begin('draw')
         self.game_state_manager.draw(self.screen)
+        profiler.end()
         
         # Draw FPS counter if enabled
         if self.show_fps:
             fps = self.clock.get_fps()
             self.game_state_manager.hud.draw_fps(self.screen, fps)
         
+        # Draw the frame profiler if enabled
+        if profiler.enabled:
+            self.game_state_manager.hud.draw_profiler(self.screen, profiler, self.input_latency.stats())
+        
         # Update display
+        profiler.begin('flip')
         pygame.display.flip()
+        profiler.end()
+        self.input_latency.flipped(self.shown_paddle_x())
     
-    def run(self):
-        """Main game loop"""
+    def shown_paddle_x(self) -> Optional[float]:
+        """Paddle position in the frame just drawn"""
+        if self.simulation:
+            paddle = self.simulation.latest().paddle
+        else:
+            paddle = self.game_state_manager.paddle
+        return paddle.x if paddle else None
+    
+    def run(self, max_frames: Optional[int] = None):
+        """Main game loop; stops after max_frames frames if given (used to time startup)"""
         print("Starting AWSKANOID...")
-        print("Press F1 to toggle FPS counter")
+        print("Press F1 to toggle FPS counter, F3 for the frame profiler, F4 for allocation profiling,")
+        print("F5 to capture a sampling profile")
         print("Have fun!")
         
+        frames = 0
         while self.running:
+            # Static screens sleep until there is input or something to redraw,
+            # once the first frame is on screen
+            timeout = self.idle_timeout()
+            if timeout is not None and frames:
+                wait_for_input(timeout)
+            
             # Calculate delta time
             dt = self.clock.tick(FPS) / 1000.0  # Convert to seconds
+            frame_start = time.perf_counter()
+            profiler.begin_frame()
             
             # Handle events
-            if not self.handle_events():
+            profiler.begin('events')
+            running = self.handle_events()
+            profiler.end()
+            if not running:
                 self.running = False
                 break
             
             # Update game logic
+            profiler.begin('update')
             self.update(dt)
+            profiler.end()
             
             # Draw everything
             self.draw()
+            profiler.end_frame()
+            with self.state_lock:
+                self.game_state_manager.record_frame(dt, time.perf_counter() - frame_start)
+            
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                break
         
         self.quit()
     
     def quit(self):
         """Clean up and quit the game"""
         print("Thanks for playing AWSKANOID!")
+        if self.simulation:
+            self.simulation.stop()
+        if allocation_profiler.enabled:
+            self.toggle_allocation_profiler()
+        if self.sampler:
+            self.toggle_sampling_profiler()
+        self.game_state_manager.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1 @@
+# Networking package
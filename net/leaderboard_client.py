@@ -0,0 +1,225 @@
+import json
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional
+
+from utils.constants import *
+from utils.storage import atomic_write_json, append_json_line, read_json_lines
+from net.protocol import encode_message, decode_message
+
+class LeaderboardClient:
+    """Sends scores to the shared leaderboard without ever blocking the game.
+
+    submit() only appends to an in-memory outbox. A worker thread moves
+    scores into a durable spool file, sends them in batches over one
+    persistent connection and retries with exponential backoff while the
+    service is unreachable. Every score carries a submission id, so a batch
+    that is resent after a lost reply is not stored twice. The global table is fetched in the background
+    and kept in a local cache file, so it can be shown even when offline.
+    """
+
+    def __init__(self, host: str = LEADERBOARD_HOST, port: int = LEADERBOARD_PORT,
+                 spool_file: str = "leaderboard_spool.journal",
+                 cache_file: str = "leaderboard_cache.json",
+                 refresh_interval: float = LEADERBOARD_REFRESH_INTERVAL,
+                 backoff_min: float = LEADERBOARD_BACKOFF_MIN,
+                 backoff_max: float = LEADERBOARD_BACKOFF_MAX):
+        self.host = host
+        self.port = port
+        self.spool_file = spool_file
+        self.cache_file = cache_file
+        self.refresh_interval = refresh_interval
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+
+        self.outbox = deque()
+        self.spooled = read_json_lines(spool_file)
+        legacy = [entry for entry in self.spooled if 'submission_id' not in entry]
+        if legacy:
+            # Spooled before ids existed; the ids must survive a restart to dedupe resends
+            for entry in legacy:
+                entry['submission_id'] = uuid.uuid4().hex
+            try:
+                self.rewrite_spool()
+            except OSError as e:
+                print(f"Error updating leaderboard spool: {e}")
+        self.cached_scores = self.load_cache()
+        self.cache_version = 0  # Bumped whenever a fresh table arrives
+        self.connected = False
+
+        self.connection = None
+        self.stream = None
+        self.request_id = 0
+        self.backoff = 0.0
+        self.next_attempt = 0.0
+        self.next_refresh = 0.0
+
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="leaderboard-client", daemon=True)
+        self.thread.start()
+
+    def load_cache(self) -> List[Dict]:
+        """Load the last global table that was fetched"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                pass
+        return []
+
+    def submit(self, entry: Dict):
+        """Queue a score for the shared leaderboard (never blocks)"""
+        entry = dict(entry)
+        entry.setdefault('submission_id', uuid.uuid4().hex)
+        self.outbox.append(entry)
+        self.wake.set()
+
+    def get_cached_scores(self) -> List[Dict]:
+        """Get the locally cached copy of the global table"""
+        return self.cached_scores
+
+    def pending_count(self) -> int:
+        """Number of scores not yet accepted by the service"""
+        return len(self.outbox) + len(self.spooled)
+
+    def run(self):
+        """Worker loop: spool, send, refresh and back off"""
+        while not self.stopping:
+            self.spool_outbox()
+            now = time.monotonic()
+
+            if now >= self.next_attempt:
+                try:
+                    if self.spooled:
+                        self.send_spooled()
+                    if time.monotonic() >= self.next_refresh:
+                        self.refresh_cache()
+                    self.backoff = 0.0
+                except (OSError, ValueError):
+                    self.disconnect()
+                    self.backoff = min(self.backoff_max, max(self.backoff_min, self.backoff * 2))
+                    # Jitter keeps a fleet of cabinets from retrying in lockstep
+                    self.next_attempt = time.monotonic() + self.backoff * random.uniform(0.5, 1.0)
+                    # Refreshes wait out the backoff too, or the loop would spin retrying them
+                    self.next_refresh = max(self.next_refresh, self.next_attempt)
+
+            due = min(self.next_refresh, self.next_attempt if self.spooled else self.next_refresh)
+            self.wake.wait(max(0.0, min(due - time.monotonic(), self.refresh_interval)))
+            self.wake.clear()
+
+        self.spool_outbox()
+        self.disconnect()
+
+    def spool_outbox(self):
+        """Move queued scores into the durable spool file"""
+        while self.outbox:
+            entry = self.outbox.popleft()
+            try:
+                append_json_line(self.spool_file, entry)
+            except OSError as e:
+                print(f"Error spooling leaderboard score: {e}")
+            self.spooled.append(entry)
+
+    def send_spooled(self):
+        """Send spooled scores in batches until the spool is empty"""
+        while self.spooled:
+            batch = self.spooled[:LEADERBOARD_CLIENT_BATCH]
+            reply = self.request({'op': 'submit', 'scores': batch})
+            if not reply.get('ok'):
+                raise ValueError(reply.get('error', "submit rejected"))
+
+            del self.spooled[:len(batch)]
+            # Rewrite the spool with what is left so a restart does not resend
+            self.rewrite_spool()
+
+            # New scores may have changed the table, refresh it soon
+            self.next_refresh = 0.0
+
+    def rewrite_spool(self):
+        """Replace the spool file with the scores still in memory"""
+        remaining = "".join(json.dumps(entry, separators=(',', ':')) + "\n"
+                            for entry in self.spooled)
+        temp_file = self.spool_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            f.write(remaining)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.spool_file)
+
+    def refresh_cache(self):
+        """Fetch the global table and store it locally"""
+        reply = self.request({'op': 'top', 'limit': LEADERBOARD_CACHE_SIZE})
+        if not reply.get('ok'):
+            raise ValueError(reply.get('error', "top rejected"))
+
+        self.cached_scores = reply['scores']
+        self.cache_version += 1
+        self.next_refresh = time.monotonic() + self.refresh_interval
+        try:
+            atomic_write_json(self.cache_file, self.cached_scores)
+        except OSError as e:
+            print(f"Error saving leaderboard cache: {e}")
+
+    def request(self, message: Dict) -> Dict:
+        """Send one request over the persistent connection and wait for its reply"""
+        if self.connection is None:
+            self.connection = socket.create_connection((self.host, self.port),
+                                                       timeout=LEADERBOARD_CLIENT_TIMEOUT)
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.stream = self.connection.makefile('rwb')
+            self.connected = True
+
+        self.request_id += 1
+        message['id'] = self.request_id
+        self.stream.write(encode_message(message))
+        self.stream.flush()
+
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("leaderboard closed the connection")
+        reply = decode_message(line)
+        if reply.get('id') != self.request_id:
+            raise ValueError("reply does not match request")
+        return reply
+
+    def disconnect(self):
+        """Drop the connection so the next attempt reconnects"""
+        if self.stream:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+        if self.connection:
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+        self.stream = None
+        self.connection = None
+        self.connected = False
+
+    def close(self, timeout: float = 1.0):
+        """Stop the worker, keeping unsent scores in the spool for next time"""
+        self.stopping = True
+        self.wake.set()
+        self.thread.join(timeout)
+
+def create_leaderboard_client(address: Optional[str]) -> Optional[LeaderboardClient]:
+    """Create a client for a "host:port" address, or None if no address is set"""
+    address = os.environ.get(LEADERBOARD_ENV_VAR, address or "")
+    if not address:
+        return None
+
+    host, _, port = address.rpartition(':')
+    try:
+        return LeaderboardClient(host or LEADERBOARD_HOST, int(port))
+    except ValueError:
+        print(f"Invalid leaderboard address: {address}")
+        return None
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Shared leaderboard service for a fleet of cabinets.
+
+Clients submit scores and query the top of the table over a line-based
+JSON protocol (see net/protocol.py). Submissions are collected into
+batches and committed to SQLite in one transaction; top-N and rank
+queries are served from an in-memory ordered index.
+
+Usage: python -m net.leaderboard_server --host 127.0.0.1 --port 7777
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import *
+from utils.score_db import SqliteScoreStore
+from net.protocol import MAX_MESSAGE_BYTES, encode_message, decode_message, normalize_score
+
+class ScoreIndex:
+    """Scores kept sorted best-first, with O(log n) rank lookups"""
+
+    def __init__(self, max_entries: int = LEADERBOARD_INDEX_SIZE):
+        self.max_entries = max_entries
+        # (negated score, arrival order) so equal scores keep arrival order
+        self.keys = []
+        self.entries = []
+        self.counter = itertools.count()
+
+    def add(self, entry: Dict):
+        """Insert a score in sorted position"""
+        key = (-entry['score'], next(self.counter))
+        index = bisect.bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.entries.insert(index, entry)
+
+        if len(self.entries) > self.max_entries:
+            self.keys.pop()
+            self.entries.pop()
+
+    def top(self, limit: int, offset: int = 0) -> List[Dict]:
+        """Get a page of the best scores"""
+        return self.entries[offset:offset + limit]
+
+    def rank(self, score: int):
+        """Get the rank a score would have, or None if it falls below the index"""
+        index = bisect.bisect_right(self.keys, (-score, float('inf')))
+        if index >= len(self.entries) and len(self.entries) >= self.max_entries:
+            return None
+        return index + 1
+
+class LeaderboardServer:
+    def __init__(self, db_file: str = "leaderboard.db", host: str = LEADERBOARD_HOST,
+                 port: int = LEADERBOARD_PORT):
+        self.db_file = db_file
+        self.host = host
+        self.port = port
+        self.index = ScoreIndex()
+        self.server = None
+        self.batch_task = None
+        self.pending = None
+        self.store = None
+        # All database work happens on this one thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-db")
+
+    async def start(self):
+        """Load the stored scores and start accepting connections"""
+        loop = asyncio.get_running_loop()
+        self.store = await loop.run_in_executor(self.executor, SqliteScoreStore, self.db_file)
+        entries = await loop.run_in_executor(self.executor, self.store.query,
+                                             self.index.max_entries)
+        for entry in entries:
+            self.index.add(entry)
+
+        self.pending = asyncio.Queue()
+        self.batch_task = asyncio.create_task(self.batch_writer())
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 limit=MAX_MESSAGE_BYTES,
+                                                 backlog=LEADERBOARD_BACKLOG)
+        # Report the real port when an ephemeral one (0) was requested
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Leaderboard listening on {self.host}:{self.port} ({len(self.index.entries)} scores)")
+
+    async def serve_forever(self):
+        """Start the server and run until cancelled"""
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop accepting clients, commit queued scores and close the database"""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.batch_task:
+            # Let the writer drain what has already been submitted
+            await self.pending.join()
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+            self.batch_task = None
+        if self.store:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self.store.close)
+            self.store = None
+        self.executor.shutdown(wait=True)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests from one client until it disconnects"""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(encode_message({'ok': False, 'error': "message too large"}))
+                    break
+                if not line:
+                    break
+
+                request = None
+                try:
+                    request = decode_message(line)
+                    reply = await self.dispatch(request)
+                except (ValueError, TypeError) as e:
+                    request = request if isinstance(request, dict) else {}
+                    reply = {'ok': False, 'error': f"bad request: {e}"}
+
+                if 'id' in request:
+                    reply['id'] = request['id']
+                writer.write(encode_message(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, request: Dict) -> Dict:
+        """Handle one decoded request and build its reply"""
+        op = request.get('op')
+
+        if op == 'submit':
+            entries = [normalize_score(entry) for entry in request.get('scores', [])
+                       if isinstance(entry, dict)]
+            entries = [entry for entry in entries if entry is not None]
+            if entries:
+                # Reply only once the batch containing these scores is durable
+                done = asyncio.get_running_loop().create_future()
+                await self.pending.put((entries, done))
+                try:
+                    await done
+                except Exception:
+                    return {'ok': False, 'error': "could not store scores"}
+            return {'ok': True, 'accepted': len(entries)}
+
+        elif op == 'top':
+            limit = max(0, min(int(request.get('limit', HIGH_SCORE_DISPLAY_COUNT)), LEADERBOARD_MAX_PAGE))
+            offset = max(0, int(request.get('offset', 0)))
+            return {'ok': True, 'scores': self.index.top(limit, offset)}
+
+        elif op == 'rank':
+            score = int(request.get('score', 0))
+            rank = self.index.rank(score)
+            if rank is None:
+                loop = asyncio.get_running_loop()
+                rank = await loop.run_in_executor(self.executor, self.store.rank, score)
+            return {'ok': True, 'rank': rank}
+
+        elif op == 'ping':
+            return {'ok': True}
+
+        return {'ok': False, 'error': f"unknown op: {op}"}
+
+    async def batch_writer(self):
+        """Commit submitted scores in batches, one transaction per batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            count = len(batch[0][0])
+
+            # Gather whatever else arrives shortly after the first submission
+            deadline = loop.time() + LEADERBOARD_BATCH_DELAY
+            while count < LEADERBOARD_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.pending.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                count += len(item[0])
+
+            entries = [entry for item_entries, _ in batch for entry in item_entries]
+            try:
+                # Retried submissions whose first attempt was committed are skipped
+                inserted = await loop.run_in_executor(self.executor, self.store.add_new, entries)
+            except Exception as e:
+                print(f"Error saving leaderboard batch: {e}")
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+            else:
+                for entry in inserted:
+                    entry.pop('submission_id', None)
+                    self.index.add(entry)
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(len(entries))
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+def main():
+    """Run the leaderboard service from the command line"""
+    parser = argparse.ArgumentParser(description="AWSKANOID shared leaderboard service")
+    parser.add_argument('--host', default=LEADERBOARD_HOST, help="address to listen on")
+    parser.add_argument('--port', type=int, default=LEADERBOARD_PORT, help="port to listen on")
+    parser.add_argument('--db', default="leaderboard.db", help="SQLite database file")
+    args = parser.parse_args()
+
+    server = LeaderboardServer(args.db, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Leaderboard stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+# Messages are single-line JSON objects terminated by a newline.
+# Requests carry an "op" and an optional "id" that is echoed in the reply:
+#   {"op": "submit", "scores": [{"name": "ABC", "score": 1200, "level": 3, "date": "2024-01-01",
+#                                "submission_id": "9f1c..."}]}
+#   {"op": "top", "limit": 10, "offset": 0}
+#   {"op": "rank", "score": 1200}
+#   {"op": "ping"}
+# Replies always contain "ok", plus "error" when ok is false.
+# A score's optional "submission_id" is unique per score; a score sent again
+# with an id the service has already stored is acknowledged but not stored.
+
+MAX_MESSAGE_BYTES = 1024 * 1024
+MAX_SUBMISSION_ID_LENGTH = 64
+
+def encode_message(message: Dict) -> bytes:
+    """Serialize a message to one newline-terminated line"""
+    return (json.dumps(message, separators=(',', ':')) + "\n").encode('utf-8')
+
+def decode_message(line: bytes) -> Dict:
+    """Parse one line into a message, raising ValueError if it is malformed"""
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("message must be a JSON object")
+    return message
+
+def normalize_score(entry: Dict) -> Optional[Dict]:
+    """Validate a submitted score, returning a clean copy or None if invalid"""
+    try:
+        name = str(entry['name']).upper()[:3]
+        score = int(entry['score'])
+        level = int(entry.get('level', 1))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not name or score < 0:
+        return None
+
+    date = entry.get('date')
+    if not isinstance(date, str):
+        date = datetime.now().strftime('%Y-%m-%d')
+
+    clean = {'name': name, 'score': score, 'level': level, 'date': date[:10]}
+    submission_id = entry.get('submission_id')
+    if isinstance(submission_id, str) and submission_id:
+        clean['submission_id'] = submission_id[:MAX_SUBMISSION_ID_LENGTH]
+    return clean
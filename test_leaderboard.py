@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared leaderboard service on a loopback port
+"""
+
+import sys
+import os
+import asyncio
+import json
+import socket
+import tempfile
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+async def send_request(host: str, port: int, request: dict) -> dict:
+    """Open a connection, send one request and return the reply"""
+    from net.protocol import encode_message, decode_message
+    
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_message(request))
+    await writer.drain()
+    reply = decode_message(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return reply
+
+async def run_server_checks(db_file: str):
+    """Submit from many concurrent clients, then query the index"""
+    from net.leaderboard_server import LeaderboardServer
+    
+    server = LeaderboardServer(db_file, "127.0.0.1", 0)
+    await server.start()
+    
+    requests = [
+        {'op': 'submit', 'id': i, 'scores': [{'name': 'abc', 'score': i * 10, 'level': 1}]}
+        for i in range(200)
+    ]
+    replies = await asyncio.gather(*[send_request("127.0.0.1", server.port, r) for r in requests])
+    assert all(reply['ok'] and reply['accepted'] == 1 for reply in replies)
+    assert sorted(reply['id'] for reply in replies) == list(range(200))
+    print("✓ 200 concurrent clients submitted scores")
+    
+    top = await send_request("127.0.0.1", server.port, {'op': 'top', 'limit': 3})
+    assert [entry['score'] for entry in top['scores']] == [1990, 1980, 1970]
+    assert top['scores'][0]['name'] == 'ABC'
+    rank = await send_request("127.0.0.1", server.port, {'op': 'rank', 'score': 1975})
+    assert rank['rank'] == 3
+    print("✓ Top-N and rank queries served from the index")
+    
+    # A batch resent after a lost reply is acknowledged but not stored again
+    retry = {'op': 'submit', 'scores': [{'name': 'DUP', 'score': 5, 'level': 1, 'submission_id': 'retry-1'}]}
+    first = await send_request("127.0.0.1", server.port, retry)
+    second = await send_request("127.0.0.1", server.port, retry)
+    assert first['ok'] and second['ok']
+    assert len(server.index.entries) == 201
+    assert 'submission_id' not in server.index.entries[-1]
+    print("✓ Resent submissions are stored once")
+    
+    bad = await send_request("127.0.0.1", server.port, {'op': 'explode'})
+    assert not bad['ok']
+    print("✓ Unknown requests are rejected")
+    
+    await server.close()
+    
+    # A restarted server rebuilds its index from the database
+    restarted = LeaderboardServer(db_file, "127.0.0.1", 0)
+    await restarted.start()
+    assert len(restarted.index.entries) == 201
+    await restarted.close()
+    print("✓ Scores persist across server restarts")
+
+def test_leaderboard_server():
+    """Test the leaderboard service"""
+    print("Testing Leaderboard Server...")
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            asyncio.run(run_server_checks(os.path.join(temp_dir, "leaderboard.db")))
+        return True
+        
+    except Exception as e:
+        print(f"✗ Leaderboard server test failed: {e}")
+        return False
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll until condition() is true or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+def test_leaderboard_client():
+    """Test offline spooling and delivery through the leaderboard client"""
+    print("\nTesting Leaderboard Client...")
+    
+    try:
+        from net.leaderboard_client import LeaderboardClient
+        from net.leaderboard_server import LeaderboardServer
+        from utils.storage import read_json_lines
+        
+        # Reserve a port, but leave it closed so the service starts out unreachable
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            spool_file = os.path.join(temp_dir, "spool.journal")
+            cache_file = os.path.join(temp_dir, "cache.json")
+            
+            # A score spooled before submission ids existed keeps the id it is given
+            with open(spool_file, 'w') as f:
+                f.write(json.dumps({'name': 'OLD', 'score': 50, 'level': 1, 'date': '2024-01-01'}) + "\n")
+            client = LeaderboardClient("127.0.0.1", port, spool_file, cache_file,
+                                       refresh_interval=0.2, backoff_min=0.05, backoff_max=0.1)
+            client.close()
+            with open(spool_file) as f:
+                stored = [json.loads(line) for line in f]
+            assert stored[0]['submission_id'] == client.spooled[0]['submission_id']
+            client = LeaderboardClient("127.0.0.1", port, spool_file, cache_file)
+            assert client.spooled[0]['submission_id'] == stored[0]['submission_id']
+            client.close()
+            os.remove(spool_file)
+            print("✓ Legacy spool entries keep their ids across restarts")
+            
+            class CountingClient(LeaderboardClient):
+                """Records the backoff state at every connection attempt"""
+                def request(self, message):
+                    self.attempts.append((time.monotonic(), self.backoff, self.next_attempt))
+                    return super().request(message)
+            
+            CountingClient.attempts = []
+            client = CountingClient("127.0.0.1", port, spool_file, cache_file,
+                                    refresh_interval=0.2, backoff_min=0.05, backoff_max=0.1)
+            for i in range(5):
+                client.submit({'name': 'ABC', 'score': (i + 1) * 100, 'level': 1, 'date': '2024-01-01'})
+            assert wait_for(lambda: len(read_json_lines(spool_file)) == 5 and not client.outbox)
+            assert client.pending_count() == 5 and not client.connected
+            assert len({entry['submission_id'] for entry in client.spooled}) == 5
+            print("✓ Submissions are spooled and nothing is sent while offline")
+            
+            # Retrying an unreachable service waits out a growing backoff
+            assert wait_for(lambda: len(client.attempts) >= 4)
+            attempts = list(client.attempts)
+            backoffs = [backoff for _, backoff, _ in attempts]
+            assert backoffs[:3] == [0.0, 0.05, 0.1] and max(backoffs) == 0.1
+            for at, _, scheduled in attempts[1:]:
+                assert at >= scheduled
+            print(f"✓ Offline retries back off ({len(attempts)} attempts, backoff {backoffs[:3]})")
+            
+            # Unsent scores survive a restart of the game
+            client.close()
+            client = LeaderboardClient("127.0.0.1", port, spool_file, cache_file,
+                                       refresh_interval=0.2, backoff_min=0.05, backoff_max=0.1)
+            assert client.pending_count() == 5
+            
+            loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+            loop_thread.start()
+            server = LeaderboardServer(os.path.join(temp_dir, "leaderboard.db"), "127.0.0.1", port)
+            asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+            
+            try:
+                assert wait_for(lambda: client.pending_count() == 0)
+                assert wait_for(lambda: len(client.get_cached_scores()) == 5)
+                assert client.get_cached_scores()[0]['score'] == 500
+                assert os.path.getsize(spool_file) == 0
+                print("✓ Spooled scores delivered once the service is reachable")
+                
+                # Later submissions reuse the open connection
+                connection = client.connection
+                client.submit({'name': 'XYZ', 'score': 900, 'level': 2, 'date': '2024-01-01'})
+                assert wait_for(lambda: client.get_cached_scores()[0]['score'] == 900)
+                assert client.connection is connection
+                print("✓ Connection reused and cached table refreshed")
+            finally:
+                client.close()
+                asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+                loop.call_soon_threadsafe(loop.stop)
+                loop_thread.join()
+                loop.close()
+            
+            # The cached table is available offline on the next start
+            client = LeaderboardClient("127.0.0.1", port, spool_file, cache_file)
+            assert client.get_cached_scores()[0]['score'] == 900
+            client.close()
+            print("✓ Global table served from the local cache")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Leaderboard client test failed: {e}")
+        return False
+
+def main():
+    """Run all leaderboard tests"""
+    print("AWSKANOID Leaderboard Test")
+    print("=" * 30)
+    
+    tests_passed = 0
+    total_tests = 2
+    
+    if test_leaderboard_server():
+        tests_passed += 1
+    
+    if test_leaderboard_client():
+        tests_passed += 1
+    
+    print(f"\nTest Results: {tests_passed}/{total_tests} tests passed")
+    
+    if tests_passed == total_tests:
+        print("✓ All leaderboard tests passed!")
+    else:
+        print("✗ Some tests failed. Check the error messages above.")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test script to verify high score ordering and crash-safe persistence
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def test_sorted_insertion():
+    """Test that scores stay sorted and ranks are correct"""
+    print("Testing Sorted Insertion...")
+    
+    try:
+        from utils.score import ScoreManager
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scores = ScoreManager(os.path.join(temp_dir, "scores.json"), max_entries=5)
+            
+            for name, score in [("AAA", 300), ("BBB", 100), ("CCC", 500), ("DDD", 300)]:
+                scores.add_score(name, score, 1)
+            
+            table = scores.get_high_scores()
+            assert [entry['score'] for entry in table] == [500, 300, 300, 100]
+            # Equal scores keep the order they were set in
+            assert [entry['name'] for entry in table[1:3]] == ["AAA", "DDD"]
+            print("✓ Scores inserted in sorted order")
+            
+            assert scores.get_rank(600) == 1
+            assert scores.get_rank(300) == 4
+            assert scores.get_rank(50) == 5
+            print("✓ Rank lookup works")
+            
+            scores.add_score("EEE", 50, 1)
+            scores.add_score("FFF", 10, 1)
+            assert len(scores.get_high_scores()) == 5
+            assert scores.get_high_scores()[-1]['score'] == 50
+            print("✓ Table is capped at its maximum size")
+            
+            scores.close()
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Sorted insertion test failed: {e}")
+        return False
+
+def test_journal_recovery():
+    """Test that scores survive a crash between compactions"""
+    print("\nTesting Journal Recovery...")
+    
+    try:
+        from utils.score import ScoreManager
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "scores.json")
+            
+            scores = ScoreManager(path)
+            scores.add_score("AAA", 100, 2)
+            scores.add_score("BBB", 200, 3)
+            scores.flush()  # Journal written, but no compaction yet
+            
+            # Simulate a torn write at the end of the journal
+            with open(scores.journal_file, 'a') as f:
+                f.write('{"seq": 3, "entry": {"na')
+            
+            recovered = ScoreManager(path)
+            assert [entry['name'] for entry in recovered.get_high_scores()] == ["BBB", "AAA"]
+            print("✓ Scores recovered from the journal")
+            
+            recovered.close()
+            reloaded = ScoreManager(path)
+            assert len(reloaded.get_high_scores()) == 2
+            assert os.path.getsize(reloaded.journal_file) == 0
+            print("✓ Journal compacted without duplicating scores")
+            reloaded.close()
+            
+            # A corrupt main file is kept aside instead of being lost
+            with open(path, 'w') as f:
+                f.write("{not json")
+            broken = ScoreManager(path)
+            assert broken.get_high_scores() == []
+            assert os.path.exists(path + ".corrupt")
+            print("✓ Corrupt score file moved aside")
+            broken.close()
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Journal recovery test failed: {e}")
+        return False
+
+def test_sqlite_backend():
+    """Test the SQLite score history and leaderboard queries"""
+    print("\nTesting SQLite Backend...")
+    
+    try:
+        from utils.score import ScoreManager
+        from utils.constants import SCORE_BACKEND_SQLITE
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_file = os.path.join(temp_dir, "scores.db")
+            scores = ScoreManager(os.path.join(temp_dir, "scores.json"), max_entries=3,
+                                  backend=SCORE_BACKEND_SQLITE, db_file=db_file)
+            
+            for i in range(25):
+                scores.add_score("AAA" if i % 2 else "BBB", i * 10, i % 5 + 1)
+            
+            # Only the best few stay in memory, the rest come from the database
+            assert len(scores.get_high_scores()) == 3
+            assert scores.get_rank(5) == 25
+            print("✓ Full history kept in the database")
+            
+            second_page = scores.get_leaderboard('all', page=1, page_size=10)
+            assert [entry['score'] for entry in second_page] == list(range(140, 40, -10))
+            level_page = scores.get_leaderboard('level', level=3)
+            assert all(entry['level'] == 3 for entry in level_page)
+            name_page = scores.get_leaderboard('name', name="aaa")
+            assert name_page[0]['score'] == 230
+            assert len(scores.get_leaderboard('today', page_size=100)) == 25
+            print("✓ Paged and filtered leaderboard queries work")
+            scores.close()
+            
+            reopened = ScoreManager(os.path.join(temp_dir, "scores.json"),
+                                    backend=SCORE_BACKEND_SQLITE, db_file=db_file)
+            assert reopened.get_high_scores()[0]['score'] == 240
+            print("✓ Scores persist in the database")
+            
+            # Queries see scores the writer has not stored yet, without waiting for it
+            release = threading.Event()
+            reopened.writer.submit(release.wait)
+            reopened.add_score("CCC", 135, 9)
+            reopened.add_score("DDD", 1, 9)
+            assert reopened.get_rank(2) == 26
+            assert [entry['name'] for entry in reopened.get_leaderboard('level', level=9)] == ["CCC", "DDD"]
+            assert [entry['score'] for entry in reopened.get_leaderboard('all', page=1, page_size=10)][:2] == [140, 135]
+            release.set()
+            reopened.flush()
+            assert not reopened.pending_rows
+            assert len(reopened.get_leaderboard('level', level=9)) == 2
+            print("✓ Pending scores are merged into queries")
+            reopened.close()
+            
+            # Switching an existing JSON table to SQLite brings its scores along
+            json_file = os.path.join(temp_dir, "old.json")
+            old = ScoreManager(json_file)
+            old.add_score("OLD", 777, 4)
+            old.close()
+            migrated = ScoreManager(json_file, backend=SCORE_BACKEND_SQLITE,
+                                    db_file=os.path.join(temp_dir, "migrated.db"))
+            assert migrated.get_high_scores()[0]['name'] == "OLD"
+            assert migrated.store.count() == 1
+            migrated.close()
+            print("✓ JSON high scores imported into a new database")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ SQLite backend test failed: {e}")
+        return False
+
+def test_leaderboard_views():
+    """Test the per-level and per-player views of the high score menu"""
+    print("\nTesting Leaderboard Views...")
+    
+    try:
+        import pygame
+        from ui.menu import HighScoreMenu
+        from utils.score import ScoreManager
+        
+        pygame.font.init()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scores = ScoreManager(os.path.join(temp_dir, "scores.json"))
+            scores.add_score("AAA", 300, 2)
+            scores.add_score("BBB", 200, 1)
+            scores.add_score("AAA", 100, 1)
+            
+            menu = HighScoreMenu(scores)
+            key = lambda k: pygame.event.Event(pygame.KEYDOWN, key=k, mod=0, unicode='', scancode=0)
+            menu.update((0, 0), False, [key(pygame.K_TAB), key(pygame.K_TAB)])
+            menu.refresh()
+            assert menu.current_filter() == 1
+            assert [entry['name'] for entry in menu.page_entries] == ["BBB", "AAA"]
+            menu.update((0, 0), False, [key(pygame.K_DOWN)])
+            menu.refresh()
+            assert [entry['score'] for entry in menu.page_entries] == [300]
+            print("✓ Level view steps through the levels reached")
+            
+            menu.update((0, 0), False, [key(pygame.K_TAB)])
+            menu.refresh()
+            assert menu.current_filter() == "AAA"
+            assert [entry['score'] for entry in menu.page_entries] == [300, 100]
+            print("✓ Player view shows one player's scores")
+            scores.close()
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Leaderboard views test failed: {e}")
+        return False
+
+def main():
+    """Run all score tests"""
+    print("AWSKANOID High Score Test")
+    print("=" * 30)
+    
+    tests_passed = 0
+    total_tests = 4
+    
+    if test_sorted_insertion():
+        tests_passed += 1
+    
+    if test_journal_recovery():
+        tests_passed += 1
+    
+    if test_sqlite_backend():
+        tests_passed += 1
+    
+    if test_leaderboard_views():
+        tests_passed += 1
+    
+    print(f"\nTest Results: {tests_passed}/{total_tests} tests passed")
+    
+    if tests_passed == total_tests:
+        print("✓ All high score tests passed!")
+    else:
+        print("✗ Some tests failed. Check the error messages above.")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,6 +48,93 @@ def test_settings_manager():
         print(f"✗ Settings manager test failed: {e}")
         return False
 
+def test_debounced_saves():
+    """Test that rapid changes are coalesced into one write"""
+    print("\nTesting Debounced Saves...")
+    
+    try:
+        import json
+        import tempfile
+        from utils.settings import SettingsManager
+        from utils.constants import CONTROL_MODE_KEYBOARD, CONTROL_MODE_MOUSE
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings_file = os.path.join(temp_dir, "settings.json")
+            settings = SettingsManager(settings_file)
+            
+            written = []
+            write_settings = settings.write_settings
+            settings.save_writer.write = lambda data: (written.append(data), write_settings(data))
+            
+            for _ in range(10):
+                settings.toggle_control_mode()
+            settings.set_control_mode(CONTROL_MODE_MOUSE)
+            assert not os.path.exists(settings_file)
+            print("✓ Changes are not written immediately")
+            
+            settings.flush()
+            assert len(written) == 1
+            with open(settings_file) as f:
+                assert json.load(f)['control_mode'] == CONTROL_MODE_MOUSE
+            print("✓ Flush writes the latest settings once")
+            
+            settings.set_control_mode(CONTROL_MODE_KEYBOARD)
+            settings.close()
+            with open(settings_file) as f:
+                assert json.load(f)['control_mode'] == CONTROL_MODE_KEYBOARD
+            print("✓ Close writes pending changes")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Debounced save test failed: {e}")
+        return False
+
+def test_raw_mouse_mode():
+    """Test relative mouse control of the paddle"""
+    print("\nTesting Raw Mouse Mode...")
+    
+    try:
+        import tempfile
+        import pygame
+        from utils.settings import SettingsManager
+        from utils.constants import CONTROL_MODE_MOUSE_RAW, MOUSE_RAW_SENSITIVITY
+        from game.entities import Paddle
+        from game.input import RelativeMouse
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = SettingsManager(os.path.join(temp_dir, "settings.json"))
+            settings.set_control_mode(CONTROL_MODE_MOUSE_RAW)
+            assert settings.is_raw_mouse_mode() and not settings.is_mouse_mode()
+            settings.close()
+        print("✓ Raw mouse mode can be selected")
+        
+        # Motion gathered between steps is taken once
+        relative_mouse = RelativeMouse()
+        relative_mouse.add(7)
+        relative_mouse.add(-2)
+        assert relative_mouse.take() == 5 and relative_mouse.take() == 0
+        print("✓ Mouse motion accumulates until the next step")
+        
+        # The same motion moves the paddle the same distance at any step rate
+        pygame.init()
+        keys = pygame.key.get_pressed()
+        positions = []
+        for dt in (1 / 30, 1 / 60, 1 / 240):
+            paddle = Paddle(640, 600)
+            start_x = paddle.x
+            paddle.update(dt, keys, None, CONTROL_MODE_MOUSE_RAW, 40)
+            paddle.update(dt, keys, None, CONTROL_MODE_MOUSE_RAW, 0)
+            positions.append(paddle.x - start_x)
+        assert positions == [40 * MOUSE_RAW_SENSITIVITY] * 3
+        print("✓ Paddle response is independent of the frame rate")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Raw mouse mode test failed: {e}")
+        return False
+
 def test_menu_imports():
     """Test that new menu classes can be imported"""
     print("\nTesting Menu Imports...")
@@ -88,6 +175,7 @@ def test_game_state_integration():
         # Check new game states exist
         assert GameState.SETTINGS in GameState
         assert GameState.CONTROL_SETTINGS in GameState
+        game_manager.close()
         print("✓ New game states defined correctly")
         
         return True
@@ -102,11 +190,17 @@ def main():
     print("=" * 35)
     
     tests_passed = 0
-    total_tests = 3
+    total_tests = 5
     
     if test_settings_manager():
         tests_passed += 1
     
+    if test_debounced_saves():
+        tests_passed += 1
+    
+    if test_raw_mouse_mode():
+        tests_passed += 1
+    
     if test_menu_imports():
         tests_passed += 1
     
@@ -119,7 +213,7 @@ def main():
         print("✓ All control settings tests passed!")
         print("\n🎮 New Features Available:")
         print("• Settings menu accessible from main menu")
-        print("• Control mode selection (Keyboard/Mouse)")
+        print("• Control mode selection (Keyboard/Mouse/Raw Mouse)")
         print("• Settings persist between game sessions")
         print("• Exclusive control modes (no mixed input)")
         print("\nTo test the new features, run: python3 main.py")
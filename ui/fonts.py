@@ -0,0 +1,105 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional
+from utils.constants import *
+
+class TextCache:
+    """LRU cache of rendered text surfaces with a memory budget in bytes"""
+
+    def __init__(self, max_bytes: int = TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[pygame.Surface]:
+        """Get a cached surface and mark it as recently used"""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+        return surface
+
+    def put(self, key, surface: pygame.Surface):
+        """Store a surface, evicting the least recently used ones over budget"""
+        surface_bytes = self.surface_bytes(surface)
+        if surface_bytes > self.max_bytes:
+            return
+
+        self.surfaces[key] = surface
+        self.size_bytes += surface_bytes
+        self.misses += 1
+
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size_bytes -= self.surface_bytes(evicted)
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
+        self.size_bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        """Approximate memory used by a surface's pixels"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class CachedFont:
+    """Font wrapper whose render() reuses previously rasterized strings"""
+
+    def __init__(self, font: pygame.font.Font, size: int, cache: TextCache):
+        self.font = font
+        self.size_key = size
+        self.cache = cache
+
+    def render(self, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+        """Render text, returning a shared cached surface (do not modify it)"""
+        key = (self.size_key, text, antialias, tuple(color),
+               tuple(background) if background is not None else None)
+        surface = self.cache.get(key)
+        if surface is None:
+            if background is None:
+                surface = self.font.render(text, antialias, color)
+            else:
+                surface = self.font.render(text, antialias, color, background)
+            self.cache.put(key, surface)
+        return surface
+
+    def __getattr__(self, name):
+        # Anything other than render goes straight to the real font
+        return getattr(self.font, name)
+
+class FontRegistry:
+    """Process-wide registry so each font size is only loaded once"""
+
+    def __init__(self):
+        self.fonts: Dict[int, CachedFont] = {}
+        self.text_cache = TextCache()
+        self.quit_registered = False
+
+    def get_font(self, size: int) -> CachedFont:
+        """Get the shared font for a size, loading it on first use"""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if not self.quit_registered:
+                # Fonts become invalid once pygame quits, so start over then
+                pygame.register_quit(self.clear)
+                self.quit_registered = True
+            font = CachedFont(pygame.font.Font(None, size), size, self.text_cache)
+            self.fonts[size] = font
+        return font
+
+    def clear(self):
+        """Forget all loaded fonts and rendered text"""
+        self.fonts.clear()
+        self.text_cache.clear()
+        self.quit_registered = False
+
+font_registry = FontRegistry()
+
+def get_font(size: int) -> CachedFont:
+    """Get the shared font for a size"""
+    return font_registry.get_font(size)
@@ -1,13 +1,18 @@
 import pygame
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from utils.constants import *
+from ui.fonts import get_font
 
 class HUD:
     def __init__(self):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
+        self.font_profiler = get_font(PROFILER_FONT_SIZE)
+        
+        # Frame-time graph, scrolled one column per recorded frame
+        self.profiler_graph = None
+        self.profiler_graph_frame = 0
     
     def draw_score(self, screen, score: int):
         """Draw the current score in the top left"""
@@ -47,14 +52,11 @@ class HUD:
         text_rect.y = 20
         screen.blit(text_surface, text_rect)
     
-    def draw_powerup_timers(self, screen, powerup_manager):
-        """Draw active power-up timers"""
+    def draw_powerup_timers(self, screen, timers: List[Tuple[str, float]]):
+        """Draw active power-up timers, given as (type, remaining seconds)"""
         y_offset = 80
         
-        for i, powerup in enumerate(powerup_manager.active_powerups):
-            powerup_type = powerup['type']
-            remaining_time = powerup_manager.get_remaining_time(powerup_type)
-            
+        for i, (powerup_type, remaining_time) in enumerate(timers):
             if remaining_time > 0:
                 # Format power-up name
                 display_name = powerup_type.replace('_', ' ').title()
@@ -204,3 +206,87 @@ class HUD:
         """Draw FPS counter (for debugging)"""
         fps_text = self.font_small.render(f"FPS: {fps:.1f}", True, WHITE)
         screen.blit(fps_text, (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 30))
+    
+    def draw_profiler(self, screen, profiler, input_latency: Optional[Tuple[float, float, float]] = None):
+        """Draw the frame profiler: per-frame stacked phase bars and a percentile table.
+
+        input_latency adds a row of input-to-flip percentiles when given.
+        """
+        column_width = 2
+        graph_width = profiler.frames.maxlen * column_width
+        graph_height = PROFILER_GRAPH_HEIGHT
+        ms_to_px = graph_height / (2 * PROFILER_BUDGET_MS)
+        x = 10
+        y = SCREEN_HEIGHT - graph_height - 10
+        
+        # Only frames recorded since the last draw are added to the graph
+        if self.profiler_graph is None or profiler.frame_count < self.profiler_graph_frame:
+            self.profiler_graph = pygame.Surface((graph_width, graph_height))
+            self.profiler_graph.fill(BLACK)
+            self.profiler_graph_frame = 0
+        new_frames = profiler.recent_frames(profiler.frame_count - self.profiler_graph_frame)
+        self.profiler_graph_frame = profiler.frame_count
+        
+        names = profiler.phases + ('other',)
+        for row in new_frames:
+            self.profiler_graph.scroll(-column_width, 0)
+            bottom = graph_height
+            column = pygame.Rect(graph_width - column_width, 0, column_width, graph_height)
+            self.profiler_graph.fill(BLACK, column)
+            for name, ms in zip(names, row[1:]):
+                height = int(ms * ms_to_px)
+                if height <= 0:
+                    continue
+                bottom -= height
+                self.profiler_graph.fill(PROFILER_COLORS[name],
+                                         (column.x, max(0, bottom), column_width, height))
+        
+        screen.blit(self.profiler_graph, (x, y))
+        budget_y = y + graph_height - int(PROFILER_BUDGET_MS * ms_to_px)
+        pygame.draw.line(screen, WHITE, (x, budget_y), (x + graph_width - 1, budget_y))
+        pygame.draw.rect(screen, GRAY, (x - 1, y - 1, graph_width + 2, graph_height + 2), 1)
+        
+        # Percentile table, with a stacked bar of each phase's p50 against the budget
+        stats = profiler.stats
+        if not stats:
+            return
+        table_x = x + graph_width + 15
+        line_height = self.font_profiler.get_linesize()
+        table_y = SCREEN_HEIGHT - 10 - line_height * (len(names) + 3)
+        rows = [("ms", ("p50", "p95", "p99"), WHITE)]
+        for name in ('frame',) + names:
+            rows.append((name, [f"{ms:.2f}" for ms in stats[name]], PROFILER_COLORS.get(name, WHITE)))
+        if input_latency:
+            rows.append(("input", [f"{ms:.2f}" for ms in input_latency], WHITE))
+            table_y -= line_height
+        for i, (label, values, color) in enumerate(rows):
+            row_y = table_y + i * line_height
+            screen.blit(self.font_profiler.render(label, True, color), (table_x, row_y))
+            for j, value in enumerate(values):
+                text = self.font_profiler.render(value, True, color)
+                screen.blit(text, text.get_rect(topright=(table_x + 120 + j * 50, row_y)))
+        
+        bar_y = table_y + len(rows) * line_height + 2
+        bar_width = 200
+        bar_x = table_x
+        for name in names:
+            width = int(stats[name][0] / PROFILER_BUDGET_MS * bar_width)
+            if width > 0:
+                pygame.draw.rect(screen, PROFILER_COLORS[name], (bar_x, bar_y, width, 8))
+                bar_x += width
+        pygame.draw.rect(screen, WHITE, (table_x, bar_y, bar_width, 8), 1)
+    
+    def draw_loading_progress(self, screen, progress: float):
+        """Draw a small progress bar while assets load in the background"""
+        bar_width = 200
+        bar_height = 6
+        x = SCREEN_WIDTH // 2 - bar_width // 2
+        y = SCREEN_HEIGHT - 60
+        
+        loading_text = self.font_small.render("Loading...", True, GRAY)
+        loading_rect = loading_text.get_rect()
+        loading_rect.center = (SCREEN_WIDTH // 2, y - 15)
+        screen.blit(loading_text, loading_rect)
+        
+        pygame.draw.rect(screen, DARK_GRAY, (x, y, bar_width, bar_height))
+        pygame.draw.rect(screen, PADDLE_COLOR, (x, y, int(bar_width * progress), bar_height))
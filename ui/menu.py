@@ -1,6 +1,7 @@
 import pygame
 from typing import List, Tuple, Optional
 from utils.constants import *
+from ui.fonts import get_font
 from utils.score import ScoreManager
 from utils.settings import SettingsManager
 
@@ -55,10 +56,9 @@ class Button:
 
 class MainMenu:
     def __init__(self):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
         
         # Create buttons
         button_width = 200
@@ -179,14 +179,49 @@ class MainMenu:
 
 class HighScoreMenu:
     def __init__(self, score_manager: ScoreManager):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
         self.score_manager = score_manager
         
         # Back button
         self.back_button = Button(50, SCREEN_HEIGHT - 100, 100, 40, "Back", self.font_small)
+        
+        # Leaderboard view and paging
+        self.views = [('all', "All Time"), ('today', "Today"), ('level', "Level"), ('name', "Player")]
+        if score_manager.has_global_leaderboard():
+            # Served from the local copy the leaderboard client keeps fresh
+            self.views.append(('global', "Global"))
+        self.view_index = 0
+        self.filter_index = 0  # Selected level or player in the filtered views
+        self.page = 0
+        self.page_entries = []
+        self.loaded_key = None
+    
+    def current_filter(self):
+        """Level or player name the current view is filtered by, or None"""
+        view = self.views[self.view_index][0]
+        if view == 'level':
+            values = self.score_manager.get_levels()
+        elif view == 'name':
+            values = self.score_manager.get_player_names()
+        else:
+            return None
+        return values[self.filter_index % len(values)] if values else None
+    
+    def refresh(self):
+        """Fetch the current page when the view, page or scores changed"""
+        view = self.views[self.view_index][0]
+        value = self.current_filter()
+        key = (view, value, self.page, self.score_manager.get_data_version())
+        if key != self.loaded_key:
+            if view in ('level', 'name') and value is None:
+                self.page_entries = []
+            elif view == 'level':
+                self.page_entries = self.score_manager.get_leaderboard(view, self.page, level=value)
+            else:
+                self.page_entries = self.score_manager.get_leaderboard(view, self.page, name=value)
+            self.loaded_key = key
     
     def update(self, mouse_pos: Tuple[int, int], mouse_clicked: bool, events) -> Optional[str]:
         """Update high score menu"""
@@ -195,6 +230,19 @@ class HighScoreMenu:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
                     return "main_menu"
+                elif event.key == pygame.K_RIGHT:
+                    if len(self.page_entries) == HIGH_SCORE_DISPLAY_COUNT:
+                        self.page += 1
+                elif event.key == pygame.K_LEFT:
+                    self.page = max(0, self.page - 1)
+                elif event.key == pygame.K_UP or event.key == pygame.K_DOWN:
+                    # Next or previous level or player in the filtered views
+                    self.filter_index += 1 if event.key == pygame.K_DOWN else -1
+                    self.page = 0
+                elif event.key == pygame.K_TAB:
+                    self.view_index = (self.view_index + 1) % len(self.views)
+                    self.filter_index = 0
+                    self.page = 0
         
         # Handle mouse input
         self.back_button.update(mouse_pos, mouse_clicked)
@@ -224,8 +272,27 @@ class HighScoreMenu:
         # Draw line under headers
         pygame.draw.line(screen, WHITE, (150, 180), (SCREEN_WIDTH - 150, 180), 2)
         
+        # Current view and page
+        self.refresh()
+        view_label = self.views[self.view_index][1]
+        value = self.current_filter()
+        if value is not None:
+            view_label = f"{view_label} {value}"
+        view_text = f"{view_label} - Page {self.page + 1}"
+        view_surface = self.font_small.render(view_text, True, LIGHT_GRAY)
+        view_rect = view_surface.get_rect()
+        view_rect.center = (SCREEN_WIDTH // 2, 120)
+        screen.blit(view_surface, view_rect)
+        
+        hint_surface = self.font_small.render("TAB - change view   UP/DOWN - level/player   LEFT/RIGHT - change page", True, GRAY)
+        hint_rect = hint_surface.get_rect()
+        hint_rect.right = SCREEN_WIDTH - 10
+        hint_rect.bottom = SCREEN_HEIGHT - 10
+        screen.blit(hint_surface, hint_rect)
+        
         # High scores
-        high_scores = self.score_manager.get_high_scores()
+        high_scores = self.page_entries
+        first_rank = self.page * HIGH_SCORE_DISPLAY_COUNT + 1
         
         if not high_scores:
             no_scores_text = "No high scores yet! Play a game to set the first record."
@@ -234,11 +301,11 @@ class HighScoreMenu:
             no_scores_rect.center = (SCREEN_WIDTH // 2, 300)
             screen.blit(no_scores_surface, no_scores_rect)
         else:
-            for i, score_entry in enumerate(high_scores[:10]):
+            for i, score_entry in enumerate(high_scores[:HIGH_SCORE_DISPLAY_COUNT]):
                 y_pos = 200 + i * 35
                 
                 # Rank
-                rank_text = f"{i + 1}."
+                rank_text = f"{first_rank + i}."
                 rank_surface = self.font_small.render(rank_text, True, WHITE)
                 screen.blit(rank_surface, (header_positions[0], y_pos))
                 
@@ -265,10 +332,9 @@ class HighScoreMenu:
 
 class NameEntryMenu:
     def __init__(self, final_score: int):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
         
         self.final_score = final_score
         self.player_name = ""
@@ -276,15 +342,19 @@ class NameEntryMenu:
         self.cursor_timer = 0
         self.max_length = 3
     
-    def update(self, dt: float, events: List[pygame.event.Event]) -> Optional[str]:
-        """Update name entry menu"""
-        # Update cursor blink
+    def advance(self, dt: float):
+        """Blink the cursor as real time passes"""
         self.cursor_timer += dt * 1000
-        if self.cursor_timer >= 500:  # Blink every 500ms
+        if self.cursor_timer >= CURSOR_BLINK_MS:
             self.cursor_visible = not self.cursor_visible
-            self.cursor_timer = 0
-        
-        # Handle events
+            self.cursor_timer %= CURSOR_BLINK_MS
+    
+    def time_to_blink(self) -> float:
+        """Seconds until the cursor next changes"""
+        return max(0.0, (CURSOR_BLINK_MS - self.cursor_timer) / 1000)
+    
+    def update(self, events: List[pygame.event.Event]) -> Optional[str]:
+        """Handle name entry keys; returns the name once entered"""
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
@@ -358,24 +428,25 @@ class NameEntryMenu:
 
 class ControlSettingsMenu:
     def __init__(self, settings_manager: SettingsManager):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
         self.settings_manager = settings_manager
         
         # Create buttons
         button_width = 200
         button_height = 50
         button_spacing = 80
-        start_y = SCREEN_HEIGHT // 2 - 50
+        start_y = SCREEN_HEIGHT // 2 - 100
         center_x = SCREEN_WIDTH // 2 - button_width // 2
         
         self.keyboard_button = Button(center_x, start_y, button_width, button_height, "Keyboard", self.font_medium)
         self.mouse_button = Button(center_x, start_y + button_spacing, button_width, button_height, "Mouse", self.font_medium)
+        self.raw_mouse_button = Button(center_x, start_y + button_spacing * 2, button_width, button_height,
+                                       "Raw Mouse", self.font_medium)
         self.back_button = Button(50, SCREEN_HEIGHT - 100, 100, 40, "Back", self.font_small)
         
-        self.buttons = [self.keyboard_button, self.mouse_button, self.back_button]
+        self.buttons = [self.keyboard_button, self.mouse_button, self.raw_mouse_button, self.back_button]
         
         # Keyboard navigation
         self.selected_index = 0
@@ -402,6 +473,8 @@ class ControlSettingsMenu:
                     elif self.selected_index == 1:
                         self.settings_manager.set_control_mode(CONTROL_MODE_MOUSE)
                     elif self.selected_index == 2:
+                        self.settings_manager.set_control_mode(CONTROL_MODE_MOUSE_RAW)
+                    elif self.selected_index == 3:
                         return "main_menu"
                 elif event.key == pygame.K_ESCAPE:
                     return "main_menu"
@@ -417,12 +490,15 @@ class ControlSettingsMenu:
         # Handle mouse input
         self.keyboard_button.update(mouse_pos, mouse_clicked)
         self.mouse_button.update(mouse_pos, mouse_clicked)
+        self.raw_mouse_button.update(mouse_pos, mouse_clicked)
         self.back_button.update(mouse_pos, mouse_clicked)
         
         if self.keyboard_button.clicked:
             self.settings_manager.set_control_mode(CONTROL_MODE_KEYBOARD)
         elif self.mouse_button.clicked:
             self.settings_manager.set_control_mode(CONTROL_MODE_MOUSE)
+        elif self.raw_mouse_button.clicked:
+            self.settings_manager.set_control_mode(CONTROL_MODE_MOUSE_RAW)
         elif self.back_button.clicked:
             return "main_menu"
         
@@ -458,6 +534,7 @@ class ControlSettingsMenu:
         # Draw buttons with selection indicator
         self.draw_control_button(screen, self.keyboard_button, current_mode == CONTROL_MODE_KEYBOARD)
         self.draw_control_button(screen, self.mouse_button, current_mode == CONTROL_MODE_MOUSE)
+        self.draw_control_button(screen, self.raw_mouse_button, current_mode == CONTROL_MODE_MOUSE_RAW)
         
         # Control descriptions
         descriptions = {
@@ -473,11 +550,18 @@ class ControlSettingsMenu:
                 "• Natural and intuitive",
                 "• Arrow keys disabled during gameplay",
                 "• ESC key always works for pause"
+            ],
+            CONTROL_MODE_MOUSE_RAW: [
+                "• Mouse movement moves the paddle directly",
+                "• Lowest latency, no smoothing",
+                "• Pointer is captured during gameplay",
+                "• Arrow keys disabled during gameplay",
+                "• ESC key always works for pause"
             ]
         }
         
         # Show description for current mode
-        desc_y = 450
+        desc_y = 530
         mode_descriptions = descriptions.get(current_mode, [])
         for i, desc in enumerate(mode_descriptions):
             color = WHITE if not desc.startswith("•") else LIGHT_GRAY
@@ -524,10 +608,9 @@ class ControlSettingsMenu:
 
 class SettingsMenu:
     def __init__(self, settings_manager: SettingsManager):
-        pygame.font.init()
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.font_large = get_font(FONT_SIZE_LARGE)
+        self.font_medium = get_font(FONT_SIZE_MEDIUM)
+        self.font_small = get_font(FONT_SIZE_SMALL)
         self.settings_manager = settings_manager
         
         # Create buttons
@@ -539,9 +622,11 @@ class SettingsMenu:
         
         self.controls_button = Button(center_x, start_y, button_width, button_height, "Controls", self.font_medium)
         self.help_button = Button(center_x, start_y + button_spacing, button_width, button_height, "Help", self.font_medium)
+        self.endless_button = Button(center_x, start_y + button_spacing * 2, button_width, button_height,
+                                     self.endless_label(), self.font_medium)
         self.back_button = Button(50, SCREEN_HEIGHT - 100, 100, 40, "Back", self.font_small)
         
-        self.buttons = [self.controls_button, self.help_button, self.back_button]
+        self.buttons = [self.controls_button, self.help_button, self.endless_button, self.back_button]
         
         # Keyboard navigation
         self.selected_index = 0
@@ -552,6 +637,16 @@ class SettingsMenu:
         for i, button in enumerate(self.buttons):
             button.set_selected(i == self.selected_index)
     
+    def endless_label(self) -> str:
+        """Label for the endless mode toggle"""
+        return "Endless: On" if self.settings_manager.get_setting('endless_mode', False) else "Endless: Off"
+    
+    def toggle_endless(self):
+        """Switch endless mode (takes effect from the next game)"""
+        endless = not self.settings_manager.get_setting('endless_mode', False)
+        self.settings_manager.set_setting('endless_mode', endless)
+        self.endless_button.text = self.endless_label()
+    
     def handle_keyboard_input(self, events) -> Optional[str]:
         """Handle keyboard navigation"""
         for event in events:
@@ -568,6 +663,8 @@ class SettingsMenu:
                     elif self.selected_index == 1:
                         return "help"
                     elif self.selected_index == 2:
+                        self.toggle_endless()
+                    elif self.selected_index == 3:
                         return "main_menu"
                 elif event.key == pygame.K_ESCAPE:
                     return "main_menu"
@@ -583,12 +680,15 @@ class SettingsMenu:
         # Handle mouse input
         self.controls_button.update(mouse_pos, mouse_clicked)
         self.help_button.update(mouse_pos, mouse_clicked)
+        self.endless_button.update(mouse_pos, mouse_clicked)
         self.back_button.update(mouse_pos, mouse_clicked)
         
         if self.controls_button.clicked:
             return "control_settings"
         elif self.help_button.clicked:
             return "help"
+        elif self.endless_button.clicked:
+            self.toggle_endless()
         elif self.back_button.clicked:
             return "main_menu"
         
@@ -623,4 +723,5 @@ class SettingsMenu:
         # Draw buttons
         self.controls_button.draw(screen)
         self.help_button.draw(screen)
+        self.endless_button.draw(screen)
         self.back_button.draw(screen)
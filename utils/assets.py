@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional
+
+class AssetLoader:
+    """Builds expensive game assets on a worker thread.
+
+    Assets are registered by name with a factory. The factory runs in the
+    background and callers only block on the result when they actually
+    need the asset.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="asset-loader")
+        self.futures: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, name: str, factory: Callable, *args, **kwargs) -> Future:
+        """Schedule an asset to be built in the background"""
+        with self.lock:
+            future = self.executor.submit(factory, *args, **kwargs)
+            self.futures[name] = future
+        return future
+
+    def get(self, name: str):
+        """Get an asset, waiting for it to finish loading if necessary"""
+        return self.futures[name].result()
+
+    def peek(self, name: str):
+        """Get an asset if it has finished loading, None otherwise"""
+        future = self.futures.get(name)
+        if future is not None and future.done() and not future.exception():
+            return future.result()
+        return None
+
+    def is_ready(self, name: str) -> bool:
+        """Check if an asset has finished loading"""
+        future = self.futures.get(name)
+        return future is not None and future.done()
+
+    def progress(self) -> float:
+        """Get the fraction of submitted assets that have finished (0 to 1)"""
+        with self.lock:
+            if not self.futures:
+                return 1.0
+            done = sum(1 for future in self.futures.values() if future.done())
+            return done / len(self.futures)
+
+    def all_ready(self) -> bool:
+        """Check if every submitted asset has finished loading"""
+        return self.progress() >= 1.0
+
+    def wait_all(self):
+        """Block until every submitted asset has finished loading"""
+        for name in list(self.futures):
+            self.get(name)
+
+    def shutdown(self):
+        """Stop the worker thread once pending assets are built"""
+        self.executor.shutdown(wait=False)
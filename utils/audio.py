@@ -0,0 +1,192 @@
+import os
+from abc import ABC, abstractmethod
+import pygame
+from typing import Optional
+from utils.constants import *
+
+class ChannelManager:
+    """Pool of mixer channels with per-category voice limits.
+
+    When a category is at its limit the oldest voice in that category is
+    reused. When every channel is busy, a sound may steal the channel of
+    the oldest voice with a lower priority, otherwise it is dropped.
+    Repeated triggers of the same sound in the same category within one
+    frame are coalesced.
+    """
+
+    def __init__(self, num_channels: int = MIXER_CHANNELS):
+        pygame.mixer.set_num_channels(num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        # Per channel: (category, priority, start order) of the last voice
+        self.voices = [None] * num_channels
+        self.play_counter = 0
+        # (sound name, category) -> channel index for sounds started this frame
+        self.frame_voices = {}
+
+    def begin_frame(self):
+        """Start a new frame so sounds can be triggered again"""
+        self.frame_voices.clear()
+
+    def play(self, sound_name: str, sound: pygame.mixer.Sound, category: str,
+             volume: float = 1.0) -> Optional[pygame.mixer.Channel]:
+        """Play a sound on a pooled channel, returning the channel or None if dropped"""
+        # Coalesce duplicate triggers within the same frame
+        index = self.frame_voices.get((sound_name, category))
+        if index is not None:
+            channel = self.channels[index]
+            if channel.get_busy() and channel.get_volume() < volume:
+                channel.set_volume(volume)
+            return channel
+
+        index = self.find_channel(category)
+        if index is None:
+            return None
+
+        channel = self.channels[index]
+        channel.play(sound)
+        channel.set_volume(volume)
+
+        self.play_counter += 1
+        self.voices[index] = (category, SOUND_PRIORITIES.get(category, 0), self.play_counter)
+        self.frame_voices[(sound_name, category)] = index
+        return channel
+
+    def find_channel(self, category: str) -> Optional[int]:
+        """Pick the channel index a new voice in this category should use"""
+        priority = SOUND_PRIORITIES.get(category, 0)
+        limit = SOUND_VOICE_LIMITS.get(category, len(self.channels))
+
+        free_index = None
+        same_category = []
+        steal_candidate = None
+
+        for i, channel in enumerate(self.channels):
+            voice = self.voices[i]
+            if voice is None or not channel.get_busy():
+                if free_index is None:
+                    free_index = i
+                continue
+
+            voice_category, voice_priority, started = voice
+            if voice_category == category:
+                same_category.append((started, i))
+            elif voice_priority < priority:
+                # Prefer the lowest priority, then the oldest voice
+                key = (voice_priority, started)
+                if steal_candidate is None or key < steal_candidate[0]:
+                    steal_candidate = (key, i)
+
+        # Category at its limit: restart its oldest voice
+        if len(same_category) >= limit:
+            return min(same_category)[1]
+
+        if free_index is not None:
+            return free_index
+
+        if steal_candidate is not None:
+            return steal_candidate[1]
+
+        return None
+
+    def stop_all(self):
+        """Stop every pooled channel"""
+        for channel in self.channels:
+            channel.stop()
+        self.voices = [None] * len(self.channels)
+        self.frame_voices.clear()
+
+class AudioBackend(ABC):
+    """Interface between SoundManager and the audio output.
+
+    Backends must implement make_sound and play; the other hooks default
+    to doing nothing.
+    """
+    
+    # False for backends that produce no sound, so callers can skip synthesis
+    enabled = False
+    
+    @abstractmethod
+    def make_sound(self, samples):
+        """Turn a (frames, 2) int16 sample array into a playable sound"""
+    
+    @abstractmethod
+    def play(self, sound_name: str, sound, category: str, volume: float = 1.0):
+        """Play a sound in a category at the given volume"""
+    
+    def begin_frame(self):
+        """Start a new frame so sounds can be triggered again"""
+        pass
+    
+    def pump_stream(self, synth):
+        """Keep the output fed with blocks rendered by a synthesizer"""
+        pass
+    
+    def stop_all(self):
+        """Stop every playing sound"""
+        pass
+    
+    def shutdown(self):
+        """Release the audio device"""
+        pass
+
+class PygameAudioBackend(AudioBackend):
+    """Plays sounds through the pygame mixer"""
+    
+    enabled = True
+    
+    def __init__(self):
+        pygame.mixer.init(frequency=AUDIO_SAMPLE_RATE, size=-16, channels=2,
+                          buffer=AUDIO_BUFFER_SIZE)
+        self.channel_manager = ChannelManager()
+        
+        # One extra channel outside the pool carries the synthesizer stream
+        pygame.mixer.set_num_channels(MIXER_CHANNELS + 1)
+        self.stream_channel = pygame.mixer.Channel(MIXER_CHANNELS)
+    
+    def make_sound(self, samples):
+        return pygame.sndarray.make_sound(samples)
+    
+    def pump_stream(self, synth):
+        # Keep one chunk playing and one queued behind it; a chunk spans
+        # several blocks so a slow frame does not let the stream run dry
+        if not self.stream_channel.get_busy():
+            if not synth.has_active_voices():
+                return
+            self.stream_channel.play(self.make_sound(synth.render_blocks(SYNTH_STREAM_BLOCKS)))
+        if self.stream_channel.get_queue() is None and synth.has_active_voices():
+            self.stream_channel.queue(self.make_sound(synth.render_blocks(SYNTH_STREAM_BLOCKS)))
+    
+    def play(self, sound_name: str, sound, category: str, volume: float = 1.0):
+        self.channel_manager.play(sound_name, sound, category, volume)
+    
+    def begin_frame(self):
+        self.channel_manager.begin_frame()
+    
+    def stop_all(self):
+        self.channel_manager.stop_all()
+        self.stream_channel.stop()
+    
+    def shutdown(self):
+        self.stop_all()
+        pygame.mixer.quit()
+
+class NullAudioBackend(AudioBackend):
+    """Silent backend for disabled sound, headless servers and CI"""
+    
+    def make_sound(self, samples):
+        return None
+    
+    def play(self, sound_name: str, sound, category: str, volume: float = 1.0):
+        pass
+
+def create_audio_backend(sound_enabled: bool = True) -> AudioBackend:
+    """Pick the audio backend from the setting, the environment and the device"""
+    audio_env = os.environ.get(AUDIO_ENV_VAR, '').strip().lower()
+    if not sound_enabled or audio_env in AUDIO_DISABLED_VALUES:
+        return NullAudioBackend()
+    
+    try:
+        return PygameAudioBackend()
+    except pygame.error as e:
+        print(f"No audio device available ({e}) - sound disabled")
+        return NullAudioBackend()
@@ -58,6 +58,13 @@ BRICK_HEIGHT = 30
 BRICK_PADDING = 2
 BRICK_ROWS = 8
 BRICK_COLS = 14
+BRICK_FIELD_MAX_HEIGHT = 360  # Larger grids are scaled down to fit
+BRICK_LAYER_COLORKEY = (255, 0, 255)  # Transparent color of the cached brick layer
+
+# Entity pool capacities (nothing is allocated during play beyond these)
+MAX_BALLS = 16
+MAX_LASERS = 64
+MAX_FALLING_POWERUPS = 32
 
 # Power-up settings
 POWERUP_DROP_CHANCE = 0.15  # 15% chance
@@ -77,6 +84,78 @@ SCORE_MEDIUM = 20
 SCORE_HARD = 30
 SCORE_POWERUP = 50
 
+# Audio output
+AUDIO_SAMPLE_RATE = 22050
+AUDIO_BUFFER_SIZE = 512
+AUDIO_ENV_VAR = "AWSKANOID_AUDIO"  # Set to "off" to force the silent backend
+AUDIO_DISABLED_VALUES = ("0", "off", "none", "null", "false")
+
+# Audio mixing
+MIXER_CHANNELS = 16
+# Higher priority sounds may steal a channel from lower priority ones
+SOUND_PRIORITIES = {
+    'game_over': 5,
+    'life_lost': 4,
+    'level_complete': 4,
+    'powerup': 3,
+    'brick': 2,
+    'paddle': 2,
+    'wall': 1
+}
+# Maximum simultaneous voices per sound category
+SOUND_VOICE_LIMITS = {
+    'game_over': 1,
+    'life_lost': 1,
+    'level_complete': 1,
+    'powerup': 2,
+    'brick': 4,
+    'paddle': 2,
+    'wall': 2
+}
+
+# Procedural synthesis
+SYNTH_BLOCK_SIZE = 512  # Frames mixed per block (about 23 ms at 22050 Hz)
+SYNTH_MAX_VOICES = 8
+SYNTH_STREAM_BLOCKS = 2  # Blocks per queued chunk: rides out a ~46 ms frame, adds up to ~46 ms latency
+
+# High scores
+HIGH_SCORE_DISPLAY_COUNT = 10  # Scores shown in the table and needed to qualify
+HIGH_SCORE_TABLE_SIZE = 100    # Scores kept on disk
+SCORE_COMPACT_INTERVAL = 20    # Journal entries before the main file is rewritten
+SCORE_BACKEND_JSON = "json"
+SCORE_BACKEND_SQLITE = "sqlite"
+
+# Shared leaderboard service
+LEADERBOARD_HOST = "127.0.0.1"
+LEADERBOARD_PORT = 7777
+LEADERBOARD_BACKLOG = 1024
+LEADERBOARD_INDEX_SIZE = 100000  # Best scores held in memory by the server
+LEADERBOARD_BATCH_SIZE = 500     # Scores committed per transaction at most
+LEADERBOARD_BATCH_DELAY = 0.02   # Seconds to wait for more scores before committing
+LEADERBOARD_MAX_PAGE = 100
+LEADERBOARD_ENV_VAR = "AWSKANOID_LEADERBOARD"  # "host:port", overrides the setting
+LEADERBOARD_CLIENT_BATCH = 50       # Spooled scores sent per request
+LEADERBOARD_CLIENT_TIMEOUT = 3.0    # Seconds before a request is given up
+LEADERBOARD_CACHE_SIZE = 100        # Global scores kept in the local cache
+LEADERBOARD_REFRESH_INTERVAL = 30.0 # Seconds between global table refreshes
+LEADERBOARD_BACKOFF_MIN = 1.0
+LEADERBOARD_BACKOFF_MAX = 60.0
+
+# Procedural levels
+GENERATOR_CANDIDATES = 8        # Patterns evaluated per round
+GENERATOR_SIMULATIONS = 3       # Headless games played per candidate
+GENERATOR_MAX_ROUNDS = 4
+GENERATOR_TOLERANCE = 0.08      # Accepted distance from the target difficulty
+GENERATOR_SIM_FRAMES = 6000     # Frames per simulated run (100 s at 60 FPS)
+GENERATOR_REFERENCE_FRAMES = 18000  # Projected clear time that scores 0.5
+GENERATOR_MISS_PENALTY = 1800   # Frames a missed ball counts as
+GENERATOR_BOT_AIM_ERROR = 0.5   # Bot aim spread as a fraction of half the paddle
+GENERATOR_MAX_DIFFICULTY = 0.95
+GENERATOR_MAX_BALL_SPEED = 14
+ENDLESS_BASE_DIFFICULTY = 0.6
+ENDLESS_DIFFICULTY_STEP = 0.02
+ENDLESS_SPEED_MULTIPLIER = 2.0
+
 # Lives
 STARTING_LIVES = 3
 
@@ -84,6 +163,7 @@ STARTING_LIVES = 3
 FONT_SIZE_LARGE = 48
 FONT_SIZE_MEDIUM = 32
 FONT_SIZE_SMALL = 24
+TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Budget for cached rendered text
 
 # Menu colors
 MENU_BG = (30, 35, 50)
@@ -97,10 +177,61 @@ GAME_AREA_BOTTOM = SCREEN_HEIGHT - 50
 GAME_AREA_LEFT = 50
 GAME_AREA_RIGHT = SCREEN_WIDTH - 50
 
-# Level progression
-TOTAL_LEVELS = 10
-
 # Control settings
 CONTROL_MODE_KEYBOARD = "keyboard"
 CONTROL_MODE_MOUSE = "mouse"
+CONTROL_MODE_MOUSE_RAW = "mouse_raw"  # Relative mouse motion, pointer grabbed during play
+MOUSE_RAW_SENSITIVITY = 1.0           # Paddle pixels per unit of mouse motion
 DEFAULT_CONTROL_MODE = CONTROL_MODE_KEYBOARD
+SETTINGS_SAVE_DELAY = 0.5  # Seconds without changes before settings are written
+
+# Input
+# Window changes that need a redraw; SDL2 reports them as WINDOW* events, VIDEOEXPOSE is legacy
+WINDOW_REDRAW_EVENT_TYPES = (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED, pygame.WINDOWRESTORED,
+                             pygame.VIDEOEXPOSE)
+# TEXTINPUT must stay allowed: pygame 2 fills KEYDOWN.unicode from it, and name entry reads that
+INPUT_EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN) + WINDOW_REDRAW_EVENT_TYPES  # Everything else stays off the queue
+INPUT_LATENCY_TIMEOUT = 0.25  # Seconds to wait for paddle input to show before it is dropped
+
+# Idle throttling: static screens sleep until input arrives instead of redrawing at FPS
+IDLE_WAKE_EVENT_TYPES = (pygame.MOUSEMOTION,) + WINDOW_REDRAW_EVENT_TYPES  # Also wake an idle loop (hover, uncovered window)
+IDLE_MAX_WAIT = 1.0         # Seconds; background work (leaderboard, GC policy) still runs this often
+CURSOR_BLINK_MS = 500       # Name entry cursor blink interval
+MAX_GAMEPLAY_DT = 1 / 20    # Seconds; a longer frame (e.g. the first after an idle wait) advances play only this far
+
+# Simulation thread (threaded_simulation setting)
+SIMULATION_RATE = 120     # Fixed gameplay steps per second
+SIMULATION_MAX_STEPS = 8  # Steps run back to back to catch up before the backlog is dropped
+
+# Telemetry log for field diagnostics
+TELEMETRY_ENV_VAR = "AWSKANOID_TELEMETRY"  # Log file path, overrides the setting
+TELEMETRY_CAPACITY = 4096       # Frames held in the ring buffer (about a minute at 60 FPS)
+TELEMETRY_FLUSH_INTERVAL = 2.0  # Seconds between writes to the log
+
+# Frame profiler (F3 overlay)
+PROFILER_PHASES = ('events', 'update', 'collision', 'draw', 'hud', 'flip')
+PROFILER_COLORS = {
+    'events': (255, 200, 80),
+    'update': (80, 200, 255),
+    'collision': (255, 110, 110),
+    'draw': (120, 230, 120),
+    'hud': (200, 140, 255),
+    'flip': (150, 150, 150),
+    'other': (70, 70, 80)
+}
+PROFILER_WINDOW = 240   # Frames kept for the rolling percentiles and the graph
+PROFILER_REFRESH = 15   # Frames between percentile updates
+PROFILER_BUDGET_MS = 1000 / FPS
+PROFILER_FONT_SIZE = 16
+PROFILER_GRAPH_HEIGHT = 120  # Pixels; the top of the graph is twice the frame budget
+
+# Allocation profiler (F4) and garbage collection
+ALLOC_SAMPLE_INTERVAL = 30  # Frames between tracemalloc snapshots
+ALLOC_REPORT_TOP = 5        # Allocation sites listed per phase
+GC_POLICY_DEFAULT = "default"
+GC_POLICY_FREEZE = "freeze"  # No automatic collections during play; collect between levels
+GC_FROZEN_GEN0_LIMIT = 20000  # New objects before a frozen level collects generation 0 anyway
+GC_FROZEN_GEN1_LIMIT = 10     # Generation 0 collections before generation 1 is included
+
+# Sampling profiler (F5)
+SAMPLER_INTERVAL = 0.005  # Seconds between stack samples
@@ -0,0 +1,216 @@
+import gc
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from utils.constants import *
+import utils.profiler as profiler_module
+
+# Allocations made by the profiler itself
+IGNORED_FILES = {tracemalloc.__file__, __file__, profiler_module.__file__}
+
+class AllocationProfiler:
+    """Per-phase allocation sites and GC pause times, for diagnosing stutters.
+
+    Attached to the frame profiler, it sees the same phase boundaries. At
+    every boundary the growth in gen0 GC-tracked objects is charged to the
+    phase that just ran: objects freed straight away do not count towards a
+    collection, so this is the garbage that actually triggers the GC. On
+    every sample_interval'th frame it also diffs tracemalloc snapshots at
+    the boundaries to find the lines that allocated the memory.
+    """
+
+    def __init__(self, sample_interval: int = ALLOC_SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Drop collected statistics"""
+        self.frames = 0
+        self.sampled_frames = 0
+        self.stack: List[str] = []
+        self.sampling = False
+        self.last_snapshot = None
+        self.last_gc_count = gc.get_count()[0]
+        self.gc_objects: Dict[str, int] = defaultdict(int)
+        # phase -> (file, line) -> [bytes, blocks]
+        self.sites: Dict[str, Dict[Tuple[str, int], list]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        self.pauses: List[Tuple[int, float, str, bool]] = []  # generation, ms, phase, scheduled
+        self.gc_start = None
+
+    def start(self):
+        """Begin tracing allocations and timing collections"""
+        if self.enabled:
+            return
+        self.reset()
+        tracemalloc.start()
+        gc.callbacks.append(self.on_gc)
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return
+        gc.callbacks.remove(self.on_gc)
+        tracemalloc.stop()
+        self.enabled = False
+
+    def current_phase(self) -> str:
+        return self.stack[-1] if self.stack else 'other'
+
+    def begin_frame(self):
+        self.frames += 1
+        self.sampling = self.frames % self.sample_interval == 0
+        if self.sampling:
+            self.sampled_frames += 1
+        self.boundary()
+
+    def begin(self, name: str):
+        self.boundary()
+        self.stack.append(name)
+
+    def end(self):
+        self.boundary()
+        if self.stack:
+            self.stack.pop()
+
+    def end_frame(self):
+        self.boundary()
+        self.stack.clear()
+        self.sampling = False
+        self.last_snapshot = None
+
+    def boundary(self):
+        """Charge what was allocated since the last boundary to the phase that ran"""
+        phase = self.current_phase()
+        count = gc.get_count()[0]
+        # The counter drops back to zero when a collection runs
+        if count >= self.last_gc_count:
+            self.gc_objects[phase] += count - self.last_gc_count
+        self.last_gc_count = count
+
+        if not self.sampling:
+            return
+        # Collections set off by the snapshot itself are reported separately
+        self.stack.append('profiler')
+        snapshot = tracemalloc.take_snapshot()
+        self.stack.pop()
+        if self.last_snapshot is not None:
+            sites = self.sites[phase]
+            for stat in snapshot.compare_to(self.last_snapshot, 'lineno'):
+                frame = stat.traceback[0]
+                if stat.size_diff > 0 and frame.filename not in IGNORED_FILES:
+                    site = sites[(frame.filename, frame.lineno)]
+                    site[0] += stat.size_diff
+                    site[1] += max(0, stat.count_diff)
+        self.last_snapshot = snapshot
+        # Taking the snapshot allocated GC-tracked objects of its own
+        self.last_gc_count = gc.get_count()[0]
+
+    def on_gc(self, phase: str, info: dict):
+        """gc.callbacks hook: time each collection"""
+        if phase == 'start':
+            self.gc_start = time.perf_counter()
+        elif self.gc_start is not None:
+            ms = (time.perf_counter() - self.gc_start) * 1000
+            # With the GC disabled only a deliberate gc.collect() can run
+            self.pauses.append((info['generation'], ms, self.current_phase(), not gc.isenabled()))
+            self.gc_start = None
+
+    def report(self, top: int = ALLOC_REPORT_TOP) -> str:
+        """Text report of allocation sites per phase and GC pauses"""
+        frames = max(self.frames, 1)
+        lines = [f"Allocation report: {self.frames} frames, {self.sampled_frames} sampled"]
+
+        lines.append("\nGC-tracked objects kept per frame, by phase:")
+        for phase, objects in sorted(self.gc_objects.items(), key=lambda item: -item[1]):
+            lines.append(f"  {phase:<10} {objects / frames:8.1f}")
+
+        lines.append("\nTop allocation sites per sampled frame (bytes, blocks):")
+        samples = max(self.sampled_frames, 1)
+        for phase, sites in self.sites.items():
+            ranked = sorted(sites.items(), key=lambda item: -item[1][0])[:top]
+            if not ranked:
+                continue
+            lines.append(f"  {phase}:")
+            for (filename, lineno), (size, count) in ranked:
+                lines.append(f"    {size / samples:9.0f} B {count / samples:7.1f}  {filename}:{lineno}")
+
+        lines.append("\nGC pauses:")
+        if not self.pauses:
+            lines.append("  none")
+        for generation in range(3):
+            for scheduled in (False, True):
+                times = sorted(ms for gen, ms, _, sched in self.pauses
+                               if gen == generation and sched == scheduled)
+                if not times:
+                    continue
+                kind = "scheduled" if scheduled else "automatic"
+                phases = defaultdict(int)
+                for gen, _, phase, sched in self.pauses:
+                    if gen == generation and sched == scheduled:
+                        phases[phase] += 1
+                where = ", ".join(f"{phase} {count}" for phase, count in sorted(phases.items()))
+                lines.append(f"  gen{generation} {kind:<9} {len(times):5d} x  total {sum(times):8.2f} ms  "
+                             f"max {times[-1]:6.2f} ms  ({where})")
+        return "\n".join(lines)
+
+class GCPolicy:
+    """When the cyclic garbage collector may run.
+
+    With the freeze policy the collector is switched off while a level is
+    being played, after one collection and a gc.freeze() that moves every
+    surviving object out of the collector's way. That collection runs while
+    the level is set up, not in its first frame of play. Between levels the
+    objects are unfrozen and everything that built up is collected at once,
+    so the pause lands on a screen where nobody is moving the paddle. A
+    level can last indefinitely in endless mode, so once enough new objects
+    build up the young generations are collected anyway; those collections
+    only look at objects created during the level.
+    """
+
+    def __init__(self, mode: str = GC_POLICY_DEFAULT):
+        self.mode = mode
+        self.frozen = False
+
+    def update(self, in_play: bool):
+        """Freeze when play starts and thaw when it stops"""
+        if self.mode != GC_POLICY_FREEZE:
+            return
+        if in_play and not self.frozen:
+            self.freeze()
+        elif not in_play and self.frozen:
+            self.thaw()
+        elif self.frozen:
+            self.collect_young()
+    
+    def level_starting(self):
+        """Collect and freeze while a level is being set up, ahead of its first frame"""
+        if self.mode != GC_POLICY_FREEZE:
+            return
+        if self.frozen:
+            gc.unfreeze()  # Restarted level: the objects of the last one may be garbage now
+        self.freeze()
+    
+    def collect_young(self):
+        """Safety net while frozen: collect the young generations once they grow large"""
+        count0, count1, _ = gc.get_count()
+        if count0 >= GC_FROZEN_GEN0_LIMIT:
+            gc.collect(1 if count1 >= GC_FROZEN_GEN1_LIMIT else 0)
+
+    def freeze(self):
+        gc.disable()
+        gc.collect()
+        gc.freeze()
+        self.frozen = True
+
+    def thaw(self):
+        if not self.frozen:
+            return
+        gc.unfreeze()
+        gc.collect()
+        gc.enable()
+        self.frozen = False
+
+# Shared instance, attached to the frame profiler while it runs
+allocation_profiler = AllocationProfiler()
@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from utils.constants import *
+
+class FrameProfiler:
+    """Scoped per-phase frame timers with rolling percentiles.
+
+    The game loop brackets each frame with begin_frame()/end_frame() and
+    each phase with begin(name)/end(). Phases may nest; a phase's time
+    excludes the phases inside it, so the phases of a frame add up to at
+    most the frame time and the rest is reported as 'other'. While the
+    profiler is disabled every call returns straight away, and phases
+    begun on any thread but the one running the frame are ignored.
+    """
+
+    def __init__(self, phases: Tuple[str, ...] = PROFILER_PHASES, window: int = PROFILER_WINDOW):
+        self.phases = phases
+        self.index = {name: i for i, name in enumerate(phases)}
+        self.enabled = False
+        self.tracker = None  # Optional listener for the same phase boundaries
+
+        # Per-frame rows of (frame ms, phase ms..., other ms), oldest first
+        self.frames = deque(maxlen=window)
+        self.frame_count = 0
+        self.stats: Dict[str, Tuple[float, float, float]] = {}
+
+        # Current frame
+        self.frame_start: Optional[float] = None
+        self.frame_thread: Optional[int] = None
+        self.current = [0.0] * len(phases)
+        self.stack: List[list] = []
+
+    def set_enabled(self, enabled: bool):
+        """Turn timing on or off; history is dropped so stale frames never show"""
+        if not enabled and self.tracker:
+            # The tracker only sees phase boundaries while timing is on, so it stops too
+            self.tracker.stop()
+            self.tracker = None
+        self.enabled = enabled
+        self.frames.clear()
+        self.frame_count = 0
+        self.stats = {}
+        self.frame_start = None
+        self.stack.clear()
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = time.perf_counter()
+        self.frame_thread = threading.get_ident()
+        self.current = [0.0] * len(self.phases)
+        self.stack.clear()
+        if self.tracker:
+            self.tracker.begin_frame()
+
+    def begin(self, name: str):
+        """Start timing a phase"""
+        if not self.enabled or threading.get_ident() != self.frame_thread:
+            return
+        if self.tracker:
+            self.tracker.begin(name)
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self):
+        """Stop timing the innermost phase"""
+        if not self.enabled or not self.stack or threading.get_ident() != self.frame_thread:
+            return
+        name, start, children = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        self.current[self.index[name]] += elapsed - children
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        if self.tracker:
+            self.tracker.end()
+
+    def end_frame(self):
+        """Record the frame and refresh the percentiles every few frames"""
+        if not self.enabled or self.frame_start is None:
+            return
+        if self.tracker:
+            self.tracker.end_frame()
+        total = (time.perf_counter() - self.frame_start) * 1000
+        phase_ms = [seconds * 1000 for seconds in self.current]
+        self.frames.append((total, *phase_ms, max(0.0, total - sum(phase_ms))))
+        self.frame_start = None
+        self.frame_count += 1
+        if self.frame_count % PROFILER_REFRESH == 0 or len(self.frames) == 1:
+            self.stats = self.compute_percentiles()
+
+    def compute_percentiles(self) -> Dict[str, Tuple[float, float, float]]:
+        """p50/p95/p99 in milliseconds for the frame, each phase and 'other'"""
+        names = ('frame',) + self.phases + ('other',)
+        stats = {}
+        for column, name in enumerate(names):
+            values = sorted(row[column] for row in self.frames)
+            stats[name] = tuple(percentile(values, p) for p in (50, 95, 99))
+        return stats
+
+    def recent_frames(self, count: int) -> List[tuple]:
+        """The last count recorded frames, oldest first"""
+        count = min(count, len(self.frames))
+        return [self.frames[i] for i in range(len(self.frames) - count, len(self.frames))]
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+# Shared instance used by the game loop and the game states
+profiler = FrameProfiler()
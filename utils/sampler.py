@@ -0,0 +1,112 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from utils.constants import *
+
+class SamplingProfiler:
+    """Statistical profiler that samples other threads' Python stacks.
+
+    A background thread wakes every interval seconds and records the stack
+    of each target thread (by default the one that created the profiler)
+    from sys._current_frames(). Nothing is added to the profiled code, so
+    the game runs at full speed between samples. The result is written in
+    the collapsed-stack format read by flame graph tools, one
+    "thread;outer;inner;innermost count" line per distinct stack; the
+    thread name at the root keeps each thread's stacks apart.
+    """
+
+    def __init__(self, interval: float = SAMPLER_INTERVAL, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = tuple(thread_ids) if thread_ids is not None else (threading.get_ident(),)
+        self.stacks: Counter = Counter()
+        self.labels: Dict[object, str] = {}  # Code object -> frame label
+        self.thread_names: Dict[int, str] = {}
+        self.samples = 0  # Stacks recorded, one per sampled thread and tick
+        self.started_at = None
+        self.duration = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None
+
+    def start(self):
+        """Start sampling in the background"""
+        if self.running:
+            return
+        self.stop_event.clear()
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling; the samples taken so far are kept"""
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.duration += time.perf_counter() - self.started_at
+
+    def run(self):
+        """Sampler thread"""
+        while not self.stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                self.stacks[(self.thread_name(thread_id),) + self.collapse(frame)] += 1
+                self.samples += 1
+
+    def thread_name(self, thread_id: int) -> str:
+        """Root label of a thread's stacks"""
+        name = self.thread_names.get(thread_id)
+        if name is None:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self.thread_names[thread_id] = f"thread:{names.get(thread_id, thread_id)}"
+        return name
+
+    def collapse(self, frame) -> Tuple[str, ...]:
+        """Stack of frame labels, outermost first"""
+        labels = self.labels
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                label = labels[code] = f"{module}:{code.co_name}"
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def write(self, path: str):
+        """Write the samples in collapsed-stack format"""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def top_functions(self, count: int = 10):
+        """Functions that were on top of the stack most often, with their share of samples"""
+        leaves = Counter()
+        for stack, samples in self.stacks.items():
+            leaves[stack[-1]] += samples
+        total = max(self.samples, 1)
+        return [(label, samples / total) for label, samples in leaves.most_common(count)]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def default_profile_path() -> str:
+    """File name for a capture started now"""
+    return time.strftime("awskanoid-%Y%m%d-%H%M%S.collapsed")
@@ -1,33 +1,169 @@
+import bisect
 import json
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict, Tuple
+from utils.constants import (HIGH_SCORE_DISPLAY_COUNT, HIGH_SCORE_TABLE_SIZE, SCORE_COMPACT_INTERVAL,
+                             SCORE_BACKEND_JSON, SCORE_BACKEND_SQLITE)
+from utils.storage import BackgroundWriter, atomic_write_json, append_json_line, read_json_lines
+from utils.score_db import SqliteScoreStore
 
 class ScoreManager:
-    def __init__(self):
-        self.high_scores_file = "high_scores.json"
-        self.high_scores = self.load_high_scores()
+    """High score table kept sorted in memory and persisted off the main loop.
+
+    New scores are appended to a journal by a background writer. Every
+    SCORE_COMPACT_INTERVAL scores the whole table is written to the main
+    file with an atomic replace and the journal is emptied.
+
+    With the SQLite backend, scores waiting for the writer are kept in
+    pending_rows and merged into query results, so the game never has to
+    wait for the database to catch up. The writer removes a row from
+    pending_rows and records its id as stored_id together, under
+    pending_lock, and queries read the database only up to stored_id.
+    """
+    
+    def __init__(self, high_scores_file: str = "high_scores.json",
+                 max_entries: int = HIGH_SCORE_TABLE_SIZE, backend: str = SCORE_BACKEND_JSON,
+                 db_file: str = "high_scores.db", leaderboard_client=None):
+        self.high_scores_file = high_scores_file
+        self.journal_file = os.path.splitext(high_scores_file)[0] + ".journal"
+        self.max_entries = max_entries
+        self.writer = BackgroundWriter("score-writer")
+        self.version = 0  # Bumped whenever a score is added
+        # Optional shared leaderboard; submissions never wait on the network
+        self.leaderboard_client = leaderboard_client
+        
+        # Sorted by score (descending); score_keys holds the negated scores
+        # in ascending order so bisect can find insertion points
+        self.high_scores = []
+        self.score_keys = []
+        self.journal_seq = 0
+        self.journal_entries = 0
+        
+        # With SQLite the full history lives in the database and only the
+        # best max_entries scores are kept in memory
+        self.store = SqliteScoreStore(db_file) if backend == SCORE_BACKEND_SQLITE else None
+        self.pending_rows = []  # Scores queued for the database but not yet stored
+        self.pending_lock = threading.Lock()
+        self.stored_id = 0      # Newest database id whose score has left pending_rows
+        self.stored_count = 0   # Bumped by the writer whenever a queued score is stored
+        
+        if self.store:
+            if self.store.count() == 0:
+                self.import_json_scores()
+            self.stored_id = self.store.last_id()
+            for entry in self.store.query(limit=max_entries):
+                self.insert_entry(entry)
+            return
+        
+        for entry in self.load_high_scores():
+            self.insert_entry(entry)
+        
+        # Fold entries recovered from the journal into the main file
+        if self.journal_entries:
+            self.compact()
     
     def load_high_scores(self) -> List[Dict]:
-        """Load high scores from file"""
+        """Load high scores from the main file and replay the journal"""
+        scores = []
+        snapshot_seq = 0
+        
         if os.path.exists(self.high_scores_file):
             try:
                 with open(self.high_scores_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+                    data = json.load(f)
+                if isinstance(data, list):
+                    # Files written before the journal existed
+                    scores = data
+                else:
+                    scores = data.get('scores', [])
+                    snapshot_seq = data.get('journal_seq', 0)
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                # Keep the damaged file for inspection instead of overwriting it
+                corrupt_file = self.high_scores_file + ".corrupt"
+                print(f"Error loading high scores ({e}), moved to {corrupt_file}")
+                try:
+                    os.replace(self.high_scores_file, corrupt_file)
+                except OSError:
+                    pass
         
-        # Return default empty high scores
-        return []
+        self.journal_seq = snapshot_seq
+        for record in read_json_lines(self.journal_file):
+            seq = record.get('seq', 0)
+            if seq > snapshot_seq and 'entry' in record:
+                scores.append(record['entry'])
+                self.journal_seq = max(self.journal_seq, seq)
+                self.journal_entries += 1
+        
+        return scores
+    
+    def import_json_scores(self):
+        """Copy the JSON high scores into a new, empty database"""
+        entries = [entry for entry in self.load_high_scores()
+                   if all(key in entry for key in ('name', 'score', 'level', 'date'))]
+        if entries:
+            self.store.add_many(entries)
+            print(f"Imported {len(entries)} high scores from {self.high_scores_file}")
+    
+    def store_score(self, entry: Dict):
+        """Writer thread: add one score to the database"""
+        row_id = self.store.add(entry)
+        with self.pending_lock:
+            self.pending_rows.remove(entry)
+            self.stored_id = row_id
+            self.stored_count += 1
+    
+    def pending_snapshot(self) -> Tuple[List[Dict], int]:
+        """Scores not yet stored, and the newest id stored without them"""
+        with self.pending_lock:
+            return list(self.pending_rows), self.stored_id
     
     def save_high_scores(self):
-        """Save high scores to file"""
+        """Write the whole table to the main file in the background"""
+        self.compact()
+    
+    def compact(self):
+        """Atomically rewrite the main file and empty the journal"""
+        snapshot = {
+            'version': 2,
+            'journal_seq': self.journal_seq,
+            'scores': list(self.high_scores)
+        }
+        self.journal_entries = 0
+        self.writer.submit(self.write_snapshot, snapshot)
+    
+    def write_snapshot(self, snapshot: Dict):
+        """Writer thread: replace the main file, then drop the folded journal"""
+        try:
+            atomic_write_json(self.high_scores_file, snapshot)
+            # Entries up to journal_seq are now in the main file; a crash
+            # before this truncation is harmless because replay skips them
+            open(self.journal_file, 'w').close()
+        except Exception as e:
+            print(f"Error saving high scores: {e}")
+    
+    def append_journal(self, record: Dict):
+        """Writer thread: append one score to the journal"""
         try:
-            with open(self.high_scores_file, 'w') as f:
-                json.dump(self.high_scores, f, indent=2)
+            append_json_line(self.journal_file, record)
         except Exception as e:
             print(f"Error saving high scores: {e}")
     
+    def insert_entry(self, entry: Dict) -> int:
+        """Insert an entry in sorted position and return its index"""
+        key = -entry['score']
+        # bisect_right keeps earlier entries ahead of later equal scores
+        index = bisect.bisect_right(self.score_keys, key)
+        self.score_keys.insert(index, key)
+        self.high_scores.insert(index, entry)
+        
+        if len(self.high_scores) > self.max_entries:
+            self.score_keys.pop()
+            self.high_scores.pop()
+        
+        return index
+    
     def add_score(self, player_name: str, score: int, level_reached: int) -> bool:
         """Add a new score and return True if it's a high score"""
         new_score = {
@@ -37,14 +173,26 @@ class ScoreManager:
             'date': datetime.now().strftime('%Y-%m-%d')
         }
         
-        self.high_scores.append(new_score)
+        index = self.insert_entry(new_score)
+        is_high_score = index < HIGH_SCORE_DISPLAY_COUNT
+        self.version += 1
         
-        # Sort by score (descending) and keep top 10
-        self.high_scores.sort(key=lambda x: x['score'], reverse=True)
-        is_high_score = len(self.high_scores) <= 10 or new_score in self.high_scores[:10]
-        self.high_scores = self.high_scores[:10]
+        if self.leaderboard_client:
+            self.leaderboard_client.submit(new_score)
+        
+        if self.store:
+            with self.pending_lock:
+                self.pending_rows.append(new_score)
+            self.writer.submit(self.store_score, new_score)
+            return is_high_score
+        
+        self.journal_seq += 1
+        self.journal_entries += 1
+        self.writer.submit(self.append_journal, {'seq': self.journal_seq, 'entry': new_score})
+        
+        if self.journal_entries >= SCORE_COMPACT_INTERVAL:
+            self.compact()
         
-        self.save_high_scores()
         return is_high_score
     
     def get_high_scores(self) -> List[Dict]:
@@ -53,18 +201,87 @@ class ScoreManager:
     
     def is_high_score(self, score: int) -> bool:
         """Check if a score qualifies as a high score"""
-        if len(self.high_scores) < 10:
+        if len(self.high_scores) < HIGH_SCORE_DISPLAY_COUNT:
             return True
-        return score > self.high_scores[-1]['score']
+        return score > self.high_scores[HIGH_SCORE_DISPLAY_COUNT - 1]['score']
     
     def get_rank(self, score: int) -> int:
         """Get the rank a score would have (1-based)"""
-        rank = 1
-        for high_score in self.high_scores:
-            if score > high_score['score']:
-                break
-            rank += 1
-        return min(rank, 11)  # Cap at 11 (not in top 10)
+        index = bisect.bisect_right(self.score_keys, -score)
+        if self.store and index >= len(self.high_scores):
+            # Below the cached table, so ask the full history
+            pending, stored_id = self.pending_snapshot()
+            return self.store.rank(score, stored_id) + sum(1 for entry in pending if entry['score'] >= score)
+        return index + 1
+    
+    def get_leaderboard(self, view: str = 'all', page: int = 0,
+                        page_size: int = HIGH_SCORE_DISPLAY_COUNT,
+                        level: int = None, name: str = None) -> List[Dict]:
+        """Get one page of a leaderboard view ('all', 'today', 'level', 'name' or 'global')"""
+        offset = page * page_size
+        if view == 'global':
+            scores = self.leaderboard_client.get_cached_scores() if self.leaderboard_client else []
+            return scores[offset:offset + page_size]
+        
+        date = datetime.now().strftime('%Y-%m-%d') if view == 'today' else None
+        level = level if view == 'level' else None
+        name = name.upper() if view == 'name' and name else None
+        
+        if not self.store or (view == 'all' and offset + page_size <= len(self.high_scores)):
+            # The in-memory table already includes scores still being written
+            entries = self.filter_entries(self.high_scores, level, name, date)
+            return entries[offset:offset + page_size]
+        
+        pending, stored_id = self.pending_snapshot()
+        pending = self.filter_entries(pending, level, name, date)
+        entries = self.store.query(offset + page_size, 0, level=level, name=name, date=date,
+                                   max_id=stored_id)
+        if pending:
+            # Stable sort keeps stored scores ahead of newer equal ones
+            entries = sorted(entries + pending, key=lambda entry: -entry['score'])
+        return entries[offset:offset + page_size]
+    
+    def filter_entries(self, entries: List[Dict], level: int = None, name: str = None,
+                       date: str = None) -> List[Dict]:
+        """Keep the entries matching every filter that is set"""
+        if date is not None:
+            entries = [entry for entry in entries if entry['date'] == date]
+        if level is not None:
+            entries = [entry for entry in entries if entry['level'] == level]
+        if name is not None:
+            entries = [entry for entry in entries if entry['name'] == name]
+        return entries
+    
+    def get_player_names(self) -> List[str]:
+        """Names in the high score table, best player first"""
+        return list(dict.fromkeys(entry['name'] for entry in self.high_scores))
+    
+    def get_levels(self) -> List[int]:
+        """Levels reached in the high score table, lowest first"""
+        return sorted({entry['level'] for entry in self.high_scores})
+    
+    def has_global_leaderboard(self) -> bool:
+        """Check if a shared leaderboard is configured"""
+        return self.leaderboard_client is not None
+    
+    def get_data_version(self) -> Tuple[int, int, int]:
+        """Changes whenever any leaderboard view may have changed"""
+        remote_version = self.leaderboard_client.cache_version if self.leaderboard_client else 0
+        return self.version, self.stored_count, remote_version
+    
+    def flush(self):
+        """Wait until every pending write has reached the disk"""
+        self.writer.flush()
+    
+    def close(self):
+        """Fold the journal into the main file and stop the writer"""
+        if self.journal_entries:
+            self.compact()
+        self.writer.close()
+        if self.store:
+            self.store.close()
+        if self.leaderboard_client:
+            self.leaderboard_client.close()
 
 class GameScore:
     def __init__(self):
@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+class SqliteScoreStore:
+    """Score history in SQLite, indexed for leaderboard queries.
+
+    Each thread gets its own connection. WAL mode lets the game read
+    leaderboards while the background writer inserts scores. The SQL text
+    is fixed and parameterized, so sqlite3's statement cache keeps every
+    statement prepared. Reads can be limited to rows up to a known id, so
+    a caller merging in rows that are still being written sees each score
+    exactly once.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS scores (
+               id INTEGER PRIMARY KEY,
+               name TEXT NOT NULL,
+               score INTEGER NOT NULL,
+               level INTEGER NOT NULL,
+               date TEXT NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id)",
+        "CREATE INDEX IF NOT EXISTS scores_by_level ON scores (level, score DESC, id)",
+        "CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score DESC, id)",
+        "CREATE INDEX IF NOT EXISTS scores_by_date ON scores (date, score DESC, id)",
+        # Ids of submissions already stored, so a client's retry is not stored twice
+        "CREATE TABLE IF NOT EXISTS submissions (id TEXT PRIMARY KEY)",
+    ]
+
+    INSERT = "INSERT INTO scores (name, score, level, date) VALUES (:name, :score, :level, :date)"
+    INSERT_SUBMISSION = "INSERT OR IGNORE INTO submissions (id) VALUES (?)"
+    COUNT_AT_OR_ABOVE = "SELECT COUNT(*) FROM scores WHERE score >= ? AND id <= ?"
+    COUNT_ALL = "SELECT COUNT(*) FROM scores"
+    LAST_ID = "SELECT MAX(id) FROM scores"
+    ALL_IDS = 2 ** 63 - 1  # Largest rowid, for reads without an id limit
+
+    # One statement per filter so each can use its own index
+    QUERIES = {
+        None: "SELECT name, score, level, date FROM scores WHERE id <= ? "
+              "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+        'level': "SELECT name, score, level, date FROM scores WHERE level = ? AND id <= ? "
+                 "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+        'name': "SELECT name, score, level, date FROM scores WHERE name = ? AND id <= ? "
+                "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+        'date': "SELECT name, score, level, date FROM scores WHERE date = ? AND id <= ? "
+                "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+    }
+
+    def __init__(self, db_file: str = "high_scores.db"):
+        self.db_file = db_file
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+        connection = self.connection()
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_file, cached_statements=64,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def add(self, entry: Dict) -> int:
+        """Insert one score and return its id"""
+        connection = self.connection()
+        with connection:
+            return connection.execute(self.INSERT, entry).lastrowid
+
+    def add_many(self, entries: List[Dict]):
+        """Insert several scores in a single transaction"""
+        connection = self.connection()
+        with connection:
+            connection.executemany(self.INSERT, entries)
+
+    def add_new(self, entries: List[Dict]) -> List[Dict]:
+        """Insert the scores whose submission_id has not been stored before.
+
+        Scores without a submission_id are always inserted. Returns the
+        scores that were inserted, in one transaction with their ids.
+        """
+        connection = self.connection()
+        inserted = []
+        with connection:
+            for entry in entries:
+                submission_id = entry.get('submission_id')
+                if submission_id is not None:
+                    if connection.execute(self.INSERT_SUBMISSION, (submission_id,)).rowcount == 0:
+                        continue
+                inserted.append(entry)
+            connection.executemany(self.INSERT, inserted)
+        return inserted
+
+    def query(self, limit: int = 10, offset: int = 0, level: Optional[int] = None,
+              name: Optional[str] = None, date: Optional[str] = None,
+              max_id: Optional[int] = None) -> List[Dict]:
+        """Get one page of scores, best first, optionally filtered and limited to ids up to max_id"""
+        max_id = self.ALL_IDS if max_id is None else max_id
+        if level is not None:
+            sql, args = self.QUERIES['level'], (level, max_id, limit, offset)
+        elif name is not None:
+            sql, args = self.QUERIES['name'], (name, max_id, limit, offset)
+        elif date is not None:
+            sql, args = self.QUERIES['date'], (date, max_id, limit, offset)
+        else:
+            sql, args = self.QUERIES[None], (max_id, limit, offset)
+
+        rows = self.connection().execute(sql, args).fetchall()
+        return [{'name': row[0], 'score': row[1], 'level': row[2], 'date': row[3]}
+                for row in rows]
+
+    def rank(self, score: int, max_id: Optional[int] = None) -> int:
+        """Get the rank a score would have (1-based) among ids up to max_id"""
+        max_id = self.ALL_IDS if max_id is None else max_id
+        return self.connection().execute(self.COUNT_AT_OR_ABOVE, (score, max_id)).fetchone()[0] + 1
+
+    def last_id(self) -> int:
+        """Get the id of the newest score, or 0 when there are none"""
+        return self.connection().execute(self.LAST_ID).fetchone()[0] or 0
+
+    def count(self) -> int:
+        """Get the total number of stored scores"""
+        return self.connection().execute(self.COUNT_ALL).fetchone()[0]
+
+    def close(self):
+        """Close every connection opened by this store"""
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+        self.local = threading.local()
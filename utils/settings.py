@@ -1,18 +1,28 @@
 import json
 import os
 from utils.constants import *
+from utils.storage import DebouncedWriter, atomic_write_json
 
 class SettingsManager:
-    def __init__(self):
-        self.settings_file = "game_settings.json"
+    def __init__(self, settings_file: str = "game_settings.json"):
+        self.settings_file = settings_file
         self.settings = self.load_settings()
+        # Quick changes are coalesced and written off the render thread
+        self.save_writer = DebouncedWriter(self.write_settings, SETTINGS_SAVE_DELAY,
+                                           "settings-writer")
     
     def load_settings(self) -> dict:
         """Load settings from file"""
         default_settings = {
             'control_mode': DEFAULT_CONTROL_MODE,
             'sound_enabled': True,
-            'show_fps': False
+            'show_fps': False,
+            'endless_mode': False,
+            'score_backend': SCORE_BACKEND_JSON,
+            'leaderboard_server': None,  # "host:port" of a shared leaderboard
+            'telemetry_file': None,      # Per-frame telemetry log, off when unset
+            'gc_policy': GC_POLICY_DEFAULT,
+            'threaded_simulation': False  # Step gameplay on its own thread at SIMULATION_RATE
         }
         
         if os.path.exists(self.settings_file):
@@ -28,20 +38,31 @@ class SettingsManager:
         return default_settings
     
     def save_settings(self):
-        """Save settings to file"""
+        """Save settings to file once changes settle down"""
+        self.save_writer.schedule(dict(self.settings))
+    
+    def write_settings(self, settings: dict):
+        """Writer thread: atomically replace the settings file"""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            atomic_write_json(self.settings_file, settings)
         except Exception as e:
             print(f"Error saving settings: {e}")
     
+    def flush(self):
+        """Write pending changes immediately"""
+        self.save_writer.flush()
+    
+    def close(self):
+        """Write pending changes and stop the writer thread"""
+        self.save_writer.close()
+    
     def get_control_mode(self) -> str:
         """Get current control mode"""
         return self.settings.get('control_mode', DEFAULT_CONTROL_MODE)
     
     def set_control_mode(self, mode: str):
         """Set control mode"""
-        if mode in [CONTROL_MODE_KEYBOARD, CONTROL_MODE_MOUSE]:
+        if mode in [CONTROL_MODE_KEYBOARD, CONTROL_MODE_MOUSE, CONTROL_MODE_MOUSE_RAW]:
             self.settings['control_mode'] = mode
             self.save_settings()
     
@@ -53,6 +74,10 @@ class SettingsManager:
         """Check if mouse mode is active"""
         return self.get_control_mode() == CONTROL_MODE_MOUSE
     
+    def is_raw_mouse_mode(self) -> bool:
+        """Check if raw (relative) mouse mode is active"""
+        return self.get_control_mode() == CONTROL_MODE_MOUSE_RAW
+    
     def toggle_control_mode(self):
         """Toggle between keyboard and mouse control"""
         current_mode = self.get_control_mode()
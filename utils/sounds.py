@@ -1,16 +1,41 @@
 import pygame
 import numpy as np
 import math
+from typing import Optional
+from utils.constants import AUDIO_SAMPLE_RATE, SCREEN_WIDTH
+from utils.audio import AudioBackend, create_audio_backend
+from utils.synth import Synthesizer, Envelope
+
+# Category of each generated sound, used for voice limits and priorities
+SOUND_CATEGORIES = {
+    'paddle_left': 'paddle',
+    'paddle_center': 'paddle',
+    'paddle_right': 'paddle',
+    'brick_normal': 'brick',
+    'brick_medium': 'brick',
+    'brick_hard': 'brick',
+    'brick_unbreakable': 'brick',
+    'powerup_collect': 'powerup',
+    'life_lost': 'life_lost',
+    'game_over': 'game_over',
+    'level_complete': 'level_complete'
+}
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    def __init__(self, sound_enabled: bool = True, backend: Optional[AudioBackend] = None):
+        self.backend = backend if backend is not None else create_audio_backend(sound_enabled)
         self.sounds = {}
-        self.generate_sounds()
+        self.synth = None
+        
+        # Nothing to synthesize when there is no audio output
+        if self.backend.enabled:
+            self.generate_sounds()
+            self.synth = Synthesizer()
+            self.brick_envelope = Envelope(attack=0.003, decay=0.06, sustain=0.5, release=0.08)
     
     def generate_tone(self, frequency, duration, volume=0.5, fade_out=True):
         """Generate a simple tone"""
-        sample_rate = 22050
+        sample_rate = AUDIO_SAMPLE_RATE
         frames = int(duration * sample_rate)
         arr = np.zeros((frames, 2))
         
@@ -28,12 +53,11 @@ class SoundManager:
         
         # Convert to 16-bit integers
         arr = (arr * 32767).astype(np.int16)
-        sound = pygame.sndarray.make_sound(arr)
-        return sound
+        return self.backend.make_sound(arr)
     
     def generate_noise(self, duration, volume=0.3):
         """Generate white noise for destruction sounds"""
-        sample_rate = 22050
+        sample_rate = AUDIO_SAMPLE_RATE
         frames = int(duration * sample_rate)
         arr = np.random.uniform(-volume, volume, (frames, 2))
         
@@ -43,8 +67,7 @@ class SoundManager:
             arr[i] *= fade_factor
         
         arr = (arr * 32767).astype(np.int16)
-        sound = pygame.sndarray.make_sound(arr)
-        return sound
+        return self.backend.make_sound(arr)
     
     def generate_sounds(self):
         """Generate all game sounds"""
@@ -72,7 +95,7 @@ class SoundManager:
     def generate_fanfare(self):
         """Generate a simple fanfare for level completion"""
         notes = [523, 659, 784, 1047]  # C5, E5, G5, C6
-        sample_rate = 22050
+        sample_rate = AUDIO_SAMPLE_RATE
         total_duration = 1.0
         note_duration = total_duration / len(notes)
         frames_per_note = int(note_duration * sample_rate)
@@ -97,14 +120,24 @@ class SoundManager:
                 arr[start_frame + i][1] = wave
         
         arr = (arr * 32767).astype(np.int16)
-        return pygame.sndarray.make_sound(arr)
+        return self.backend.make_sound(arr)
+    
+    def begin_frame(self):
+        """Allow sounds to be triggered again for a new frame"""
+        self.backend.begin_frame()
+        if self.synth is not None:
+            self.synth.begin_frame()
     
-    def play_sound(self, sound_name, volume=1.0):
-        """Play a sound by name"""
+    def play_sound(self, sound_name, volume=1.0, category=None):
+        """Play a sound by name on a pooled channel"""
         if sound_name in self.sounds:
-            sound = self.sounds[sound_name]
-            sound.set_volume(volume)
-            sound.play()
+            if category is None:
+                category = SOUND_CATEGORIES.get(sound_name, 'wall')
+            self.backend.play(sound_name, self.sounds[sound_name], category, volume)
+    
+    def shutdown(self):
+        """Stop all sounds and release the audio device"""
+        self.backend.shutdown()
     
     def play_paddle_hit(self, hit_position):
         """Play paddle hit sound based on hit position (-1 to 1)"""
@@ -115,12 +148,40 @@ class SoundManager:
         else:
             self.play_sound('paddle_center')
     
-    def play_brick_hit(self, brick_type):
-        """Play appropriate sound for brick type"""
-        sound_map = {
-            'normal': 'brick_normal',
-            'medium': 'brick_medium',
-            'hard': 'brick_hard',
-            'unbreakable': 'brick_unbreakable'
+    def play_brick_hit(self, brick_type, combo=0, x=None):
+        """Play appropriate sound for brick type, pitched up by combo and panned by x"""
+        if self.synth is None:
+            sound_map = {
+                'normal': 'brick_normal',
+                'medium': 'brick_medium',
+                'hard': 'brick_hard',
+                'unbreakable': 'brick_unbreakable'
+            }
+            self.play_sound(sound_map.get(brick_type, 'brick_normal'))
+            return
+        
+        note_map = {
+            'normal': 523,   # C5
+            'medium': 659,   # E5
+            'hard': 784,     # G5
         }
-        self.play_sound(sound_map.get(brick_type, 'brick_normal'))
+        
+        # Each brick in a combo raises the pitch a semitone, up to an octave
+        frequency = note_map.get(brick_type, 523) * 2 ** (min(combo, 12) / 12)
+        pan = 0.0 if x is None else (x - SCREEN_WIDTH / 2) / (SCREEN_WIDTH / 2)
+        
+        # Same voice limit and per-frame coalescing as the sampled brick sounds
+        name = f"brick_{brick_type}"
+        if brick_type == 'unbreakable':
+            self.synth.note_on(frequency, 0.05, 'noise', self.brick_envelope, pan, 0.2, name, 'brick')
+        else:
+            self.synth.note_on(frequency, 0.1, 'triangle', self.brick_envelope, pan, 0.4, name, 'brick')
+    
+    def is_streaming(self) -> bool:
+        """Check if synthesized notes are still playing and need update() calls"""
+        return self.synth is not None and self.synth.has_active_voices()
+    
+    def update(self):
+        """Feed the mixer with newly synthesized audio"""
+        if self.synth is not None:
+            self.backend.pump_stream(self.synth)
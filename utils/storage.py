@@ -0,0 +1,168 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable
+
+def atomic_write_json(path: str, data, indent: int = 2):
+    """Write JSON so readers see either the old file or the new one, never half of it"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def append_json_line(path: str, data):
+    """Append one JSON record to a line-oriented journal and sync it to disk"""
+    with open(path, 'a') as f:
+        f.write(json.dumps(data, separators=(',', ':')) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_json_lines(path: str) -> list:
+    """Read a journal, skipping a torn or corrupt line left by a crash"""
+    records = []
+    if not os.path.exists(path):
+        return records
+
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+class BackgroundWriter:
+    """Runs file writes on a daemon thread, in the order they were submitted"""
+
+    def __init__(self, name: str = "background-writer"):
+        self.queue = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+        # Make sure queued writes reach the disk if the game exits abruptly
+        atexit.register(self.close)
+
+    def submit(self, job: Callable, *args):
+        """Queue a write job"""
+        if self.closed:
+            job(*args)
+            return
+        self.queue.put((job, args))
+
+    def run(self):
+        """Worker loop"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                job, args = item
+                try:
+                    job(*args)
+                except Exception as e:
+                    print(f"Error in background write: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Block until every queued write has finished"""
+        if not self.closed:
+            self.queue.join()
+
+    def close(self):
+        """Finish queued writes and stop the worker thread"""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+class DebouncedWriter:
+    """Coalesces repeated saves into one write after a quiet period.
+
+    Each schedule() call replaces the pending data and pushes the deadline
+    back, so a burst of changes produces a single write on a daemon thread.
+    """
+
+    def __init__(self, write: Callable, delay: float, name: str = "debounced-writer"):
+        self.write = write
+        self.delay = delay
+        self.condition = threading.Condition()
+        self.pending = None
+        self.has_pending = False
+        self.deadline = 0.0
+        self.writing = False
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def schedule(self, data):
+        """Queue data to be written once no new changes arrive for delay seconds"""
+        with self.condition:
+            self.pending = data
+            self.has_pending = True
+            self.deadline = time.monotonic() + self.delay
+            self.condition.notify_all()
+
+    def take_pending(self):
+        """Claim the pending data for writing (condition must be held)"""
+        data = self.pending
+        self.pending = None
+        self.has_pending = False
+        self.writing = True
+        return data
+
+    def finish_write(self, data):
+        """Write claimed data outside the lock, then release the claim"""
+        try:
+            self.write(data)
+        except Exception as e:
+            print(f"Error in background write: {e}")
+        with self.condition:
+            self.writing = False
+            self.condition.notify_all()
+
+    def run(self):
+        """Worker loop"""
+        while True:
+            with self.condition:
+                while not self.closed and (not self.has_pending or self.writing):
+                    self.condition.wait()
+                if self.closed:
+                    return
+                remaining = self.deadline - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                data = self.take_pending()
+            self.finish_write(data)
+
+    def flush(self):
+        """Write any pending data now, waiting for a write in progress first"""
+        with self.condition:
+            while self.writing:
+                self.condition.wait()
+            if not self.has_pending:
+                return
+            data = self.take_pending()
+        self.finish_write(data)
+
+    def close(self):
+        """Write any pending data and stop the worker thread"""
+        if self.closed:
+            return
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
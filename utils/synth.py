@@ -0,0 +1,190 @@
+import math
+import numpy as np
+from typing import List, Optional
+from utils.constants import *
+
+WAVEFORMS = ('sine', 'square', 'triangle', 'saw', 'noise')
+
+class Envelope:
+    """ADSR amplitude envelope, times in seconds and sustain as a level (0 to 1)"""
+
+    def __init__(self, attack: float = 0.005, decay: float = 0.05,
+                 sustain: float = 0.6, release: float = 0.08):
+        self.attack = max(attack, 1e-4)
+        self.decay = max(decay, 1e-4)
+        self.sustain = sustain
+        self.release = max(release, 1e-4)
+
+    def gains(self, t: np.ndarray, gate: float) -> np.ndarray:
+        """Get the envelope level at each time t for a note held for gate seconds"""
+        attack_end = self.attack
+        decay_end = self.attack + self.decay
+
+        # Attack, decay and sustain while the note is held
+        held = np.where(
+            t < attack_end,
+            t / self.attack,
+            np.where(t < decay_end,
+                     1.0 - (1.0 - self.sustain) * (t - attack_end) / self.decay,
+                     self.sustain))
+
+        # Level reached when the note was released
+        if gate < attack_end:
+            release_level = gate / self.attack
+        elif gate < decay_end:
+            release_level = 1.0 - (1.0 - self.sustain) * (gate - attack_end) / self.decay
+        else:
+            release_level = self.sustain
+
+        released = release_level * np.maximum(0.0, 1.0 - (t - gate) / self.release)
+        return np.where(t < gate, held, released)
+
+    def length(self, gate: float) -> float:
+        """Total sounding time of a note held for gate seconds"""
+        return gate + self.release
+
+class Voice:
+    """A single synthesized note"""
+
+    def __init__(self, frequency: float, gate: float, waveform: str,
+                 envelope: Envelope, pan: float, volume: float, order: int,
+                 category: Optional[str] = None):
+        self.frequency = frequency
+        self.gate = gate
+        self.waveform = waveform
+        self.envelope = envelope
+        self.volume = volume
+        self.order = order
+        self.category = category
+        self.priority = SOUND_PRIORITIES.get(category, 0)
+        self.position = 0  # Frames rendered so far
+
+        # Equal-power stereo panning, pan from -1 (left) to 1 (right)
+        angle = (max(-1.0, min(1.0, pan)) + 1) * math.pi / 4
+        self.left_gain = math.cos(angle)
+        self.right_gain = math.sin(angle)
+
+    def is_finished(self, sample_rate: int) -> bool:
+        """Check if the note's release has completed"""
+        return self.position >= self.envelope.length(self.gate) * sample_rate
+
+class Synthesizer:
+    """Mixes active voices into stereo blocks of a fixed size.
+
+    Every voice is rendered with NumPy one block at a time, so the cost per
+    block is bounded by the voice limit, not by the number of events.
+    Notes follow the same category limits, priorities and per-frame
+    coalescing as the pooled mixer channels (see ChannelManager).
+    """
+
+    def __init__(self, sample_rate: int = AUDIO_SAMPLE_RATE,
+                 block_size: int = SYNTH_BLOCK_SIZE,
+                 max_voices: int = SYNTH_MAX_VOICES):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.max_voices = max_voices
+        self.voices: List[Voice] = []
+        self.note_counter = 0
+        self.default_envelope = Envelope()
+        # Note name -> voice for notes started this frame
+        self.frame_voices = {}
+
+        # Reused every block to avoid allocating per voice
+        self.frame_offsets = np.arange(block_size, dtype=np.float64)
+        self.mix = np.zeros((block_size, 2), dtype=np.float64)
+
+    def begin_frame(self):
+        """Start a new frame so notes can be triggered again"""
+        self.frame_voices.clear()
+
+    def note_on(self, frequency: float, duration: float = 0.1, waveform: str = 'sine',
+                envelope: Optional[Envelope] = None, pan: float = 0.0,
+                volume: float = 0.4, name: Optional[str] = None,
+                category: Optional[str] = None) -> Optional[Voice]:
+        """Start a note, returning its voice or None if it was dropped.
+
+        A note with the same name and category as one started this frame
+        is coalesced into it. A category at its voice limit restarts its oldest voice;
+        with every voice busy, the oldest voice of a lower priority is
+        stolen, otherwise the note is dropped.
+        """
+        voice = self.frame_voices.get((name, category)) if name is not None else None
+        if voice is not None and voice in self.voices:
+            voice.volume = max(voice.volume, volume)
+            return voice
+
+        replaced = self.find_voice(category)
+        if replaced is False:
+            return None
+        if replaced is not None:
+            self.voices.remove(replaced)
+
+        self.note_counter += 1
+        voice = Voice(frequency, duration, waveform, envelope or self.default_envelope,
+                      pan, volume, self.note_counter, category)
+        self.voices.append(voice)
+        if name is not None:
+            self.frame_voices[(name, category)] = voice
+        return voice
+
+    def find_voice(self, category: Optional[str]):
+        """Pick the voice a new note replaces: a Voice, None for a free slot, or False to drop it"""
+        priority = SOUND_PRIORITIES.get(category, 0)
+        limit = SOUND_VOICE_LIMITS.get(category, self.max_voices)
+
+        same_category = [voice for voice in self.voices if voice.category == category]
+        if len(same_category) >= limit:
+            return min(same_category, key=lambda voice: voice.order)
+
+        if len(self.voices) < self.max_voices:
+            return None
+
+        lower = [voice for voice in self.voices if voice.priority < priority]
+        if lower:
+            # Prefer the lowest priority, then the oldest voice
+            return min(lower, key=lambda voice: (voice.priority, voice.order))
+        return False
+
+    def has_active_voices(self) -> bool:
+        """Check if any voice is still sounding"""
+        return bool(self.voices)
+
+    def render_waveform(self, voice: Voice, t: np.ndarray) -> np.ndarray:
+        """Render one block of a voice's raw waveform"""
+        cycles = voice.frequency * t
+        if voice.waveform == 'square':
+            return np.where((cycles % 1.0) < 0.5, 1.0, -1.0)
+        elif voice.waveform == 'triangle':
+            return 4.0 * np.abs((cycles % 1.0) - 0.5) - 1.0
+        elif voice.waveform == 'saw':
+            return 2.0 * (cycles % 1.0) - 1.0
+        elif voice.waveform == 'noise':
+            return np.random.uniform(-1.0, 1.0, len(t))
+        return np.sin(2 * math.pi * cycles)
+
+    def render_block(self) -> np.ndarray:
+        """Mix all active voices into one (block_size, 2) int16 block"""
+        mix = self.mix
+        mix.fill(0.0)
+
+        for voice in self.voices:
+            t = (self.frame_offsets + voice.position) / self.sample_rate
+            mono = self.render_waveform(voice, t)
+            mono *= voice.envelope.gains(t, voice.gate)
+            mono *= voice.volume
+            mix[:, 0] += mono * voice.left_gain
+            mix[:, 1] += mono * voice.right_gain
+            voice.position += self.block_size
+
+        self.voices = [voice for voice in self.voices
+                       if not voice.is_finished(self.sample_rate)]
+
+        np.clip(mix, -1.0, 1.0, out=mix)
+        return (mix * 32767).astype(np.int16)
+
+    def render_blocks(self, count: int) -> np.ndarray:
+        """Mix count blocks back to back, stopping early once every voice has finished"""
+        blocks = [self.render_block()]
+        while len(blocks) < count and self.voices:
+            blocks.append(self.render_block())
+        return np.concatenate(blocks)
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Sequence
+from utils.constants import *
+
+# File layout: header, state names (comma separated UTF-8), then records
+HEADER = struct.Struct('<4sHHH')  # magic, version, record size, state names length
+MAGIC = b'AWKT'
+VERSION = 1
+# frame, seconds since start, frame interval ms, frame work ms,
+# balls, live bricks, lasers, falling power-ups, state code
+RECORD = struct.Struct('<IdffHHHHB')
+COLUMNS = ('frame', 'time', 'dt_ms', 'work_ms', 'balls', 'bricks', 'lasers', 'powerups', 'state')
+
+class TelemetryRecorder:
+    """Per-frame telemetry in a preallocated ring buffer, flushed by a thread.
+
+    record() packs one fixed-size record into the buffer and bumps a
+    counter; it takes no lock and the buffer never grows. The flush thread copies
+    out everything written since its last pass and appends it to the log.
+    If the game gets more than a full buffer ahead of the thread, the oldest
+    records are dropped and counted rather than blocking the frame. Only
+    capacity - 1 records are safe to read: the slot after the newest record
+    holds the oldest one and may be mid-rewrite.
+    """
+
+    def __init__(self, path: str, states: Sequence[str], capacity: int = TELEMETRY_CAPACITY,
+                 flush_interval: float = TELEMETRY_FLUSH_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.written = 0  # Records ever written; only the game thread changes it
+        self.flushed = 0  # Records ever handed to the file; only the flush thread changes it
+        self.dropped = 0
+        self.start_time = time.perf_counter()
+
+        # Sessions append to the same log while its header still matches
+        names = ','.join(states).encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, RECORD.size, len(names)) + names
+        if os.path.exists(path) and read_header(path) != header:
+            os.replace(path, f"{path}.old")
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(header)
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, dt_ms: float, work_ms: float, balls: int, bricks: int,
+               lasers: int, powerups: int, state: int):
+        """Game thread: store one frame's record"""
+        frame = self.written
+        RECORD.pack_into(self.buffer, (frame % self.capacity) * RECORD.size,
+                         frame & 0xFFFFFFFF, time.perf_counter() - self.start_time,
+                         dt_ms, work_ms, min(balls, 0xFFFF), min(bricks, 0xFFFF),
+                         min(lasers, 0xFFFF), min(powerups, 0xFFFF), state)
+        self.written = frame + 1
+
+    def run(self):
+        """Writer thread: flush on an interval until closed"""
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Copy out the records written since the last flush and append them"""
+        end = self.written
+        start = max(self.flushed, end - self.capacity + 1)
+        if start >= end:
+            return
+        data = self.copy_range(start, end)
+
+        # Records the game overwrote while they were being copied are stale,
+        # and so is the one in the slot it may be writing right now
+        overwritten = self.written - self.capacity + 1
+        if overwritten > start:
+            skip = min(overwritten, end) - start
+            data = data[skip * RECORD.size:]
+            start += skip
+        self.dropped += start - self.flushed
+
+        try:
+            self.file.write(data)
+            self.file.flush()
+        except (OSError, ValueError) as e:
+            print(f"Error writing telemetry: {e}")
+        self.flushed = end
+
+    def copy_range(self, start: int, end: int) -> bytes:
+        """Copy records [start, end) out of the ring, unwrapping it"""
+        first = (start % self.capacity) * RECORD.size
+        last = (end % self.capacity) * RECORD.size
+        if first < last or end - start == 0:
+            return bytes(self.buffer[first:last])
+        return bytes(self.buffer[first:]) + bytes(self.buffer[:last])
+
+    def close(self):
+        """Flush what is left and close the log"""
+        self.stop_event.set()
+        self.thread.join()
+        self.file.close()
+        if self.dropped:
+            print(f"Telemetry dropped {self.dropped} frames")
+
+def create_telemetry_recorder(path: Optional[str], states: Sequence[str]) -> Optional[TelemetryRecorder]:
+    """Create a recorder for a log file, or None if telemetry is off"""
+    path = os.environ.get(TELEMETRY_ENV_VAR, path or "")
+    if not path:
+        return None
+    try:
+        return TelemetryRecorder(path, states)
+    except OSError as e:
+        print(f"Error opening telemetry log: {e}")
+        return None
+
+def read_header(path: str) -> bytes:
+    """Raw header of an existing log, including its state names"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return header
+        return header + f.read(HEADER.unpack(header)[3])
+
+def read_telemetry(path: str) -> Dict[str, list]:
+    """Read a telemetry log into columns; the state column holds state names"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, record_size, names_length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a version {VERSION} telemetry log")
+    offset = HEADER.size + names_length
+    states = data[HEADER.size:offset].decode('utf-8').split(',')
+
+    columns: Dict[str, list] = {name: [] for name in COLUMNS}
+    lists = [columns[name] for name in COLUMNS]
+    usable = offset + (len(data) - offset) // RECORD.size * RECORD.size  # Ignore a torn tail
+    for record in RECORD.iter_unpack(data[offset:usable]):
+        for values, value in zip(lists, record):
+            values.append(value)
+    columns['state'] = [states[code] if code < len(states) else str(code)
+                        for code in columns['state']]
+    return columns
+
+def export_csv(path: str, out_path: str):
+    """Convert a telemetry log to CSV"""
+    columns = read_telemetry(path)
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+
+def export_columns(path: str, out_path: str):
+    """Convert a telemetry log to a compressed .npz with one typed array per column"""
+    import numpy as np
+
+    columns = read_telemetry(path)
+    dtypes = {'frame': np.uint32, 'time': np.float64, 'dt_ms': np.float32, 'work_ms': np.float32,
+              'balls': np.uint16, 'bricks': np.uint16, 'lasers': np.uint16, 'powerups': np.uint16}
+    arrays = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in dtypes.items()}
+    arrays['state'] = np.asarray(columns['state'])
+    np.savez_compressed(out_path, **arrays)
+
+def main():
+    """Convert a telemetry log from the command line"""
+    parser = argparse.ArgumentParser(description="Convert an AWSKANOID telemetry log")
+    parser.add_argument('log', help="telemetry log written by the game")
+    parser.add_argument('output', help="output file; .csv for CSV, .npz for typed columns")
+    args = parser.parse_args()
+
+    if args.output.endswith('.npz'):
+        export_columns(args.log, args.output)
+    else:
+        export_csv(args.log, args.output)
+
+if __name__ == "__main__":
+    main()